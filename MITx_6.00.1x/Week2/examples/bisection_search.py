@@ -0,0 +1,212 @@
+'''
+Bisection search without slicing
+--------------------------------
+
+isIn in ex_char_in_str.py looks for a character by recursing into both
+halves of a sorted string, copying each half as it goes. The searches
+here keep two indices into the one sorted sequence instead (via the
+bisect module), so every lookup is O(log n) with no copies:
+
+* index_of / is_in look up one key in a sorted string or list,
+* contains_many looks up many keys in one sorted sequence, walking the
+  keys in order so each search starts where the previous one ended
+  (SortedFile.contains_many also gallops from there, so it reads only
+  the few lines between neighbouring keys),
+* SortedFile looks up lines of a sorted text file through mmap, bisecting
+  on byte offsets, so the file is never loaded or even indexed.
+'''
+import mmap
+from bisect import bisect_left
+
+
+def index_of(key, sorted_seq, lo=0, hi=None):
+    '''
+    Returns the index of key in the sorted string or list sorted_seq
+    (between lo and hi), or -1 if it is not there.
+    '''
+    hi = len(sorted_seq) if hi is None else hi
+    i = bisect_left(sorted_seq, key, lo, hi)
+    if i < hi and sorted_seq[i] == key:
+        return i
+    return -1
+
+
+def is_in(char, a_str):
+    '''
+    Returns True if char is in the sorted string a_str, like isIn.
+    '''
+    return index_of(char, a_str) >= 0
+
+
+def contains_many(keys, sorted_seq):
+    '''
+    Returns [key in sorted_seq for key in keys] for a sorted string or
+    list sorted_seq. The keys are searched in sorted order, each search
+    starting from where the previous key landed.
+    '''
+    results = [False] * len(keys)
+    lo = 0
+    n = len(sorted_seq)
+    for position in sorted(range(len(keys)), key=keys.__getitem__):
+        key = keys[position]
+        lo = bisect_left(sorted_seq, key, lo, n)
+        results[position] = lo < n and sorted_seq[lo] == key
+    return results
+
+
+class SortedFile(object):
+    '''
+    A text file of sorted lines (one key per line, '\\n' line endings,
+    sorted by their bytes), searched in place through mmap.
+
+    Lookups bisect on byte offsets: the middle offset is moved forward to
+    the start of the next line, and that line decides which half to keep.
+
+    path: name of the file
+    '''
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap refuses empty files.
+            self.data = b''
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _line_start(self, pos, end=None):
+        '''
+        Returns the offset of the first line starting at or after pos, or
+        end (len of the file by default) if no line starts before it.
+        '''
+        end = len(self.data) if end is None else end
+        if pos == 0:
+            return 0
+        newline = self.data.find(b'\n', pos - 1, end)
+        return end if newline < 0 else newline + 1
+
+    def _line(self, start):
+        '''
+        Returns the line starting at start and the offset of the next one.
+        '''
+        end = self.data.find(b'\n', start)
+        if end < 0:
+            end = len(self.data)
+        return self.data[start:end].rstrip(b'\r'), end + 1
+
+    def bisect(self, key, lo=0, hi=None):
+        '''
+        Returns the offset of the first line >= key (len of the file if
+        there is none), looking only at the lines starting in [lo, hi).
+        lo must be the start of a line.
+        '''
+        if isinstance(key, str):
+            key = key.encode('utf-8')
+        hi = len(self.data) if hi is None else hi
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = self._line_start(mid, hi)
+            if start >= hi:
+                # No line starts in [mid, hi), e.g. mid is inside a long
+                # line: keep bisecting the lines that start before mid.
+                hi = mid
+                continue
+            line, after = self._line(start)
+            if line < key:
+                lo = after
+            else:
+                hi = start
+        return min(lo, len(self.data))
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            key = key.encode('utf-8')
+        start = self.bisect(key)
+        return start < len(self.data) and self._line(start)[0] == key
+
+    def _gallop(self, key, lo):
+        '''
+        Returns (lo, hi) such that the first line >= key starts in [lo, hi),
+        probing lines 64, 128, 256, ... bytes past lo. lo must be the start
+        of a line at or before that first line.
+        '''
+        n = len(self.data)
+        step = 64
+        while lo < n:
+            start = self._line_start(min(lo + step, n))
+            if start >= n:
+                return lo, n
+            line, after = self._line(start)
+            if line >= key:
+                return lo, start + 1
+            lo = after
+            step *= 2
+        return lo, n
+
+    def contains_many(self, keys):
+        '''
+        Returns [key in self for key in keys], searching the keys in sorted
+        order. Each search gallops forward from where the previous key
+        landed and bisects only the span it found, so keys that are close
+        together in the file cost a few line reads rather than a full
+        bisection each.
+        '''
+        encoded = [key.encode('utf-8') if isinstance(key, str) else key for key in keys]
+        results = [False] * len(keys)
+        lo = 0
+        n = len(self.data)
+        for position in sorted(range(len(encoded)), key=encoded.__getitem__):
+            key = encoded[position]
+            # A repeated key lands where the previous one did.
+            if lo >= n or self._line(lo)[0] < key:
+                lo = self.bisect(key, *self._gallop(key, lo))
+            results[position] = lo < n and self._line(lo)[0] == key
+        return results
+
+
+if __name__ == '__main__':
+    import os
+    import random
+    import string
+    import time
+
+    from ex_char_in_str import isIn
+
+    random.seed(0)
+    for length in (100, 1000, 10000):
+        a_str = ''.join(sorted(random.choice(string.ascii_lowercase) for _ in range(length)))
+        chars = [random.choice(string.ascii_letters) for _ in range(200)]
+        start = time.perf_counter()
+        expected = [isIn(char, a_str) for char in chars]
+        old = time.perf_counter() - start
+        start = time.perf_counter()
+        found = [is_in(char, a_str) for char in chars]
+        new = time.perf_counter() - start
+        assert found == expected
+        print("{0:6d} characters: isIn {1:.2e} s/lookup, is_in {2:.2e} s/lookup".format(length, old / 200, new / 200))
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Week4', 'problems', 'words.txt')
+    with open(path) as f:
+        words = f.read().split()
+    keys = [random.choice(words) if random.random() < 0.5 else random.choice(words) + 'Q' for _ in range(100000)]
+
+    start = time.perf_counter()
+    in_memory = contains_many(keys, words)
+    print("contains_many, {0} keys in a list : {1:.3f} s".format(len(keys), time.perf_counter() - start))
+    with SortedFile(path) as sorted_file:
+        start = time.perf_counter()
+        one_by_one = [key in sorted_file for key in keys]
+        print("SortedFile, {0} keys one by one   : {1:.3f} s".format(len(keys), time.perf_counter() - start))
+        start = time.perf_counter()
+        batched = sorted_file.contains_many(keys)
+        print("SortedFile.contains_many, {0} keys: {1:.3f} s".format(len(keys), time.perf_counter() - start))
+    assert in_memory == batched == one_by_one
@@ -5,8 +5,6 @@ def gcdIter(a, b):
             return i
 
 
-print(gcdIter(12,12))
-
 def gcdRecur(a,b):
 
     if b == 0:
@@ -16,4 +14,6 @@ def gcdRecur(a,b):
         return gcdRecur(b, a % b)
 
 
-print(gcdRecur(12,12))
\ No newline at end of file
+if __name__ == '__main__':
+    print(gcdIter(12,12))
+    print(gcdRecur(12,12))
\ No newline at end of file
@@ -20,4 +20,5 @@ def isPalindrome(s_char):
 
 
 
-print(isPalindrome(to_chars('ablelba')))
\ No newline at end of file
+if __name__ == '__main__':
+    print(isPalindrome(to_chars('ablelba')))
\ No newline at end of file
@@ -0,0 +1,171 @@
+'''
+Greatest common divisors, one pair or many at a time
+----------------------------------------------------
+
+gcd_euclid and gcd_binary replace the trial division of gcdIter and the
+recursion of gcdRecur in ex_gcd.py. gcd_array runs Euclid's algorithm on
+whole NumPy arrays of pairs, gcd_reduce / lcm_reduce fold a list, and
+batch_gcd finds the numbers in a set that share a factor with any other
+number of the set, using product and remainder trees.
+'''
+from functools import reduce
+
+import numpy as np
+
+
+def gcd_euclid(a, b):
+    '''
+    Euclid's algorithm, iteratively: O(log min(a, b)) divisions.
+    '''
+    a, b = abs(a), abs(b)
+    while b:
+        a, b = b, a % b
+    return a
+
+
+def gcd_binary(a, b):
+    '''
+    Stein's binary GCD: only shifts and subtractions.
+    '''
+    a, b = abs(a), abs(b)
+    if a == 0:
+        return b
+    if b == 0:
+        return a
+    # Common factors of two, then make a odd.
+    shift = ((a | b) & -(a | b)).bit_length() - 1
+    a >>= (a & -a).bit_length() - 1
+    while b:
+        b >>= (b & -b).bit_length() - 1
+        if a > b:
+            a, b = b, a
+        b -= a
+    return a << shift
+
+
+def gcd_array(a, b):
+    '''
+    Element-wise GCD of two integer arrays (or an array and a scalar),
+    running Euclid's algorithm on every pair at once until all are done.
+    Returns a scalar when both a and b are scalars (or 0-d arrays).
+    '''
+    a, b = np.broadcast_arrays(np.abs(np.asarray(a)), np.abs(np.asarray(b)))
+    scalar = a.ndim == 0
+    # Boolean indexing needs at least one dimension.
+    a = np.atleast_1d(a).copy()
+    b = np.atleast_1d(b).copy()
+    active = b != 0
+    while active.any():
+        remainder = a[active] % b[active]
+        a[active] = b[active]
+        b[active] = remainder
+        active[active] = remainder != 0
+    return a[0] if scalar else a
+
+
+def gcd_reduce(values):
+    '''
+    GCD of every number in values (0 for an empty list).
+    '''
+    return reduce(gcd_euclid, values, 0)
+
+
+def lcm_reduce(values):
+    '''
+    Least common multiple of every number in values (1 for an empty list).
+    '''
+    def lcm(a, b):
+        if a == 0 or b == 0:
+            return 0
+        return abs(a // gcd_euclid(a, b) * b)
+    return reduce(lcm, values, 1)
+
+
+def product_tree(values):
+    '''
+    Returns the levels of the product tree of values, leaves first: every
+    level multiplies neighbouring pairs of the level below, up to the
+    product of all the values.
+    '''
+    tree = [list(values)]
+    while len(tree[-1]) > 1:
+        level = tree[-1]
+        tree.append([level[i] * level[i + 1] if i + 1 < len(level) else level[i]
+                     for i in range(0, len(level), 2)])
+    return tree
+
+
+def batch_gcd(values):
+    '''
+    Returns, for every x in values, gcd(x, product of all the other
+    values), so entries greater than 1 point at numbers that share a
+    factor with some other number of the set (e.g. RSA moduli sharing a
+    prime). Uses Bernstein's product and remainder trees: about
+    O(n log n) multiplications of big numbers instead of n**2 GCDs.
+
+    values: list of positive integers; a 0 would zero the products of
+      every other value, so it raises ValueError like a negative number
+    '''
+    if not values:
+        return []
+    smallest = min(values)
+    if smallest < 1:
+        raise ValueError("batch_gcd needs positive integers, got {0}".format(smallest))
+    tree = product_tree(values)
+    remainders = tree[-1]
+    for level in reversed(tree[:-1]):
+        remainders = [remainders[i // 2] % (x * x) for i, x in enumerate(level)]
+    return [gcd_euclid(remainder // x, x) for remainder, x in zip(remainders, values)]
+
+
+if __name__ == '__main__':
+    import math
+    import random
+    import time
+
+    from ex_gcd import gcdIter, gcdRecur
+
+    def bench(name, function, pairs):
+        start = time.perf_counter()
+        for a, b in pairs:
+            function(a, b)
+        elapsed = time.perf_counter() - start
+        print("{0:12s}: {1:12.0f} pairs/s".format(name, len(pairs) / elapsed))
+
+    random.seed(0)
+    small = [(random.randrange(1, 10 ** 5), random.randrange(1, 10 ** 5)) for _ in range(2000)]
+    large = [(random.randrange(1, 10 ** 18), random.randrange(1, 10 ** 18)) for _ in range(100000)]
+
+    print("2000 pairs below 10^5")
+    for name, function in [('gcdIter', gcdIter), ('gcdRecur', gcdRecur), ('gcd_euclid', gcd_euclid),
+                           ('gcd_binary', gcd_binary), ('math.gcd', math.gcd)]:
+        bench(name, function, small)
+
+    print("100000 pairs below 10^18")
+    for name, function in [('gcdRecur', gcdRecur), ('gcd_euclid', gcd_euclid),
+                           ('gcd_binary', gcd_binary), ('math.gcd', math.gcd)]:
+        bench(name, function, large)
+    a = np.array([pair[0] for pair in large], dtype=np.int64)
+    b = np.array([pair[1] for pair in large], dtype=np.int64)
+    start = time.perf_counter()
+    gcd_array(a, b)
+    print("{0:12s}: {1:12.0f} pairs/s".format('gcd_array', len(large) / (time.perf_counter() - start)))
+
+    # Moduli of two 64-bit primes, a few of which share a prime.
+    def prime(bits):
+        while True:
+            candidate = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+            if all(pow(w, candidate - 1, candidate) == 1 for w in (2, 3, 5, 7, 11)):
+                return candidate
+    shared = prime(64)
+    moduli = [prime(64) * prime(64) for _ in range(2000)]
+    moduli[10] = shared * prime(64)
+    moduli[1234] = shared * prime(64)
+
+    start = time.perf_counter()
+    found = [i for i, g in enumerate(batch_gcd(moduli)) if g > 1]
+    print("batch_gcd of {0} moduli: {1:.2f} s, sharing a factor: {2}".format(
+        len(moduli), time.perf_counter() - start, found))
+    start = time.perf_counter()
+    pairs = [(i, j) for i in range(len(moduli)) for j in range(i + 1, len(moduli)) if math.gcd(moduli[i], moduli[j]) > 1]
+    print("pairwise math.gcd       : {0:.2f} s, sharing a factor: {1}".format(time.perf_counter() - start, pairs))
@@ -0,0 +1,137 @@
+'''
+Palindromes of any size
+-----------------------
+
+Works like to_chars + isPalindrome in ex_palindrom.py (case is ignored
+and only the letters a-z count), but without recursion or copied slices:
+
+* normalize lowercases and drops every other character with a single
+  bytes.translate call instead of growing a string one letter at a time.
+* is_palindrome compares the letters with a reversed memoryview of
+  them, which is a view rather than a copy.
+* is_palindrome_file checks a file through mmap, reading chunks from the
+  front and the back until they meet, so the file never has to fit in
+  memory.
+* is_palindrome_batch checks many short strings in one call, with the
+  same memoryview comparison.
+
+None of them builds a reversed copy of the whole text.
+'''
+import mmap
+import os
+import string
+
+LOWERCASE_TABLE = bytes.maketrans(string.ascii_uppercase.encode('ascii'), string.ascii_lowercase.encode('ascii'))
+NON_LETTERS = bytes(c for c in range(256) if not (ord('a') <= c <= ord('z') or ord('A') <= c <= ord('Z')))
+
+
+def normalize(s):
+    '''
+    Returns the letters a-z of s, lowercased, as bytes.
+
+    s: str or bytes-like
+    '''
+    if isinstance(s, str):
+        s = s.lower().encode('ascii', 'ignore')
+    return bytes(s).translate(LOWERCASE_TABLE, NON_LETTERS)
+
+
+def is_normalized_palindrome(letters):
+    '''
+    Returns True if the bytes-like letters read the same backwards.
+    '''
+    view = memoryview(letters)
+    half = len(view) // 2
+    return view[:half] == view[::-1][:half]
+
+
+def is_palindrome(s):
+    '''
+    Returns True if the letters of s (ignoring case and everything that is
+    not a letter) read the same backwards.
+    '''
+    return is_normalized_palindrome(normalize(s))
+
+
+def is_palindrome_batch(strings):
+    '''
+    Returns [is_palindrome(s) for s in strings].
+    '''
+    return [is_normalized_palindrome(normalize(s)) for s in strings]
+
+
+def is_palindrome_file(path, chunk_size=1 << 20):
+    '''
+    Returns True if the letters of the file at path read the same
+    backwards, holding at most about two chunks of it in memory.
+
+    Letters are read chunk by chunk from both ends of the memory-mapped
+    file, always topping up whichever side has fewer unmatched letters.
+    Each chunk is translated to its letters (a new bytes object per chunk,
+    and one more for reversing a back chunk) and appended to one of two
+    bytearrays: the front letters in file order, the back letters in
+    reverse order, so both are matched from their start and trimmed in
+    place. Once the two ends meet, the
+    letters left unmatched are the middle of the file, which must be a
+    palindrome by itself.
+    '''
+    if os.path.getsize(path) == 0:
+        return True
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        front_pos, back_pos = 0, len(data)
+        front = bytearray()   # unmatched letters from the front, in file order
+        back = bytearray()    # unmatched letters from the back, last letter first
+        while front_pos < back_pos:
+            take = min(chunk_size, back_pos - front_pos)
+            if len(front) <= len(back):
+                front += data[front_pos:front_pos + take].translate(LOWERCASE_TABLE, NON_LETTERS)
+                front_pos += take
+            else:
+                back += data[back_pos - take:back_pos].translate(LOWERCASE_TABLE, NON_LETTERS)[::-1]
+                back_pos -= take
+
+            matched = min(len(front), len(back))
+            with memoryview(front) as front_view, memoryview(back) as back_view:
+                if front_view[:matched] != back_view[:matched]:
+                    return False
+            del front[:matched]
+            del back[:matched]
+
+        # At most one side has letters left; reversed or not, the middle
+        # is a palindrome exactly when they are.
+        return is_normalized_palindrome(front or back)
+
+
+if __name__ == '__main__':
+    import random
+    import tempfile
+    import time
+
+    from ex_palindrom import isPalindrome, to_chars
+
+    # ex_palindrom recurses once per pair of letters, so keep this under the
+    # recursion limit.
+    text = "A man, a plan, a canal: Panama! " * 40
+    start = time.perf_counter()
+    for _ in range(100):
+        isPalindrome(to_chars(text))
+    print("ex_palindrom, {0} characters : {1:.6f} s".format(len(text), (time.perf_counter() - start) / 100))
+    start = time.perf_counter()
+    for _ in range(100):
+        is_palindrome(text)
+    print("is_palindrome, {0} characters: {1:.6f} s".format(len(text), (time.perf_counter() - start) / 100))
+
+    random.seed(0)
+    words = [''.join(random.choice('ab') for _ in range(random.randrange(1, 12))) for _ in range(1000000)]
+    start = time.perf_counter()
+    count = sum(is_palindrome_batch(words))
+    print("is_palindrome_batch of {0} strings: {1:.2f} s, {2} palindromes".format(len(words), time.perf_counter() - start, count))
+
+    half = ''.join(random.choice(string.ascii_letters + ' ,.') for _ in range(10 ** 6)) * 20
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        f.write(half)
+        f.write(half[::-1])
+    start = time.perf_counter()
+    result = is_palindrome_file(f.name)
+    print("is_palindrome_file, {0} MB: {1:.2f} s, {2}".format(os.path.getsize(f.name) >> 20, time.perf_counter() - start, result))
+    os.remove(f.name)
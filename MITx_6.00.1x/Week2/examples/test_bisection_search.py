@@ -0,0 +1,63 @@
+import os
+import tempfile
+
+from bisection_search import *
+
+#
+# Test code
+# To run these tests, simply run this file (open up in your IDE, then run the file as normal)
+
+class CountingSortedFile(SortedFile):
+    """
+    SortedFile that counts the lines it reads.
+    """
+    def __init__(self, path):
+        SortedFile.__init__(self, path)
+        self.lines_read = 0
+
+    def _line(self, start):
+        self.lines_read += 1
+        return SortedFile._line(self, start)
+
+
+def test_skewed_lines():
+    """
+    Unit test for SortedFile.bisect on many short lines followed by one
+    very long line: a lookup must stay logarithmic
+    """
+    failure=False
+    words = ["{0:06d}".format(i) for i in range(200000)]
+    long_line = "z" * 2000000
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        f.write('\n'.join(words + [long_line]) + '\n')
+    try:
+        with CountingSortedFile(f.name) as sorted_file:
+            for key, expected in [("000000", True), ("100000", True), ("199999", True), ("1999990", False),
+                                  ("200000", False), ("y", False), (long_line, True), ("zz", False)]:
+                sorted_file.lines_read = 0
+                found = key in sorted_file
+                if found != expected:
+                    print("FAILURE: test_skewed_lines()")
+                    print("\tExpected", expected, "but got", found, "for key", key[:10])
+                    failure=True
+                if sorted_file.lines_read > 100:
+                    print("FAILURE: test_skewed_lines()")
+                    print("\tLooking up", key[:10], "read", sorted_file.lines_read, "lines")
+                    failure=True
+            if sorted_file.contains_many(["000005", "150000", "zz", long_line]) != [True, True, False, True]:
+                print("FAILURE: test_skewed_lines()")
+                print("\tcontains_many disagrees with single lookups")
+                failure=True
+    finally:
+        os.remove(f.name)
+    if not failure:
+        print("SUCCESS: test_skewed_lines()")
+
+# end of test_skewed_lines
+
+
+print("----------------------------------------------------------------------")
+print("Testing SortedFile with skewed line lengths...")
+test_skewed_lines()
+print("----------------------------------------------------------------------")
+print("All done!")
@@ -0,0 +1,90 @@
+import math
+import random
+from functools import reduce
+
+from gcd import *
+
+#
+# Test code
+# To run these tests, simply run this file (open up in your IDE, then run the file as normal)
+
+def test_gcd_array():
+    """
+    Unit test for gcd_array
+    """
+    failure=False
+    # pairs of inputs and the expected gcd, scalars and 0-d arrays included
+    cases = [((12, 18), 6), ((0, 5), 5), ((7, 0), 7), ((0, 0), 0), ((-12, 18), 6),
+             ((np.array(48), np.array(36)), 12), ((np.int64(17), 51), 17)]
+    for (a, b), expected in cases:
+        result = gcd_array(a, b)
+        if np.ndim(result) != 0 or result != expected:
+            print("FAILURE: test_gcd_array()")
+            print("\tExpected scalar", expected, "but got", repr(result), "for", a, b)
+            failure=True
+
+    result = gcd_array(np.array([12, 0, 35, 17]), np.array([18, 4, 14, 0]))
+    if not np.array_equal(result, [6, 4, 7, 17]):
+        print("FAILURE: test_gcd_array()")
+        print("\tExpected [6 4 7 17] but got", result)
+        failure=True
+    result = gcd_array(np.array([[12], [9]]), 6)
+    if result.shape != (2, 1) or not np.array_equal(result, [[6], [3]]):
+        print("FAILURE: test_gcd_array()")
+        print("\tExpected [[6] [3]] but got", result)
+        failure=True
+    if not failure:
+        print("SUCCESS: test_gcd_array()")
+
+# end of test_gcd_array
+
+
+def test_batch_gcd():
+    """
+    Unit test for batch_gcd against math.gcd over every pair
+    """
+    failure=False
+    rng = random.Random(0)
+    sets = [[1], [1, 1], [7], [6, 10, 15], [1, 12, 18, 35], [2, 3, 5, 7, 11],
+            [rng.randrange(1, 10 ** 6) for _ in range(50)],
+            [rng.randrange(1, 10 ** 30) * p for p in (101, 103, 101, 107, 1, 103)]]
+    for values in sets:
+        expected = [math.gcd(x, reduce(lambda a, b: a * b, values[:i] + values[i + 1:], 1))
+                    for i, x in enumerate(values)]
+        result = batch_gcd(values)
+        if result != expected:
+            print("FAILURE: test_batch_gcd()")
+            print("\tExpected", expected, "but got", result, "for", values)
+            failure=True
+        # an entry above 1 means x shares a factor with another value
+        sharing = [any(math.gcd(x, y) > 1 for j, y in enumerate(values) if j != i) for i, x in enumerate(values)]
+        if [g > 1 for g in result] != sharing:
+            print("FAILURE: test_batch_gcd()")
+            print("\tExpected the values sharing a factor to be", sharing, "for", values)
+            failure=True
+    if batch_gcd([]) != []:
+        print("FAILURE: test_batch_gcd()")
+        print("\tExpected [] for no values but got", batch_gcd([]))
+        failure=True
+    for values in ([0], [4, 0, 6], [5, -3]):
+        try:
+            result = batch_gcd(values)
+            print("FAILURE: test_batch_gcd()")
+            print("\tExpected ValueError but got", result, "for", values)
+            failure=True
+        except ValueError:
+            pass
+    if not failure:
+        print("SUCCESS: test_batch_gcd()")
+
+# end of test_batch_gcd
+
+
+print("----------------------------------------------------------------------")
+print("Testing gcd_array...")
+test_gcd_array()
+print("----------------------------------------------------------------------")
+print("Testing batch_gcd...")
+test_batch_gcd()
+print("----------------------------------------------------------------------")
+print("All done!")
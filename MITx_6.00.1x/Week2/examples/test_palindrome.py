@@ -0,0 +1,81 @@
+import os
+import random
+import string
+import tempfile
+
+from ex_palindrom import isPalindrome, to_chars
+from palindrome import *
+
+#
+# Test code
+# To run these tests, simply run this file (open up in your IDE, then run the file as normal)
+
+def randomText(rng, palindrome):
+    """
+    Returns a short random string of letters, spaces and punctuation, made
+    a palindrome (in its letters) when palindrome is True.
+    """
+    text = ''.join(rng.choice('abAB ,.!') for _ in range(rng.randrange(0, 40)))
+    if palindrome:
+        text += rng.choice(['', 'c', ' ']) + text[::-1].swapcase()
+    return text
+
+def test_is_palindrome():
+    """
+    Unit test for is_palindrome and is_palindrome_batch against isPalindrome
+    """
+    failure=False
+    rng = random.Random(0)
+    texts = [randomText(rng, i % 2 == 0) for i in range(2000)] + ['', 'a', 'Ab', 'A man, a plan, a canal: Panama!']
+    expected = [isPalindrome(to_chars(text)) for text in texts]
+    for text, palindrome in zip(texts, expected):
+        if is_palindrome(text) != palindrome or is_palindrome(text.encode('ascii')) != palindrome:
+            print("FAILURE: test_is_palindrome()")
+            print("\tExpected", palindrome, "for", repr(text))
+            failure=True
+    if is_palindrome_batch(texts) != expected:
+        print("FAILURE: test_is_palindrome()")
+        print("\tis_palindrome_batch disagrees with isPalindrome")
+        failure=True
+    if not failure:
+        print("SUCCESS: test_is_palindrome()")
+
+# end of test_is_palindrome
+
+
+def test_is_palindrome_file():
+    """
+    Unit test for is_palindrome_file against isPalindrome, with chunks
+    small enough to make the two ends meet anywhere
+    """
+    failure=False
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'text.txt')
+        texts = [randomText(rng, i % 2 == 0) for i in range(300)]
+        # a long one, more than a few chunks of noise around a palindrome of letters
+        half = ''.join(rng.choice(string.ascii_letters + ' ,.\n') for _ in range(5000))
+        texts += [half + half[::-1], half + 'x' + half[::-1], half + 'x' + half[::-1] + 'y']
+        for text in texts:
+            with open(path, 'w') as f:
+                f.write(text)
+            expected = isPalindrome(to_chars(text)) if len(text) < 1000 else to_chars(text) == to_chars(text)[::-1]
+            for chunk_size in (1, 3, 7, 64, 1 << 20):
+                if is_palindrome_file(path, chunk_size) != expected:
+                    print("FAILURE: test_is_palindrome_file()")
+                    print("\tExpected", expected, "for", repr(text[:40]), "with chunk_size", chunk_size)
+                    failure=True
+    if not failure:
+        print("SUCCESS: test_is_palindrome_file()")
+
+# end of test_is_palindrome_file
+
+
+print("----------------------------------------------------------------------")
+print("Testing is_palindrome...")
+test_is_palindrome()
+print("----------------------------------------------------------------------")
+print("Testing is_palindrome_file...")
+test_is_palindrome_file()
+print("----------------------------------------------------------------------")
+print("All done!")
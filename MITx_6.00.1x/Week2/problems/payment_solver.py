@@ -0,0 +1,181 @@
+'''
+Fixed monthly payment solvers
+-----------------------------
+
+Month by month, as in problem sets 2a-2c:
+
+    unpaid balance = balance - payment
+    new balance    = round(unpaid balance * (1 + monthly interest rate), 2)
+
+Paying P every month for n months, starting from balance B at monthly
+rate r, leaves (ignoring the rounding to cents)
+
+    B * (1+r)**n - P * ((1+r) + (1+r)**2 + ... + (1+r)**n)
+
+so the payment that clears the balance has a closed form (an annuity).
+The rounding moves the exact answer by at most a few cents, which the
+solvers below correct by simulating the months.
+
+fixed_payment_closed_form works on scalars or NumPy arrays, and
+solve_fixed_payments bisects a whole portfolio of (balance, rate, tenure)
+accounts at once.
+'''
+import math
+import warnings
+
+import numpy as np
+
+from root_finding import find_root, remaining_balance
+
+
+def fixed_payment_closed_form(balance, monthly_interest_rate, tenure_in_months):
+    '''
+    Returns the payment that clears balance in tenure_in_months months,
+    without rounding to cents. Accepts scalars or NumPy arrays.
+    '''
+    balance = np.asarray(balance, dtype=float)
+    rate = np.asarray(monthly_interest_rate, dtype=float)
+    months = np.asarray(tenure_in_months, dtype=float)
+
+    growth = (1 + rate) ** months
+    with np.errstate(divide='ignore', invalid='ignore'):
+        payment = balance * rate * growth / ((1 + rate) * (growth - 1))
+    payment = np.where(rate == 0, balance / months, payment)
+    return payment if payment.ndim else float(payment)
+
+
+def simulate_balance(outstanding_amount, tenure_in_months, monthly_interest_rate, payment, stats=None):
+    '''
+    Returns the balance left after paying payment every month, rounding
+    to cents every month (root_finding.remaining_balance), and counts the
+    months in stats.
+    '''
+    return remaining_balance(outstanding_amount, tenure_in_months, monthly_interest_rate, stats)(payment)
+
+
+def lowest_payment_multiple(outstanding_amount, tenure_in_months, monthly_interest_rate, base_amount=10, step=10,
+                            method=None, stats=None):
+    '''
+    Returns the lowest payment of the form base_amount + k * step (k >= 0)
+    that leaves no balance after tenure_in_months months.
+
+    Starts from the closed-form payment, or, when method names one of the
+    root_finding methods, from the root it finds for the simulated
+    balance. From there it moves one step at a time, so it simulates only
+    a couple of tenures instead of one per step.
+
+    Without interest the bracket [balance / n, balance * (1+r)**n / n]
+    collapses to a point, so the closed form is used whatever the method.
+    stats, if given, counts the root finding and every simulated month.
+    '''
+    lower = outstanding_amount / tenure_in_months
+    upper = outstanding_amount * (1 + monthly_interest_rate) ** tenure_in_months / tenure_in_months
+    if method is None or upper <= lower:
+        exact = fixed_payment_closed_form(outstanding_amount, monthly_interest_rate, tenure_in_months)
+    else:
+        exact = find_root(remaining_balance(outstanding_amount, tenure_in_months, monthly_interest_rate, stats),
+                          lower, upper, method, tol=0.005, stats=stats)
+    k = max(0, int(math.ceil((exact - base_amount) / step)))
+
+    while simulate_balance(outstanding_amount, tenure_in_months, monthly_interest_rate, base_amount + k * step,
+                           stats) > 0:
+        k += 1
+    while k > 0 and simulate_balance(outstanding_amount, tenure_in_months, monthly_interest_rate,
+                                     base_amount + (k - 1) * step, stats) <= 0:
+        k -= 1
+    return base_amount + k * step
+
+
+def simulate_balances(balances, monthly_interest_rates, tenures_in_months, payments):
+    '''
+    Vectorized simulate_balance: returns the balance every account has left
+    after paying its payment every month for its own tenure.
+
+    Balances are rounded to cents every month with np.round, which agrees
+    with round() except, rarely, on a value exactly halfway between cents.
+    '''
+    balances = np.array(balances, dtype=float)
+    rates = np.broadcast_to(np.asarray(monthly_interest_rates, dtype=float), balances.shape)
+    tenures = np.broadcast_to(np.asarray(tenures_in_months), balances.shape)
+    payments = np.broadcast_to(np.asarray(payments, dtype=float), balances.shape)
+
+    for month in range(int(tenures.max()) if tenures.size else 0):
+        active = month < tenures
+        new_balances = np.round((balances - payments) * (1 + rates), 2)
+        balances = np.where(active, new_balances, balances)
+    return balances
+
+
+def solve_fixed_payments(balances, annual_interest_rates, tenures_in_months=12, tol=0.2, max_iter=200,
+                         return_converged=False):
+    '''
+    Bisects the fixed monthly payment of every account at once, as
+    problem_set_2c does for a single one: each payment is narrowed until
+    the balance it leaves is within tol of zero.
+
+    Rounding to cents every month makes the balance jump as the payment
+    moves, and over long tenures a jump can step over the whole
+    [-tol, tol] window. Such an account keeps the payment of its last
+    midpoint and is reported as not converged: in the returned mask when
+    return_converged is True, otherwise with a RuntimeWarning.
+
+    balances, annual_interest_rates, tenures_in_months: scalars or arrays
+      that broadcast to the same shape; tenures must be positive
+    returns: NumPy array of payments (a float for scalar inputs), and with
+      return_converged the boolean mask (a bool) of accounts whose balance
+      ended within tol of zero
+    '''
+    balances, rates, tenures = np.broadcast_arrays(
+        np.asarray(balances, dtype=float),
+        np.asarray(annual_interest_rates, dtype=float) / 12.0,
+        np.asarray(tenures_in_months, dtype=int))
+    if (tenures <= 0).any():
+        raise ValueError("tenures_in_months must be positive, got {0}".format(tenures.min()))
+    shape = balances.shape
+    balances, rates, tenures = balances.ravel(), rates.ravel(), tenures.ravel()
+
+    lower = balances / tenures
+    upper = balances * (1 + rates) ** tenures / tenures
+    payments = (lower + upper) / 2
+    pending = np.ones(balances.shape, dtype=bool)
+    converged = np.zeros(balances.shape, dtype=bool)
+
+    for _ in range(max_iter):
+        if not pending.any():
+            break
+        payments = np.where(pending, (lower + upper) / 2, payments)
+        left = simulate_balances(balances[pending], rates[pending], tenures[pending], payments[pending])
+
+        index = np.flatnonzero(pending)
+        upper[index[left < -tol]] = payments[index[left < -tol]]
+        lower[index[left > tol]] = payments[index[left > tol]]
+        converged[index[np.abs(left) <= tol]] = True
+        # Stop on convergence, or once the bracket is down to a single float.
+        pending[index[np.abs(left) <= tol]] = False
+        pending &= (lower + upper) / 2 != payments
+
+    if not return_converged and not converged.all():
+        warnings.warn("{0} of {1} accounts did not converge to within {2} of zero".format(
+            converged.size - np.count_nonzero(converged), converged.size, tol), RuntimeWarning, stacklevel=2)
+    payments = payments.reshape(shape) if shape else float(payments[0])
+    if return_converged:
+        return payments, (converged.reshape(shape) if shape else bool(converged[0]))
+    return payments
+
+
+if __name__ == '__main__':
+    import time
+
+    rng = np.random.default_rng(0)
+    count = 10000
+    balances = rng.uniform(100, 1000000, count).round(2)
+    rates = rng.uniform(0.05, 0.3, count)
+    tenures = rng.integers(12, 61, count)
+
+    start = time.perf_counter()
+    payments, converged = solve_fixed_payments(balances, rates, tenures, return_converged=True)
+    elapsed = time.perf_counter() - start
+    left = simulate_balances(balances, rates / 12.0, tenures, payments)
+    print("{0} accounts solved in {1:.2f} s, {2} converged, largest balance left: {3:.2f}".format(
+        count, elapsed, np.count_nonzero(converged), np.abs(left).max()))
+    print("Closed form for 999999 at 18% over 12 months: {0:.2f}".format(fixed_payment_closed_form(999999, 0.18 / 12, 12)))
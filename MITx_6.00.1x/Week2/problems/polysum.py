@@ -12,7 +12,8 @@ def polysum(n, s):
     
     return round(area + math.pow(perimeter,2),4)
 
-sides = 4
-length = 2.21
+if __name__ == '__main__':
+    sides = 4
+    length = 2.21
 
-print("For a polygon of {0} sides with each side of {1} length, the result is: {2}".format(sides, length, polysum(sides,length)))
+    print("For a polygon of {0} sides with each side of {1} length, the result is: {2}".format(sides, length, polysum(sides,length)))
@@ -0,0 +1,134 @@
+'''
+polysum over grids
+------------------
+
+Evaluates polysum (area + perimeter ** 2 of a regular polygon with n
+sides of length s) for whole arrays of side counts and lengths at once.
+n and s broadcast against each other like any NumPy operands, so a design
+grid is just
+
+    polysum_array(sides[:, None], lengths[None, :])
+
+The terms that depend on n alone (tan(pi / n)) are computed once per
+side count, not once per grid point.
+
+The float64 results agree with polysum within rounding, not bit for bit:
+np.tan can differ from math.tan in the last bit, and np.round scales by
+10**decimals before rounding where round() rounds the exact value. The
+difference is at most one unit of the last decimal kept, or a couple of
+ulps once the values are too large to hold that many decimals.
+
+Grids too large for memory are evaluated in chunks of rows (see
+polysum_chunked) and can be streamed to a .npy file (see write_polysum).
+'''
+import time
+
+import numpy as np
+
+from polysum import polysum
+
+
+def polysum_array(n, s, dtype=np.float64, decimals=4, out=None):
+    '''
+    Returns polysum(n, s) for every pair of the broadcast arrays n and s.
+
+    n: number of sides (>= 3), scalar or array
+    s: side length, scalar or array
+    dtype: np.float64 or np.float32, the type the values are computed and
+      returned in. float32 halves memory and bandwidth but keeps only
+      about 7 significant digits.
+    decimals: round the results like polysum does (within rounding, see
+      above); None skips rounding
+    out: optional preallocated array of the broadcast shape to fill
+    '''
+    n = np.asarray(n, dtype=dtype)
+    s = np.asarray(s, dtype=dtype)
+    tangents = np.tan(np.pi / n)
+    if out is None:
+        out = np.empty(np.broadcast_shapes(n.shape, s.shape), dtype=dtype)
+
+    # The operations of polysum, in the same order.
+    area = np.multiply(n, s * s, out=out)
+    area /= 4
+    area /= tangents
+    perimeter = n * s
+    perimeter *= perimeter
+    out += perimeter
+    if decimals is not None:
+        np.round(out, decimals, out=out)
+    return out
+
+
+def polysum_chunked(n, s, out=None, chunk_rows=1024, dtype=np.float64, decimals=4):
+    '''
+    Fills out with polysum_array(n, s), chunk_rows rows (along the first
+    axis of the broadcast shape) at a time, so the temporaries never grow
+    beyond one chunk. out may be a memory mapped array; if it is None a
+    new array is allocated.
+
+    returns: out
+    '''
+    shape = np.broadcast_shapes(np.shape(n), np.shape(s))
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    if not shape:
+        return polysum_array(n, s, dtype, decimals, out)
+
+    # Only inputs that vary along the first axis are sliced; a single row
+    # or column of the grid is passed to every chunk as it is, so its
+    # per-axis terms stay small. The products and the result still take
+    # the chunk's full shape.
+    n = _leading_axis(n, len(shape))
+    s = _leading_axis(s, len(shape))
+    for start in range(0, shape[0], chunk_rows):
+        stop = min(start + chunk_rows, shape[0])
+        polysum_array(_chunk(n, start, stop), _chunk(s, start, stop), dtype, decimals, out[start:stop])
+    return out
+
+
+def _leading_axis(a, ndim):
+    '''a with ones prepended to its shape up to ndim dimensions, as broadcasting does.'''
+    a = np.asarray(a)
+    return a.reshape((1,) * (ndim - a.ndim) + a.shape)
+
+
+def _chunk(a, start, stop):
+    return a if a.shape[0] == 1 else a[start:stop]
+
+
+def write_polysum(filename, n, s, chunk_rows=1024, dtype=np.float64, decimals=4):
+    '''
+    Evaluates the grid chunk by chunk straight into a memory mapped .npy
+    file, so the result never has to fit in memory.
+
+    returns: the result opened read-only with np.load(mmap_mode='r')
+    '''
+    shape = np.broadcast_shapes(np.shape(n), np.shape(s))
+    out = np.lib.format.open_memmap(filename, mode='w+', dtype=dtype, shape=shape)
+    polysum_chunked(n, s, out, chunk_rows, dtype, decimals)
+    out.flush()
+    del out
+    return np.load(filename, mmap_mode='r')
+
+
+if __name__ == '__main__':
+    sides = np.arange(3, 203)
+    lengths = np.linspace(0.01, 100.0, 5000)
+    grid = sides.size * lengths.size
+
+    start = time.perf_counter()
+    scalar = [polysum(int(n), float(s)) for n in sides[:20] for s in lengths]
+    elapsed = time.perf_counter() - start
+    print("polysum in a loop      : {0:12.0f} pairs/s".format(len(scalar) / elapsed))
+
+    for dtype in (np.float64, np.float32):
+        start = time.perf_counter()
+        result = polysum_array(sides[:, None], lengths[None, :], dtype=dtype)
+        elapsed = time.perf_counter() - start
+        print("polysum_array, {0:7s} : {1:12.0f} pairs/s".format(np.dtype(dtype).name, grid / elapsed))
+        if dtype is np.float64:
+            assert np.allclose(result[:20].ravel(), scalar, rtol=1e-13, atol=1e-4)
+
+    start = time.perf_counter()
+    polysum_chunked(sides[:, None], lengths[None, :], chunk_rows=16)
+    print("polysum_chunked        : {0:12.0f} pairs/s".format(grid / (time.perf_counter() - start)))
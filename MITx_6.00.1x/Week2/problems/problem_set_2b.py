@@ -23,36 +23,23 @@ Updated balance each month = (Monthly unpaid balance) + (Monthly interest rate x
 
 
 '''
+from payment_solver import lowest_payment_multiple
+from root_finding import SolverStats
+
 balance = 3329
 annualInterestRate = 0.2
 
 monthlyInterestRate = annualInterestRate/12.0
 
 
-def calculate_unpaid_balance(payment, prev_balance):
-    return prev_balance - payment
-
-def calculate_new_balance(unpaid_balance, interest_rate):
-    return round(unpaid_balance * (1 + interest_rate),2)
-
-
-def calculate_fixed_monthly_payment(outstanding_amount, tenure_in_months, monthly_interest_rate, base_amount=10):
-    # return monthly_min_payment_rate * prev_balance
-    lowest_payment_amount = base_amount
-    current_outstanding_amount = outstanding_amount
-    new_outstanding_amount = outstanding_amount
-
-    for _ in range(tenure_in_months):
-        current_outstanding_amount = calculate_unpaid_balance(lowest_payment_amount, new_outstanding_amount)
-        new_outstanding_amount = calculate_new_balance(current_outstanding_amount, monthly_interest_rate)
-
-    if new_outstanding_amount <= 0:
-        return lowest_payment_amount
-    else:
-        lowest_payment_amount += 10
-        return calculate_fixed_monthly_payment(outstanding_amount, tenure_in_months, monthly_interest_rate, lowest_payment_amount)
+def calculate_fixed_monthly_payment(outstanding_amount, tenure_in_months, monthly_interest_rate, base_amount=10, stats=None):
+    # Lowest payment (a multiple of $10 from base_amount) that clears the balance.
+    # Starts from the root Brent's method finds instead of recursing once per $10.
+    return lowest_payment_multiple(outstanding_amount, tenure_in_months, monthly_interest_rate, base_amount, 10, method='brent', stats=stats)
 
 
 
-emi = calculate_fixed_monthly_payment(balance, 12, monthlyInterestRate, 10)
-print("Lowest Payment: {0}".format(emi))
\ No newline at end of file
+stats = SolverStats()
+emi = calculate_fixed_monthly_payment(balance, 12, monthlyInterestRate, 10, stats=stats)
+print("Lowest Payment: {0}".format(emi))
+print("Found in {0} iterations, {1} evaluations ({2} simulated months)".format(stats.iterations, stats.evaluations, stats.simulated_months))
\ No newline at end of file
@@ -23,6 +23,8 @@ Updated balance each month = (Monthly unpaid balance) + (Monthly interest rate x
 
 
 '''
+from root_finding import SolverStats, find_root, remaining_balance
+
 balance = 999999
 annualInterestRate = 0.18
 
@@ -31,34 +33,15 @@ monthlyPaymentLowerBound = balance/12
 monthlyPaymentUpperBound = (balance*(1+monthlyInterestRate)**12)/12.0
 tol = 0.2
 
-def calculate_unpaid_balance(payment, prev_balance):
-    return prev_balance - payment
-
-def calculate_new_balance(unpaid_balance, interest_rate):
-    return round(unpaid_balance * (1 + interest_rate),2)
-
-
-def calculate_fixed_monthly_payment(outstanding_amount, tenure_in_months, monthly_interest_rate, ub, lb, tol):
-    
-    lowest_payment_amount = (lb + ub)/2
-    current_outstanding_amount = outstanding_amount
-    new_outstanding_amount = outstanding_amount
-
-    for _ in range(tenure_in_months):
-        current_outstanding_amount = calculate_unpaid_balance(lowest_payment_amount, new_outstanding_amount)
-        new_outstanding_amount = calculate_new_balance(current_outstanding_amount, monthly_interest_rate)
-        
-    if abs(new_outstanding_amount) <= tol:
-        return lowest_payment_amount
-    elif new_outstanding_amount < -tol:
-        ub = lowest_payment_amount
-        return calculate_fixed_monthly_payment(outstanding_amount, tenure_in_months, monthly_interest_rate, ub, lb, tol)
-    elif new_outstanding_amount > tol:
-        lb = lowest_payment_amount
-        return calculate_fixed_monthly_payment(outstanding_amount, tenure_in_months, monthly_interest_rate, ub, lb, tol)
-
+def calculate_fixed_monthly_payment(outstanding_amount, tenure_in_months, monthly_interest_rate, ub, lb, tol, method='bisection', stats=None):
+    # Payment between lb and ub that leaves a balance within tol of zero.
+    # Iterates in root_finding instead of recursing once per halving.
+    f = remaining_balance(outstanding_amount, tenure_in_months, monthly_interest_rate, stats)
+    return find_root(f, lb, ub, method, tol, stats=stats)
 
 
 
-emi = calculate_fixed_monthly_payment(balance, 12, monthlyInterestRate, monthlyPaymentUpperBound, monthlyPaymentLowerBound, tol)
-print("Lowest Payment: {0}".format(round(emi,2)))
\ No newline at end of file
+stats = SolverStats()
+emi = calculate_fixed_monthly_payment(balance, 12, monthlyInterestRate, monthlyPaymentUpperBound, monthlyPaymentLowerBound, tol, stats=stats)
+print("Lowest Payment: {0}".format(round(emi,2)))
+print("Found in {0} iterations, {1} evaluations ({2} simulated months)".format(stats.iterations, stats.evaluations, stats.simulated_months))
@@ -0,0 +1,204 @@
+'''
+Root finding for the payment problems
+-------------------------------------
+
+Iterative (non-recursive) bisection, secant and Brent methods for
+f(x) = 0, sharing problem_set_2c's notion of convergence: a root is any
+x with abs(f(x)) <= tol (e.g. a balance within 20 cents of zero for
+tol = 0.2).
+
+Every solver fills in a SolverStats, so the methods can be compared by
+the number of iterations and function evaluations they needed, and by
+wall time. remaining_balance counts the months it simulates in the same
+SolverStats, and every solver records whether it converged.
+'''
+import time
+
+
+class SolverStats(object):
+    '''
+    Counters of one root-finding run.
+    '''
+    def __init__(self):
+        self.iterations = 0
+        self.evaluations = 0
+        self.simulated_months = 0
+        self.wall_time = 0.0
+        self.converged = None
+
+    def __repr__(self):
+        return ("SolverStats(iterations={0}, evaluations={1}, simulated_months={2}, wall_time={3:.6f}, "
+                "converged={4})").format(self.iterations, self.evaluations, self.simulated_months, self.wall_time,
+                                         self.converged)
+
+
+def _counted(f, stats):
+    def counted_f(x):
+        stats.evaluations += 1
+        return f(x)
+    return counted_f
+
+
+def bisect(f, lower, upper, tol=0.2, max_iter=200, stats=None):
+    '''
+    Halves [lower, upper] until the midpoint x has abs(f(x)) <= tol.
+    f(lower) and f(upper) must have opposite signs. Returns the last
+    midpoint; stats.converged is False when max_iter ran out first.
+    '''
+    stats = stats if stats is not None else SolverStats()
+    f = _counted(f, stats)
+    start = time.perf_counter()
+
+    f_lower, f_upper = f(lower), f(upper)
+    if f_lower * f_upper > 0:
+        stats.wall_time += time.perf_counter() - start
+        raise ValueError("f(lower) and f(upper) must have opposite signs")
+    lower_sign = f_lower > 0
+    x = (lower + upper) / 2.0
+    stats.converged = False
+    for _ in range(max_iter):
+        stats.iterations += 1
+        x = (lower + upper) / 2.0
+        fx = f(x)
+        if abs(fx) <= tol:
+            stats.converged = True
+            break
+        if (fx > 0) == lower_sign:
+            lower = x
+        else:
+            upper = x
+    stats.wall_time += time.perf_counter() - start
+    return x
+
+
+def secant(f, x0, x1, tol=0.2, max_iter=200, stats=None):
+    '''
+    Follows the secant through the last two points until abs(f(x)) <= tol.
+    Fast when f is nearly linear (as balances are in the payment), but
+    not bracketed: it can wander off for badly behaved f, which leaves
+    stats.converged False.
+    '''
+    stats = stats if stats is not None else SolverStats()
+    f = _counted(f, stats)
+    start = time.perf_counter()
+
+    f0 = f(x0)
+    f1 = f(x1)
+    for _ in range(max_iter):
+        stats.iterations += 1
+        if abs(f1) <= tol or f1 == f0:
+            break
+        x0, x1 = x1, x1 - f1 * (x1 - x0) / (f1 - f0)
+        f0, f1 = f1, f(x1)
+    stats.converged = abs(f1) <= tol
+    stats.wall_time += time.perf_counter() - start
+    return x1
+
+
+def brent(f, lower, upper, tol=0.2, max_iter=200, stats=None, xtol=1e-12):
+    '''
+    Brent's method: inverse quadratic interpolation and secant steps,
+    falling back to bisection whenever they would leave the bracket or
+    converge too slowly. f(lower) and f(upper) must have opposite signs.
+    stats.converged is False when the bracket shrank below xtol or max_iter
+    ran out before abs(f(x)) <= tol.
+    '''
+    stats = stats if stats is not None else SolverStats()
+    f = _counted(f, stats)
+    start = time.perf_counter()
+
+    a, b = lower, upper
+    fa, fb = f(a), f(b)
+    if fa * fb > 0:
+        stats.wall_time += time.perf_counter() - start
+        raise ValueError("f(lower) and f(upper) must have opposite signs")
+    if abs(fa) < abs(fb):
+        a, b, fa, fb = b, a, fb, fa
+    c, fc = a, fa
+    d = e = b - a
+
+    for _ in range(max_iter):
+        stats.iterations += 1
+        if abs(fb) <= tol:
+            break
+        if fb * fc > 0:
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        m = (c - b) / 2.0
+        if abs(m) <= xtol:
+            break
+
+        if abs(e) >= xtol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                p = 2.0 * m * s
+                q = 1.0 - s
+            else:
+                q = fa / fc
+                r = fb / fc
+                p = s * (2.0 * m * q * (q - r) - (b - a) * (r - 1.0))
+                q = (q - 1.0) * (r - 1.0) * (s - 1.0)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2.0 * p < min(3.0 * m * q - abs(xtol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = m
+        else:
+            d = e = m
+
+        a, fa = b, fb
+        b += d if abs(d) > xtol else (xtol if m > 0 else -xtol)
+        fb = f(b)
+    stats.converged = abs(fb) <= tol
+    stats.wall_time += time.perf_counter() - start
+    return b
+
+
+METHODS = {
+    'bisection': bisect,
+    'secant': secant,
+    'brent': brent,
+}
+
+
+def find_root(f, lower, upper, method='bisection', tol=0.2, max_iter=200, stats=None):
+    '''
+    Solves f(x) = 0 with one of METHODS, starting from lower and upper
+    (the bracket, or the two starting points of the secant method).
+    '''
+    return METHODS[method](f, lower, upper, tol=tol, max_iter=max_iter, stats=stats)
+
+
+def remaining_balance(outstanding_amount, tenure_in_months, monthly_interest_rate, stats=None):
+    '''
+    Returns f(payment): the balance left after paying payment every month,
+    rounding to cents every month as in problem sets 2a-2c. This is the one
+    month by month loop; payment_solver.simulate_balance and problem set 2c
+    use it too. Every call adds the months it simulates to stats.
+    '''
+    def f(payment):
+        if stats is not None:
+            stats.simulated_months += tenure_in_months
+        balance = outstanding_amount
+        for _ in range(tenure_in_months):
+            balance = round((balance - payment) * (1 + monthly_interest_rate), 2)
+        return balance
+    return f
+
+
+if __name__ == '__main__':
+    balance = 999999
+    monthly_interest_rate = 0.18 / 12.0
+    lower = balance / 12
+    upper = (balance * (1 + monthly_interest_rate) ** 12) / 12.0
+    for method in sorted(METHODS):
+        stats = SolverStats()
+        f = remaining_balance(balance, 12, monthly_interest_rate, stats)
+        payment = find_root(f, lower, upper, method, tol=0.2, stats=stats)
+        left = remaining_balance(balance, 12, monthly_interest_rate)(payment)
+        print("{0:9s}: payment {1:.2f}, balance left {2:6.2f}, {3}".format(method, payment, left, stats))
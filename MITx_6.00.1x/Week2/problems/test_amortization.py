@@ -0,0 +1,81 @@
+import os
+import tempfile
+
+import numpy as np
+
+from amortization import *
+
+#
+# Test code
+# To run these tests, simply run this file (open up in your IDE, then run the file as normal)
+
+def test_amortization_schedule():
+    """
+    Unit test for amortization_schedule
+    """
+    failure=False
+    # problem set 2a: 484 at 20% paying 4% a month leaves 361.62 after a year
+    schedule = amortization_schedule(484, 0.2, 0.04)
+    if schedule['balance'].shape != (1, 12) or schedule['balance'][0, -1] != 361.62:
+        print("FAILURE: test_amortization_schedule()")
+        print("\tExpected 361.62 but got", schedule['balance'][0, -1], "for problem set 2a")
+        failure=True
+    if schedule['payment'][0, 0] != 0.04 * 484 or schedule['unpaid_balance'][0, 0] != 484 - 0.04 * 484:
+        print("FAILURE: test_amortization_schedule()")
+        print("\tFirst month paid", schedule['payment'][0, 0], "leaving", schedule['unpaid_balance'][0, 0])
+        failure=True
+
+    # every account of a batch follows the month loop of problem set 2a
+    rng = np.random.default_rng(0)
+    balances = rng.uniform(100, 50000, 50).round(2)
+    rates = rng.uniform(0.05, 0.3, 50)
+    paymentRates = rng.uniform(0.02, 0.05, 50)
+    schedule = amortization_schedule(balances, rates, paymentRates, 24)
+    for account in range(50):
+        balance = balances[account]
+        for month in range(24):
+            balance = round((balance - paymentRates[account] * balance) * (1 + rates[account] / 12.0), 2)
+        if schedule['balance'][account, -1] != balance:
+            print("FAILURE: test_amortization_schedule()")
+            print("\tExpected", balance, "but got", schedule['balance'][account, -1], "for account", account)
+            failure=True
+    if not failure:
+        print("SUCCESS: test_amortization_schedule()")
+
+# end of test_amortization_schedule
+
+
+def test_write_schedules():
+    """
+    Unit test for write_schedules
+    """
+    failure=False
+    rng = np.random.default_rng(1)
+    balances = rng.uniform(100, 50000, 25).round(2)
+    rates = rng.uniform(0.05, 0.3, 25)
+    paymentRates = rng.uniform(0.02, 0.05, 25)
+    expected = amortization_schedule(balances, rates, paymentRates, 36)
+    with tempfile.TemporaryDirectory() as directory:
+        filenames = write_schedules(directory, balances, rates, paymentRates, 36, chunk_size=10)
+        for column in SCHEDULE_COLUMNS:
+            written = np.load(filenames[column])
+            # one row per account and one column per month
+            if written.shape != (25, 36) or not np.array_equal(written, expected[column]):
+                print("FAILURE: test_write_schedules()")
+                print("\tExpected", column, "of shape (25, 36) but got", written.shape)
+                failure=True
+            del written
+    if not failure:
+        print("SUCCESS: test_write_schedules()")
+
+# end of test_write_schedules
+
+
+print("----------------------------------------------------------------------")
+print("Testing amortization_schedule...")
+test_amortization_schedule()
+print("----------------------------------------------------------------------")
+print("Testing write_schedules...")
+test_write_schedules()
+print("----------------------------------------------------------------------")
+print("All done!")
@@ -0,0 +1,128 @@
+from payment_solver import *
+from root_finding import SolverStats, bisect
+
+#
+# Test code
+# To run these tests, simply run this file (open up in your IDE, then run the file as normal)
+
+def test_lowest_payment_multiple():
+    """
+    Unit test for lowest_payment_multiple
+    """
+    failure=False
+    # (balance, tenure, monthly rate): lowest multiple of $10 that clears it
+    cases = {(3329, 12, 0.2/12.0):310, (4773, 12, 0.2/12.0):440, (3926, 12, 0.2/12.0):360,
+             (1000, 12, 0.0):90, (1200, 12, 0.0):100, (0, 12, 0.0):10}
+    for (balance, tenure, rate) in cases.keys():
+        for method in (None, 'bisection', 'secant', 'brent'):
+            try:
+                payment = lowest_payment_multiple(balance, tenure, rate, method=method)
+            except ValueError as error:
+                payment = error
+            if payment != cases[(balance, tenure, rate)]:
+                print("FAILURE: test_lowest_payment_multiple()")
+                print("\tExpected", cases[(balance, tenure, rate)], "but got '" + str(payment) + "' for balance",
+                      balance, "rate", rate, "method", method)
+                failure=True
+    if not failure:
+        print("SUCCESS: test_lowest_payment_multiple()")
+
+# end of test_lowest_payment_multiple
+
+
+def test_simulate_balance():
+    """
+    Unit test for simulate_balance
+    """
+    failure=False
+    # without interest the balance goes down by exactly the payments
+    for (balance, tenure, payment) in ((1000, 12, 90), (1000, 12, 100), (1200, 12, 100)):
+        left = simulate_balance(balance, tenure, 0.0, payment)
+        if left != round(balance - tenure * payment, 2):
+            print("FAILURE: test_simulate_balance()")
+            print("\tExpected", balance - tenure * payment, "but got", left, "for balance", balance, "payment", payment)
+            failure=True
+    if not failure:
+        print("SUCCESS: test_simulate_balance()")
+
+# end of test_simulate_balance
+
+
+def test_solver_stats():
+    """
+    Unit test for the SolverStats lowest_payment_multiple and the root_finding methods fill in
+    """
+    failure=False
+    for method in (None, 'bisection', 'secant', 'brent'):
+        stats = SolverStats()
+        lowest_payment_multiple(3329, 12, 0.2/12.0, method=method, stats=stats)
+        # every evaluation of the balance and every step after it simulates 12 months
+        if stats.simulated_months < 12 * max(stats.evaluations, 1) or stats.simulated_months % 12:
+            print("FAILURE: test_solver_stats()")
+            print("\tmethod", method, "counted", stats.simulated_months, "months for", stats.evaluations, "evaluations")
+            failure=True
+    f = remaining_balance(3329, 12, 0.2/12.0)
+    try:
+        bisect(f, 400, 500)
+        print("FAILURE: test_solver_stats()")
+        print("\tbisect accepted [400, 500], which does not bracket a root")
+        failure=True
+    except ValueError:
+        pass
+    stats = SolverStats()
+    bisect(f, 3329 / 12.0, 3329.0, tol=0.0, max_iter=5, stats=stats)
+    if stats.converged is not False or stats.iterations != 5:
+        print("FAILURE: test_solver_stats()")
+        print("\tbisect with tol=0 and max_iter=5 reported", stats)
+        failure=True
+    if not failure:
+        print("SUCCESS: test_solver_stats()")
+
+# end of test_solver_stats
+
+
+def test_solve_fixed_payments():
+    """
+    Unit test for solve_fixed_payments
+    """
+    failure=False
+    rng = np.random.default_rng(0)
+    balances = rng.uniform(100, 1000000, 2000).round(2)
+    rates = rng.uniform(0.05, 0.3, 2000)
+    tenures = rng.integers(12, 361, 2000)
+    payments, converged = solve_fixed_payments(balances, rates, tenures, return_converged=True)
+    left = np.abs(simulate_balances(balances, rates / 12.0, tenures, payments))
+    # the mask must say exactly which accounts ended within tol of zero
+    if not np.array_equal(converged, left <= 0.2):
+        print("FAILURE: test_solve_fixed_payments()")
+        print("\tconverged mask disagrees with the balances left for",
+              np.count_nonzero(converged != (left <= 0.2)), "accounts")
+        failure=True
+    for tenure in (0, -12):
+        try:
+            solve_fixed_payments(1000, 0.2, tenure)
+        except ValueError:
+            continue
+        print("FAILURE: test_solve_fixed_payments()")
+        print("\tExpected ValueError for a tenure of", tenure)
+        failure=True
+    if not failure:
+        print("SUCCESS: test_solve_fixed_payments()")
+
+# end of test_solve_fixed_payments
+
+
+print("----------------------------------------------------------------------")
+print("Testing lowest_payment_multiple...")
+test_lowest_payment_multiple()
+print("----------------------------------------------------------------------")
+print("Testing simulate_balance...")
+test_simulate_balance()
+print("----------------------------------------------------------------------")
+print("Testing SolverStats...")
+test_solver_stats()
+print("----------------------------------------------------------------------")
+print("Testing solve_fixed_payments...")
+test_solve_fixed_payments()
+print("----------------------------------------------------------------------")
+print("All done!")
@@ -0,0 +1,40 @@
+import numpy as np
+
+from polysum import polysum
+from polysum_grid import *
+
+#
+# Test code
+# To run these tests, simply run this file (open up in your IDE, then run the file as normal)
+
+def test_polysum_array():
+    """
+    Unit test for polysum_array and polysum_chunked against polysum
+    """
+    failure=False
+    rng = np.random.default_rng(0)
+    sides = np.concatenate([np.arange(3, 13), rng.integers(13, 1001, 40)])
+    lengths = np.concatenate([[0.0, 0.01, 1.0, 2.21], rng.uniform(0, 1000, 60)])
+    expected = np.array([[polysum(int(n), float(s)) for s in lengths] for n in sides])
+
+    grids = {'polysum_array': polysum_array(sides[:, None], lengths[None, :]),
+             'polysum_chunked': polysum_chunked(sides[:, None], lengths[None, :], chunk_rows=7)}
+    for name, grid in grids.items():
+        # within one unit of the 4th decimal, or a couple of ulps for values too large to hold 4 decimals
+        close = np.isclose(grid, expected, rtol=1e-13, atol=1e-4)
+        if not close.all():
+            i, j = np.argwhere(~close)[0]
+            print("FAILURE: test_polysum_array()")
+            print("\tExpected", expected[i, j], "but", name, "got", grid[i, j], "for n", sides[i], "s", lengths[j])
+            failure=True
+    if not failure:
+        print("SUCCESS: test_polysum_array()")
+
+# end of test_polysum_array
+
+
+print("----------------------------------------------------------------------")
+print("Testing polysum_array...")
+test_polysum_array()
+print("----------------------------------------------------------------------")
+print("All done!")
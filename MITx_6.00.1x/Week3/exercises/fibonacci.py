@@ -0,0 +1,117 @@
+'''
+Fibonacci numbers for arbitrary n
+---------------------------------
+
+Uses the same numbering as fib_efficient in fibonacci_with_dict.py:
+fib(0) == fib(1) == 1, fib(2) == 2, fib(3) == 3, fib(4) == 5, ...
+(i.e. fib(n) is F(n+1) of the usual F(0) = 0, F(1) = 1 sequence).
+
+fast doubling computes F(2k) and F(2k+1) from F(k) and F(k+1):
+
+    F(2k)   = F(k) * (2*F(k+1) - F(k))
+    F(2k+1) = F(k)**2 + F(k+1)**2
+
+so F(n) takes O(log n) steps, with no recursion and no table.
+'''
+import time
+from collections import OrderedDict
+
+
+def fib_pair(k):
+    '''
+    Returns (F(k), F(k+1)) by fast doubling, walking the bits of k from the
+    most significant one.
+    '''
+    if k < 0:
+        raise ValueError("k must be >= 0")
+    a, b = 0, 1
+    for bit in bin(k)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if bit == '1':
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a, b
+
+
+def fib(n):
+    '''
+    Returns the n-th Fibonacci number, numbered like fib_efficient.
+    '''
+    return fib_pair(n + 1)[0]
+
+
+class FibonacciCache(object):
+    '''
+    fib with a memo that keeps at most maxsize results, dropping the least
+    recently used one when full (None keeps everything).
+    '''
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.memo = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, n):
+        if n in self.memo:
+            self.hits += 1
+            self.memo.move_to_end(n)
+            return self.memo[n]
+        self.misses += 1
+        value = fib(n)
+        self.memo[n] = value
+        if self.maxsize is not None and len(self.memo) > self.maxsize:
+            self.memo.popitem(last=False)
+        return value
+
+
+def fib_batch(ns, max_step=64):
+    '''
+    Returns [fib(n) for n in ns], answering the queries in one sweep over
+    the sorted distinct n. Gaps of at most max_step are walked with plain
+    additions from the previous answer; larger gaps jump ahead with
+    F(k+d) = F(d)*F(k+1) + F(d-1)*F(k).
+    '''
+    answers = {}
+    k = None
+    a = b = 0  # F(k), F(k+1)
+    for n in sorted(set(ns)):
+        target = n + 1
+        if k is None:
+            a, b = fib_pair(target)
+        elif target - k <= max_step:
+            for _ in range(target - k):
+                a, b = b, a + b
+        else:
+            f_d, f_d1 = fib_pair(target - k)   # F(d), F(d+1)
+            f_dm1 = f_d1 - f_d                 # F(d-1)
+            a, b = f_d * b + f_dm1 * a, f_d1 * b + f_d * a
+        k = target
+        answers[n] = a
+    return [answers[n] for n in ns]
+
+
+if __name__ == '__main__':
+    import sys
+    from fibonacci_with_dict import fib_efficient
+
+    for exponent in range(3, 7):
+        n = 10 ** exponent
+        start = time.perf_counter()
+        value = fib(n)
+        doubling = time.perf_counter() - start
+
+        try:
+            start = time.perf_counter()
+            assert fib_efficient(n, {1: 1, 2: 2}) == value
+            memo = "{0:.6f} s".format(time.perf_counter() - start)
+        except RecursionError:
+            memo = "RecursionError (limit {0})".format(sys.getrecursionlimit())
+
+        print("n = 10^{0}: fast doubling {1:.6f} s, fib_efficient {2}".format(exponent, doubling, memo))
+
+    queries = list(range(0, 100000, 7))
+    start = time.perf_counter()
+    batch = fib_batch(queries)
+    print("fib_batch of {0} queries up to {1}: {2:.3f} s".format(len(queries), queries[-1], time.perf_counter() - start))
@@ -14,5 +14,6 @@ def fib_efficient(n, d=d):
         return ans
 
 
-print(fib_efficient(640,d))
-print(d)
\ No newline at end of file
+if __name__ == '__main__':
+    print(fib_efficient(640,d))
+    print(d)
\ No newline at end of file
@@ -0,0 +1,75 @@
+import random
+
+from fibonacci import *
+from fibonacci_with_dict import fib_efficient
+
+#
+# Test code
+# To run these tests, simply run this file (open up in your IDE, then run the file as normal)
+
+def referenceFibs(limit):
+    """
+    Returns [fib_efficient(n) for n in range(limit + 1)], filling the memo
+    in order so the recursion never goes more than one level deep.
+    fib_efficient has no base case for 0, which is 1 in its numbering.
+    """
+    memo = {1: 1, 2: 2}
+    return [1] + [fib_efficient(n, memo) for n in range(1, limit + 1)]
+
+def test_fib(expected):
+    """
+    Unit test for fib, fib_pair and FibonacciCache against fib_efficient
+    """
+    failure=False
+    cache = FibonacciCache(maxsize=16)
+    for n in list(range(201)) + [1000, 4321, 20000]:
+        if fib(n) != expected[n] or cache(n) != expected[n] or fib_pair(n + 1) != (expected[n], expected[n + 1]):
+            print("FAILURE: test_fib()")
+            print("\tfib, FibonacciCache or fib_pair is wrong for n =", n)
+            failure=True
+    if len(cache.memo) > 16 or cache(20000) != expected[20000] or cache.hits != 1:
+        print("FAILURE: test_fib()")
+        print("\tThe cache holds", len(cache.memo), "results with", cache.hits, "hits")
+        failure=True
+    try:
+        fib_pair(-1)
+        print("FAILURE: test_fib()")
+        print("\tExpected ValueError for fib_pair(-1)")
+        failure=True
+    except ValueError:
+        pass
+    if not failure:
+        print("SUCCESS: test_fib()")
+
+# end of test_fib
+
+
+def test_fib_batch(expected):
+    """
+    Unit test for fib_batch against fib_efficient
+    """
+    failure=False
+    rng = random.Random(0)
+    queries = [list(range(201)), list(range(200, -1, -3)), [1000, 4321, 20000, 4321, 0],
+               [rng.randrange(0, 20001) for _ in range(100)], []]
+    for ns in queries:
+        for max_step in (64, 1):
+            if fib_batch(ns, max_step) != [expected[n] for n in ns]:
+                print("FAILURE: test_fib_batch()")
+                print("\tfib_batch is wrong for", len(ns), "queries with max_step", max_step)
+                failure=True
+    if not failure:
+        print("SUCCESS: test_fib_batch()")
+
+# end of test_fib_batch
+
+
+expected = referenceFibs(20001)
+print("----------------------------------------------------------------------")
+print("Testing fib...")
+test_fib(expected)
+print("----------------------------------------------------------------------")
+print("Testing fib_batch...")
+test_fib_batch(expected)
+print("----------------------------------------------------------------------")
+print("All done!")
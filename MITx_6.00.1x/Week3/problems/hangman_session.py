@@ -0,0 +1,71 @@
+# Hangman as an I/O-free session
+#
+# HangmanSession plays the same game as hangman(), but is fed one line
+# of input at a time and returns the lines to show instead of calling
+# input() and print().
+
+import random
+
+from ps3_hangman import *
+
+
+class HangmanSession(object):
+    """
+    One player's game of Hangman.
+
+    start() returns the first lines to show, handle() takes every guess
+    and returns the lines to show next. finished becomes True once the
+    word is guessed or the guesses run out.
+
+    wordlist: list of words to pick the secret word from, shared by
+      every session
+    secretWord: string, picked at random from wordlist when omitted
+    rng: random.Random used to pick the secret word
+    """
+    GUESS_PROMPT = "Please guess a letter:"
+
+    def __init__(self, wordlist, secretWord=None, rng=None):
+        if secretWord is None:
+            rng = rng if rng is not None else random.Random()
+            secretWord = rng.choice(wordlist)
+        self.state = HangmanState(secretWord.lower(), 8)
+        self.finished = False
+
+    def start(self):
+        secretWord = self.state.secretWord
+        return ["Welcome to the game Hangman!",
+                "I am thinking of a word that is {0} letters long".format(len(secretWord))] + self.roundLines()
+
+    def roundLines(self):
+        state = self.state
+        lines = ["-----------"]
+        if state.isWordGuessed():
+            self.finished = True
+            return lines + ["Congratulations, you won!"]
+        if state.guessesLeft <= 0:
+            self.finished = True
+            return lines + ["Sorry, you ran out of guesses. The word was {0}.".format(state.secretWord)]
+        return lines + ["You have {0} guesses left".format(state.guessesLeft),
+                        "Available Letters: {0}".format(state.getAvailableLetters()),
+                        self.GUESS_PROMPT]
+
+    def handle(self, line):
+        """
+        Handles one guess and returns the lines to show.
+
+        line: string, without the line ending
+        returns: list (string)
+        """
+        if self.finished:
+            return []
+        result = self.state.guess(line.strip().lower())
+        guessedWord = self.state.getGuessedWord()
+        if result == 'invalid':
+            message = "Oops! Please guess a single letter from a to z: {0}".format(guessedWord)
+        elif result == 'repeat':
+            message = "Oops! You've already guessed that letter: {0}".format(guessedWord)
+        elif result == 'miss':
+            message = "Oops! That letter is not in my word: {0}".format(guessedWord)
+        else:
+            message = "Good guess: {0}".format(guessedWord)
+        return [message] + self.roundLines()
@@ -0,0 +1,247 @@
+# Automatic guesser for Hangman
+#
+# Keeps the set of dictionary words that still agree with the guessed
+# word and the wrong guesses, narrowing it after every guess, and guesses
+# the letter whose answer is expected to tell it the most about the
+# secret word. Run this file to play every word in words.txt.
+
+import argparse
+import math
+import time
+
+from ps3_hangman import *
+
+MAX_WRONG_GUESSES = 8
+
+# Most letter choices a HangmanIndex keeps in decisions. The memo is
+# cleared whenever it grows past this, so the memory of a long-running
+# solver stays bounded however many games it plays.
+DECISION_MEMO_LIMIT = 200000
+
+
+def getCandidateIds(bits):
+    """
+    Returns the positions of the set bits of bits, lowest first.
+    """
+    return [i for i, bit in enumerate(reversed(bin(bits)[2:])) if bit == '1']
+
+
+def parseGuessedWord(guessedWord):
+    """
+    Splits the output of getGuessedWord back into one entry per letter of
+    the secret word: the letter if it has been guessed, None otherwise.
+
+    guessedWord: string, e.g. 'a_ _ le'
+    returns: list (string or None)
+    """
+    pattern = []
+    i = 0
+    while i < len(guessedWord):
+        if guessedWord[i] == '_':
+            pattern.append(None)
+            i += 2
+        else:
+            pattern.append(guessedWord[i])
+            i += 1
+    return pattern
+
+
+class HangmanIndex(object):
+    """
+    The words of a word list grouped by length, with two indexes per
+    length kept as bitsets over that length's words (bit i for word i):
+
+    * positionIndex[length][(position, letter)]: words with letter at
+      position
+    * letterIndex[length][letter]: words containing letter anywhere
+
+    letterPositions[length][i] maps every letter of word i to the bitmask
+    of the positions it occupies.
+
+    Letter choices are remembered in decisions, keyed by the guessed word
+    and the letters guessed so far, so games that reach the same state
+    share the work. The memo is cleared whenever it reaches
+    DECISION_MEMO_LIMIT choices.
+
+    wordlist: list of lowercase strings
+    """
+    def __init__(self, wordlist):
+        self.wordsByLength = {}
+        for word in sorted(set(wordlist)):
+            self.wordsByLength.setdefault(len(word), []).append(word)
+
+        self.positionIndex = {}
+        self.letterIndex = {}
+        self.letterPositions = {}
+        for length, words in self.wordsByLength.items():
+            positions = {}
+            letters = {}
+            letterPositions = []
+            for i, word in enumerate(words):
+                bit = 1 << i
+                masks = {}
+                for position, letter in enumerate(word):
+                    positions[(position, letter)] = positions.get((position, letter), 0) | bit
+                    masks[letter] = masks.get(letter, 0) | (1 << position)
+                for letter in masks:
+                    letters[letter] = letters.get(letter, 0) | bit
+                letterPositions.append(masks)
+            self.positionIndex[length] = positions
+            self.letterIndex[length] = letters
+            self.letterPositions[length] = letterPositions
+        self.decisions = {}
+
+    def allWords(self, length):
+        """
+        Returns the bitset of every word of the given length.
+        """
+        return (1 << len(self.wordsByLength.get(length, ()))) - 1
+
+
+class HangmanSolver(object):
+    """
+    Plays one game of Hangman against a secret word of a known length.
+
+    candidates is the bitset of the words of that length that agree with
+    everything learned so far. Each guess only clears bits, using the
+    precomputed indexes, rather than rechecking the words.
+
+    index: HangmanIndex
+    length: int, number of letters of the secret word
+    """
+    def __init__(self, index, length):
+        self.index = index
+        self.length = length
+        self.words = index.wordsByLength.get(length, [])
+        self.candidates = index.allWords(length)
+        self.pattern = [None] * length
+
+    def candidateWords(self):
+        """
+        Returns the words that are still possible.
+        """
+        return [self.words[i] for i in getCandidateIds(self.candidates)]
+
+    def update(self, letter, guessedWord):
+        """
+        Narrows the candidates after guessing letter, given the
+        getGuessedWord output that followed the guess.
+
+        letter: string, the letter just guessed
+        guessedWord: string, getGuessedWord(secretWord, lettersGuessed)
+        """
+        pattern = parseGuessedWord(guessedWord)
+        positionIndex = self.index.positionIndex.get(self.length, {})
+        letterIndex = self.index.letterIndex.get(self.length, {})
+        if letter not in pattern:
+            self.candidates &= ~letterIndex.get(letter, 0)
+        else:
+            for position, known in enumerate(pattern):
+                if known == letter:
+                    self.candidates &= positionIndex.get((position, letter), 0)
+                elif known is None:
+                    self.candidates &= ~positionIndex.get((position, letter), 0)
+        self.pattern = pattern
+
+    def chooseLetter(self, lettersGuessed):
+        """
+        Returns the available letter that maximizes the expected
+        information (entropy) of the answer to guessing it. The answer
+        to a guess is the set of positions the letter turns out to take,
+        so the candidates are split by those positions.
+
+        lettersGuessed: list, what letters have been guessed so far
+        returns: string, or None when no word of the word list fits
+        """
+        key = (self.length, ''.join(letter or '_' for letter in self.pattern), ''.join(sorted(lettersGuessed)))
+        letter = self.index.decisions.get(key)
+        if letter is not None:
+            return letter
+
+        ids = getCandidateIds(self.candidates)
+        if not ids:
+            return None
+        available = getAvailableLetters(lettersGuessed)
+        letterPositions = self.index.letterPositions.get(self.length, [])
+        splits = {}
+        for i in ids:
+            for candidateLetter, positions in letterPositions[i].items():
+                split = splits.setdefault(candidateLetter, {})
+                split[positions] = split.get(positions, 0) + 1
+
+        total = float(len(ids))
+        best = (-1.0, 0, '')
+        for candidateLetter in available:
+            split = splits.get(candidateLetter, {})
+            present = sum(split.values())
+            entropy = 0.0
+            for count in list(split.values()) + [total - present]:
+                if count:
+                    p = count / total
+                    entropy -= p * math.log(p, 2)
+            # Prefer the more informative guess, then the more likely hit.
+            score = (entropy, present, candidateLetter)
+            if score[:2] > best[:2]:
+                best = score
+        letter = best[2] or available[0]
+        if len(self.index.decisions) >= DECISION_MEMO_LIMIT:
+            self.index.decisions.clear()
+        self.index.decisions[key] = letter
+        return letter
+
+
+def solveHangman(secretWord, index, maxWrongGuesses=MAX_WRONG_GUESSES):
+    """
+    Lets a HangmanSolver guess secretWord without any input or output.
+
+    secretWord: string
+    index: HangmanIndex built from a word list containing secretWord
+    returns: tuple (True if the word was guessed, list of guesses made);
+      the solver gives up once no word of the index fits the answers
+    """
+    solver = HangmanSolver(index, len(secretWord))
+    lettersGuessed = []
+    wrongGuesses = 0
+    while wrongGuesses < maxWrongGuesses:
+        if isWordGuessed(secretWord, lettersGuessed):
+            return True, lettersGuessed
+        letter = solver.chooseLetter(lettersGuessed)
+        if letter is None:
+            break
+        lettersGuessed.append(letter)
+        if letter not in secretWord:
+            wrongGuesses += 1
+        solver.update(letter, getGuessedWord(secretWord, lettersGuessed))
+    return isWordGuessed(secretWord, lettersGuessed), lettersGuessed
+
+
+def benchSolver(wordlist, limit=None):
+    """
+    Plays every word of wordlist (or the first limit of them) and prints
+    games per second and the share of games won.
+    """
+    start = time.perf_counter()
+    index = HangmanIndex(wordlist)
+    buildTime = time.perf_counter() - start
+
+    words = wordlist if limit is None else wordlist[:limit]
+    wins = 0
+    guesses = 0
+    start = time.perf_counter()
+    for secretWord in words:
+        won, lettersGuessed = solveHangman(secretWord, index)
+        wins += won
+        guesses += len(lettersGuessed)
+    playTime = time.perf_counter() - start
+
+    print("Index built in {0:.2f} s".format(buildTime))
+    print("{0} games in {1:.2f} s: {2:.1f} games/s".format(len(words), playTime, len(words) / playTime))
+    print("Won {0} ({1:.1%}), {2:.2f} guesses per game".format(wins, wins / len(words), guesses / len(words)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Let the solver play every word in words.txt.")
+    parser.add_argument('--limit', type=int, default=None, help="only play the first LIMIT words")
+    args = parser.parse_args()
+
+    benchSolver(loadWords(), args.limit)
@@ -7,8 +7,9 @@ def isWordGuessed(secretWord, lettersGuessed):
     '''
     # FILL IN YOUR CODE HERE...
     
+    guessed = set(lettersGuessed)
     for letter in secretWord:
-        if letter not in lettersGuessed:
+        if letter not in guessed:
             return False
     
     return True
@@ -16,22 +17,12 @@ def isWordGuessed(secretWord, lettersGuessed):
 
 def getGuessedWord(secretWord, lettersGuessed):
     
-    guessedWord = secretWord
-    for letter in guessedWord:
-        if letter not in lettersGuessed:
-            print(letter)
-            guessedWord = guessedWord.replace(letter,"_ ", len(secretWord))
-
-    return guessedWord        
+    guessed = set(lettersGuessed)
+    return ''.join(letter if letter in guessed else '_ ' for letter in secretWord)
 
 
 import string
 def getAvailableLetters(lettersGuessed):
     
-    all_lower = string.ascii_lowercase
-
-    for letter in lettersGuessed:
-        if letter in all_lower:
-            all_lower = all_lower.replace(letter,'')
-    
-    return all_lower
+    guessed = set(lettersGuessed)
+    return ''.join(letter for letter in string.ascii_lowercase if letter not in guessed)
@@ -7,27 +7,47 @@
 # but you will have to know how to use the functions
 # (so be sure to read the docstrings!)
 
+import os
 import random
 import string
-import os
+import sys
+
+WORDLIST_FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "words.txt")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+import word_cache
 
-cwd = os.getcwd() + '/MITx/Week3/'
-WORDLIST_FILENAME = os.path.join(cwd,"words.txt")
+def parseWords(filename=WORDLIST_FILENAME):
+    """
+    Returns the list of words in filename, a single line of
+    space-separated words.
+    """
+    with open(filename, 'r') as inFile:
+        return inFile.readline().split()
+
+def compileWords(filename=WORDLIST_FILENAME):
+    """
+    Parses the word list in filename and caches it next to the file
+    (see word_cache.compileWords). Returns the list of words.
+    """
+    return word_cache.compileWords(filename, parseWords)
+
+def loadCompiledWords(filename=WORDLIST_FILENAME):
+    """
+    Returns the list of words in filename, read from its compiled cache
+    (see word_cache.loadCompiledWords).
+    """
+    return word_cache.loadCompiledWords(filename, parseWords)
 
 def loadWords():
     """
     Returns a list of valid words. Words are strings of lowercase letters.
     
-    Depending on the size of the word list, this function may
-    take a while to finish.
+    The words are read from the compiled cache of WORDLIST_FILENAME,
+    which is rebuilt only when the file changes.
     """
     print("Loading word list from file...")
-    # inFile: file
-    inFile = open(WORDLIST_FILENAME, 'r')
-    # line: string
-    line = inFile.readline()
-    # wordlist: list of strings
-    wordlist = line.split()
+    wordlist = loadCompiledWords(WORDLIST_FILENAME)
     print("  ", len(wordlist), "words loaded.")
     return wordlist
 
@@ -42,10 +62,6 @@ def chooseWord(wordlist):
 # end of helper code
 # -----------------------------------
 
-# Load the list of words into the variable wordlist
-# so that it can be accessed from anywhere in the program
-wordlist = loadWords()
-
 def isWordGuessed(secretWord, lettersGuessed):
     '''
     secretWord: string, the word the user is guessing
@@ -53,10 +69,9 @@ def isWordGuessed(secretWord, lettersGuessed):
     returns: boolean, True if all the letters of secretWord are in lettersGuessed;
       False otherwise
     '''
-    # FILL IN YOUR CODE HERE...
-    
+    guessed = set(lettersGuessed)
     for letter in secretWord:
-        if letter not in lettersGuessed:
+        if letter not in guessed:
             return False
     
     return True
@@ -69,14 +84,8 @@ def getGuessedWord(secretWord, lettersGuessed):
     returns: string, comprised of letters and underscores that represents
       what letters in secretWord have been guessed so far.
     '''
-    # FILL IN YOUR CODE HERE...
-    
-    guessedWord = secretWord
-    for letter in guessedWord:
-        if letter not in lettersGuessed:
-            guessedWord = guessedWord.replace(letter,"_ ", len(secretWord))
-
-    return guessedWord     
+    guessed = set(lettersGuessed)
+    return ''.join(letter if letter in guessed else '_ ' for letter in secretWord)
 
 
 def getAvailableLetters(lettersGuessed):
@@ -85,15 +94,95 @@ def getAvailableLetters(lettersGuessed):
     returns: string, comprised of letters that represents what letters have not
       yet been guessed.
     '''
-    # FILL IN YOUR CODE HERE...
-    
-    all_lower = string.ascii_lowercase
+    guessed = set(lettersGuessed)
+    return ''.join(letter for letter in string.ascii_lowercase if letter not in guessed)
 
-    for letter in lettersGuessed:
-        if letter in all_lower:
-            all_lower = all_lower.replace(letter,'')
-    
-    return all_lower    
+
+class HangmanState(object):
+    '''
+    The state of one game of Hangman, updated in place after every guess.
+
+    The guessed letters are kept as a bitset (bit 0 for 'a'), the secret
+    word as a map from each letter to its positions, and the guessed word
+    as a list of per-position pieces. A guess only touches the positions
+    of its letter, so it costs O(occurrences) however long the word and
+    however many guesses came before.
+
+    secretWord: string, the secret word to guess
+    maxGuesses: int, number of wrong guesses allowed
+    '''
+    __slots__ = ('secretWord', 'positions', 'guessedBits', 'lettersGuessed',
+                 'pieces', 'lettersLeft', 'guessesLeft', '_guessedWord')
+
+    def __init__(self, secretWord, maxGuesses=8):
+        self.secretWord = secretWord
+        self.positions = {}
+        for position, letter in enumerate(secretWord):
+            self.positions.setdefault(letter, []).append(position)
+        self.guessedBits = 0
+        self.lettersGuessed = []
+        self.pieces = ['_ '] * len(secretWord)
+        self.lettersLeft = len(self.positions)
+        self.guessesLeft = maxGuesses
+        self._guessedWord = None
+
+    def isGuessed(self, letter):
+        '''
+        Returns True if letter has already been guessed.
+        '''
+        bit = ord(letter) - ord('a')
+        return 0 <= bit < 26 and bool(self.guessedBits >> bit & 1)
+
+    def guess(self, letter):
+        '''
+        Plays letter and returns 'invalid' if it is not a single letter from
+        a to z, 'repeat' if it had already been guessed, 'hit' if it is in
+        the secret word and 'miss' otherwise. Only a miss uses up a guess;
+        an invalid guess is not recorded at all.
+        '''
+        if len(letter) != 1 or not 'a' <= letter <= 'z':
+            return 'invalid'
+        if self.isGuessed(letter):
+            return 'repeat'
+        self.guessedBits |= 1 << (ord(letter) - ord('a'))
+        self.lettersGuessed.append(letter)
+
+        positions = self.positions.get(letter)
+        if positions is None:
+            self.guessesLeft -= 1
+            return 'miss'
+        for position in positions:
+            self.pieces[position] = letter
+        self.lettersLeft -= 1
+        self._guessedWord = None
+        return 'hit'
+
+    def isWordGuessed(self):
+        '''
+        Returns True if every letter of the secret word has been guessed.
+        '''
+        return self.lettersLeft == 0
+
+    def isOver(self):
+        '''
+        Returns True once the word is guessed or no guesses are left.
+        '''
+        return self.lettersLeft == 0 or self.guessesLeft <= 0
+
+    def getGuessedWord(self):
+        '''
+        Returns the same string as getGuessedWord(secretWord, lettersGuessed).
+        '''
+        if self._guessedWord is None:
+            self._guessedWord = ''.join(self.pieces)
+        return self._guessedWord
+
+    def getAvailableLetters(self):
+        '''
+        Returns the same string as getAvailableLetters(lettersGuessed).
+        '''
+        bits = self.guessedBits
+        return ''.join(letter for i, letter in enumerate(string.ascii_lowercase) if not bits >> i & 1)
 
 def hangman(secretWord):
     '''
@@ -116,43 +205,33 @@ def hangman(secretWord):
     Follows the other limitations detailed in the problem write-up.
     '''
     # FILL IN YOUR CODE HERE...
-    num_guesses_left = 8
-    lettersGuessed = list()
+    state = HangmanState(secretWord, 8)
     
     print("Welcome to the game Hangman!\n I am thinking of a word that is {0} letters long".format(len(secretWord)))
-    
-    guess = '_'*len(secretWord)
 
-    while num_guesses_left:
+    while state.guessesLeft:
       
-      available_letters = getAvailableLetters(lettersGuessed)
       print("	-----------")
 
-      if isWordGuessed(secretWord, lettersGuessed):
+      if state.isWordGuessed():
         print("Congratulations, you won!")
         break
 
-      print("You have {0} guesses left\nAvailable Letters: {1}".format(num_guesses_left, available_letters))
+      print("You have {0} guesses left\nAvailable Letters: {1}".format(state.guessesLeft, state.getAvailableLetters()))
       print("Please guess a letter: ", end='')      
       user_input = input().lower()
-      # lettersGuessed.append(user_input)
+      result = state.guess(user_input)
       
-      if user_input in lettersGuessed:
-        print("Oops! You've already guessed that letter: {0}".format(guess))
-        continue
-      
-      lettersGuessed.append(user_input)
-      guess = getGuessedWord(secretWord, lettersGuessed)
-      
-      if user_input not in secretWord:
-        print("Oops! That letter is not in my word: {0}".format(guess))
+      if result == 'invalid':
+        print("Oops! Please guess a single letter from a to z: {0}".format(state.getGuessedWord()))
+      elif result == 'repeat':
+        print("Oops! You've already guessed that letter: {0}".format(state.getGuessedWord()))
+      elif result == 'miss':
+        print("Oops! That letter is not in my word: {0}".format(state.getGuessedWord()))
       else:
-        print("Good guess: {0}".format(guess))
-        continue
-      
-      num_guesses_left -= 1
+        print("Good guess: {0}".format(state.getGuessedWord()))
 
-    if num_guesses_left == 0:
+    if state.guessesLeft == 0:
       print("-----------\nSorry, you ran out of guesses. The word was {0}.".format(secretWord))
 
 
@@ -161,5 +240,8 @@ def hangman(secretWord):
 # and run this file to test! (hint: you might want to pick your own
 # secretWord while you're testing)
 
-secretWord = chooseWord(wordlist).lower()
-hangman(secretWord)
+if __name__ == '__main__':
+    # Load the list of words into the variable wordlist
+    wordlist = loadWords()
+    secretWord = chooseWord(wordlist).lower()
+    hangman(secretWord)
@@ -0,0 +1,57 @@
+from hangman_session import *
+
+#
+# Test code
+# To run these tests, simply run this file (open up in your IDE, then run the file as normal)
+
+def test_HangmanSession():
+    """
+    Unit test for HangmanSession, driven one line at a time
+    """
+    failure=False
+    session = HangmanSession([], 'Apple')
+    lines = session.start()
+    if lines[:2] != ["Welcome to the game Hangman!", "I am thinking of a word that is 5 letters long"] \
+            or lines[-1] != session.GUESS_PROMPT:
+        print("FAILURE: test_HangmanSession()")
+        print("\tstart() returned", lines)
+        failure=True
+    # (input, first line shown, guesses left afterwards)
+    rounds = [('', "Oops! Please guess a single letter from a to z: _ _ _ _ _ ", 8),
+              ('P', "Good guess: _ pp_ _ ", 8),
+              ('p', "Oops! You've already guessed that letter: _ pp_ _ ", 8),
+              ('z', "Oops! That letter is not in my word: _ pp_ _ ", 7),
+              (' a ', "Good guess: app_ _ ", 7),
+              ('l', "Good guess: appl_ ", 7)]
+    for (line, expected, guessesLeft) in rounds:
+        lines = session.handle(line)
+        if lines[0] != expected or session.state.guessesLeft != guessesLeft or session.finished:
+            print("FAILURE: test_HangmanSession()")
+            print("\tExpected", repr(expected), "with", guessesLeft, "guesses left but got", repr(lines[0]),
+                  "with", session.state.guessesLeft, "for input", repr(line))
+            failure=True
+    lines = session.handle('e')
+    if lines[-1] != "Congratulations, you won!" or not session.finished or session.handle('x') != []:
+        print("FAILURE: test_HangmanSession()")
+        print("\tThe winning guess returned", lines)
+        failure=True
+
+    session = HangmanSession([], 'a')
+    for letter in 'bcdefgh':
+        session.handle(letter)
+    lines = session.handle('i')
+    if lines[-1] != "Sorry, you ran out of guesses. The word was a." or not session.finished:
+        print("FAILURE: test_HangmanSession()")
+        print("\tThe last wrong guess returned", lines)
+        failure=True
+    if not failure:
+        print("SUCCESS: test_HangmanSession()")
+
+# end of test_HangmanSession
+
+
+print("----------------------------------------------------------------------")
+print("Testing HangmanSession...")
+test_HangmanSession()
+print("----------------------------------------------------------------------")
+print("All done!")
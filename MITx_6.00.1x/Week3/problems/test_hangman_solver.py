@@ -0,0 +1,111 @@
+import random
+
+import hangman_solver
+from hangman_solver import *
+
+#
+# Test code
+# To run these tests, simply run this file (open up in your IDE, then run the file as normal)
+
+def bruteForceCandidates(words, length, secretWord, lettersGuessed):
+    """
+    Returns the words of the given length that agree with every guess, by
+    comparing each one with the secret word.
+    """
+    return [word for word in sorted(set(word for word in words if len(word) == length))
+            if all((word[i] == letter) == (secretWord[i] == letter)
+                                           for letter in lettersGuessed for i in range(length))]
+
+def test_HangmanSolver_update(wordlist, index):
+    """
+    Unit test for HangmanSolver.update against a brute-force filter
+    """
+    failure=False
+    rng = random.Random(0)
+    for secretWord in rng.sample(wordlist, 20):
+        solver = HangmanSolver(index, len(secretWord))
+        lettersGuessed = []
+        for letter in rng.sample(string.ascii_lowercase, 8):
+            lettersGuessed.append(letter)
+            solver.update(letter, getGuessedWord(secretWord, lettersGuessed))
+            expected = bruteForceCandidates(wordlist, len(secretWord), secretWord, lettersGuessed)
+            if solver.candidateWords() != expected:
+                print("FAILURE: test_HangmanSolver_update()")
+                print("\tExpected", len(expected), "candidates but got", len(solver.candidateWords()),
+                      "for", secretWord, "after", lettersGuessed)
+                failure=True
+                break
+    # a length no word has: no candidates, and no letter to guess
+    solver = HangmanSolver(index, 40)
+    solver.update('e', getGuessedWord('x' * 40, ['e']))
+    if solver.candidateWords() != [] or solver.chooseLetter(['e']) is not None:
+        print("FAILURE: test_HangmanSolver_update()")
+        print("\tA length missing from the word list gave", solver.candidateWords(), solver.chooseLetter(['e']))
+        failure=True
+    if not failure:
+        print("SUCCESS: test_HangmanSolver_update()")
+
+# end of test_HangmanSolver_update
+
+
+def test_solveHangman(index):
+    """
+    Unit test for solveHangman on a few known words
+    """
+    failure=False
+    for secretWord in ['apple', 'hangman', 'python', 'rhythm']:
+        won, lettersGuessed = solveHangman(secretWord, index)
+        wrong = [letter for letter in lettersGuessed if letter not in secretWord]
+        if not won or len(set(lettersGuessed)) != len(lettersGuessed) or len(wrong) >= MAX_WRONG_GUESSES:
+            print("FAILURE: test_solveHangman()")
+            print("\tExpected to guess", secretWord, "but got", won, "with guesses", lettersGuessed)
+            failure=True
+    # no word fits once the q is missing, so the solver gives up before running out of guesses
+    won, lettersGuessed = solveHangman('qzqzqzq', index)
+    wrong = [letter for letter in lettersGuessed if letter not in 'qz']
+    if won or len(wrong) >= MAX_WRONG_GUESSES:
+        print("FAILURE: test_solveHangman()")
+        print("\tA word no entry fits was played with", lettersGuessed)
+        failure=True
+    if not failure:
+        print("SUCCESS: test_solveHangman()")
+
+# end of test_solveHangman
+
+
+def test_decisionMemoLimit(wordlist, index):
+    """
+    Unit test for the bound on HangmanIndex.decisions
+    """
+    failure=False
+    limit = hangman_solver.DECISION_MEMO_LIMIT
+    hangman_solver.DECISION_MEMO_LIMIT = 50
+    try:
+        for secretWord in random.Random(1).sample(wordlist, 30):
+            solveHangman(secretWord, index)
+            if len(index.decisions) > 50:
+                print("FAILURE: test_decisionMemoLimit()")
+                print("\tThe memo grew to", len(index.decisions), "choices")
+                failure=True
+                break
+    finally:
+        hangman_solver.DECISION_MEMO_LIMIT = limit
+    if not failure:
+        print("SUCCESS: test_decisionMemoLimit()")
+
+# end of test_decisionMemoLimit
+
+
+wordlist = loadWords()
+index = HangmanIndex(wordlist)
+print("----------------------------------------------------------------------")
+print("Testing HangmanSolver.update...")
+test_HangmanSolver_update(wordlist, index)
+print("----------------------------------------------------------------------")
+print("Testing solveHangman...")
+test_solveHangman(index)
+print("----------------------------------------------------------------------")
+print("Testing the decision memo limit...")
+test_decisionMemoLimit(wordlist, index)
+print("----------------------------------------------------------------------")
+print("All done!")
@@ -0,0 +1,39 @@
+from ps3_hangman import *
+
+#
+# Test code
+# To run these tests, simply run this file (open up in your IDE, then run the file as normal)
+
+def test_HangmanState_guess():
+    """
+    Unit test for HangmanState.guess
+    """
+    failure=False
+    state = HangmanState('apple', 8)
+    # (guess, expected result, guesses left afterwards, letters guessed afterwards)
+    rounds = [('', 'invalid', 8, []), ('pp', 'invalid', 8, []), ('app', 'invalid', 8, []),
+              ('A', 'invalid', 8, []), ('1', 'invalid', 8, []), ('p', 'hit', 8, ['p']),
+              ('p', 'repeat', 8, ['p']), ('z', 'miss', 7, ['p', 'z']), ('z', 'repeat', 7, ['p', 'z'])]
+    for (letter, expected, guessesLeft, lettersGuessed) in rounds:
+        result = state.guess(letter)
+        if (result, state.guessesLeft, state.lettersGuessed) != (expected, guessesLeft, lettersGuessed):
+            print("FAILURE: test_HangmanState_guess()")
+            print("\tExpected", (expected, guessesLeft, lettersGuessed), "but got",
+                  (result, state.guessesLeft, state.lettersGuessed), "for guess '" + letter + "'")
+            failure=True
+    if state.getGuessedWord() != getGuessedWord('apple', ['p', 'z']) or \
+            state.getAvailableLetters() != getAvailableLetters(['p', 'z']):
+        print("FAILURE: test_HangmanState_guess()")
+        print("\tInvalid guesses changed the guessed word or the available letters")
+        failure=True
+    if not failure:
+        print("SUCCESS: test_HangmanState_guess()")
+
+# end of test_HangmanState_guess
+
+
+print("----------------------------------------------------------------------")
+print("Testing HangmanState.guess...")
+test_HangmanState_guess()
+print("----------------------------------------------------------------------")
+print("All done!")
@@ -0,0 +1,47 @@
+# Benchmarks for the computer player of the 6.00 Word Game
+#
+# Run this file to compare the greedy player (getGreedyPlays) with the
+# optimal planner (getOptimalPlays) on the same randomly dealt hands.
+
+import argparse
+import random
+import time
+
+from ps4b import *
+
+
+def benchPlayers(wordList, numHands, n, seed):
+    """
+    Deals numHands hands of size n and plays each one with the greedy and
+    the optimal player. Prints hands per second and the mean score of
+    both players, and how often the optimal player scores higher.
+    """
+    rng = random.Random(seed)
+    hands = [dealHand(n, rng) for _ in range(numHands)]
+    wordList = toWordDictionary(wordList)
+    wordIndex = wordList.getWordIndex()
+
+    start = time.perf_counter()
+    greedy = [getGreedyPlays(hand, wordList, n, wordIndex)[0] for hand in hands]
+    greedyTime = time.perf_counter() - start
+
+    memo = {}
+    start = time.perf_counter()
+    optimal = [getOptimalPlays(hand, wordList, n, wordIndex, memo)[0] for hand in hands]
+    optimalTime = time.perf_counter() - start
+
+    improved = sum(1 for g, o in zip(greedy, optimal) if o > g)
+    print("{0} hands of {1} letters (seed {2})".format(numHands, n, seed))
+    print("  greedy : {0:10.1f} hands/s  mean score {1:.2f}".format(numHands / greedyTime, sum(greedy) / numHands))
+    print("  optimal: {0:10.1f} hands/s  mean score {1:.2f}".format(numHands / optimalTime, sum(optimal) / numHands))
+    print("  optimal beats greedy on {0} hands ({1:.1%})".format(improved, improved / numHands))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare the greedy and optimal computer players.")
+    parser.add_argument('--hands', type=int, default=10000)
+    parser.add_argument('--hand-size', type=int, default=HAND_SIZE)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    benchPlayers(loadWords(), args.hands, args.hand_size, args.seed)
@@ -0,0 +1,161 @@
+# A compact directed acyclic word graph (DAWG)
+#
+# Shared suffixes of the words are stored once, and the graph is kept in
+# flat arrays rather than nested dictionaries, so the whole of words.txt
+# fits in a few hundred kilobytes. Walking the graph letter by letter
+# lets a search stop as soon as a prefix leads nowhere.
+
+from array import array
+
+
+class Dawg(object):
+    """
+    A minimal DAWG over a set of words.
+
+    Node i owns the edges edgeStart[i] up to edgeStart[i + 1]; edge e is
+    labelled with the character code edgeLetters[e] and leads to node
+    edgeTargets[e]. terminal[i] is 1 when the path to node i spells a
+    word. Node 0 is the root.
+
+    words: iterable of strings made of characters below chr(256)
+    """
+    def __init__(self, words):
+        words = sorted(set(words))
+        finals, edges = self._buildMinimal(words)
+
+        # Renumber the reachable nodes breadth first and lay their edges
+        # out one node after the other.
+        order = [0]
+        numbers = {0: 0}
+        for node in order:
+            for letter in sorted(edges[node]):
+                child = edges[node][letter]
+                if child not in numbers:
+                    numbers[child] = len(order)
+                    order.append(child)
+
+        self.edgeStart = array('I', [0])
+        self.edgeLetters = array('B')
+        self.edgeTargets = array('I')
+        self.terminal = bytearray(len(order))
+        for number, node in enumerate(order):
+            self.terminal[number] = finals[node]
+            for letter in sorted(edges[node]):
+                self.edgeLetters.append(ord(letter))
+                self.edgeTargets.append(numbers[edges[node][letter]])
+            self.edgeStart.append(len(self.edgeLetters))
+        self._size = len(words)
+
+    @staticmethod
+    def _buildMinimal(words):
+        """
+        Builds the minimal DAWG of the sorted words with Daciuk's
+        incremental algorithm. Returns (finals, edges): node i is final
+        when finals[i] is 1 and its outgoing edges are edges[i]
+        (dictionary letter -> node).
+        """
+        finals = [0]
+        edges = [{}]
+        register = {}
+        unchecked = []  # (parent, letter, child) along the last word
+        previous = ''
+
+        def minimize(downTo):
+            while len(unchecked) > downTo:
+                parent, letter, child = unchecked.pop()
+                key = (finals[child], tuple(sorted(edges[child].items())))
+                if key in register:
+                    edges[parent][letter] = register[key]
+                else:
+                    register[key] = child
+
+        for word in words:
+            common = 0
+            for a, b in zip(word, previous):
+                if a != b:
+                    break
+                common += 1
+            minimize(common)
+
+            node = unchecked[-1][2] if unchecked else 0
+            for letter in word[common:]:
+                child = len(finals)
+                finals.append(0)
+                edges.append({})
+                edges[node][letter] = child
+                unchecked.append((node, letter, child))
+                node = child
+            finals[node] = 1
+            previous = word
+        minimize(0)
+        return finals, edges
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return "Dawg({0} words, {1} nodes, {2} edges)".format(
+            self._size, len(self.terminal), len(self.edgeLetters))
+
+    def _child(self, node, code):
+        for edge in range(self.edgeStart[node], self.edgeStart[node + 1]):
+            if self.edgeLetters[edge] == code:
+                return self.edgeTargets[edge]
+        return -1
+
+    def __contains__(self, word):
+        node = 0
+        for letter in word:
+            node = self._child(node, ord(letter))
+            if node < 0:
+                return False
+        return bool(self.terminal[node])
+
+    def hasPrefix(self, prefix):
+        """
+        Returns True if some word starts with prefix.
+        """
+        node = 0
+        for letter in prefix:
+            node = self._child(node, ord(letter))
+            if node < 0:
+                return False
+        return True
+
+    def formableWords(self, hand):
+        """
+        Returns, in alphabetical order, every word that can be spelled
+        with the letters in hand, each letter used at most as many times
+        as it appears there. Branches whose next letter is not left in
+        the hand are never entered.
+
+        hand: dictionary (string -> int)
+        returns: list (string)
+        """
+        counts = [0] * 256
+        for letter in hand:
+            if hand[letter] > 0:
+                counts[ord(letter)] += hand[letter]
+
+        edgeStart = self.edgeStart
+        edgeLetters = self.edgeLetters
+        edgeTargets = self.edgeTargets
+        terminal = self.terminal
+        prefix = []
+        words = []
+
+        def visit(node):
+            for edge in range(edgeStart[node], edgeStart[node + 1]):
+                code = edgeLetters[edge]
+                if counts[code]:
+                    counts[code] -= 1
+                    prefix.append(chr(code))
+                    child = edgeTargets[edge]
+                    if terminal[child]:
+                        words.append(''.join(prefix))
+                    visit(child)
+                    prefix.pop()
+                    counts[code] += 1
+
+        visit(0)
+        return words
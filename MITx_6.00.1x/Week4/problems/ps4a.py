@@ -1,7 +1,15 @@
 # The 6.00 Word Game
 
+import os
 import random
 import string
+import sys
+from collections.abc import Mapping
+
+from dawg import Dawg
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+import word_cache
 
 VOWELS = 'aeiou'
 CONSONANTS = 'bcdfghjklmnpqrstvwxyz'
@@ -15,24 +23,165 @@ SCRABBLE_LETTER_VALUES = {
 # Helper code
 # (you don't need to understand this helper code)
 
-WORDLIST_FILENAME = "words.txt"
+WORDLIST_FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "words.txt")
+
+def getWordSignature(word):
+    """
+    Returns the sorted-letter signature of a word. Anagrams share a
+    signature, e.g. 'evil', 'live' and 'vile' all map to 'eilv'.
+
+    word: string
+    returns: string
+    """
+    return ''.join(sorted(word))
+
+def buildWordIndex(wordList):
+    """
+    Returns a dictionary mapping the signature of every word in wordList
+    to the position and word of the first word with that signature.
+
+    All words sharing a signature use the same letters, so they also
+    share a score and one word per signature is enough.
+
+    wordList: WordDictionary or list (string)
+    returns: dictionary (string -> (int, string))
+    """
+    wordIndex = {}
+    for position, word in enumerate(wordList):
+        signature = getWordSignature(word)
+        if signature not in wordIndex:
+            wordIndex[signature] = (position, word)
+    return wordIndex
+
+class WordDictionary(object):
+    """
+    A list of valid words with O(1) membership tests.
+
+    Iterates, indexes and measures like the list of words it was built
+    from, so it can be passed anywhere a wordList is expected. Letter
+    counts and scores are computed once per word and then cached, and
+    the DAWG and the signature index of the words are built the first
+    time they are needed.
+
+    words: iterable of lowercase strings
+    """
+    def __init__(self, words):
+        self._words = list(words)
+        self._wordSet = set(self._words)
+        self._letterCounts = {}
+        self._scores = {}
+        self._dawg = None
+        self._wordIndex = None
+
+    def __contains__(self, word):
+        return word in self._wordSet
+
+    def __iter__(self):
+        return iter(self._words)
+
+    def __len__(self):
+        return len(self._words)
+
+    def __getitem__(self, index):
+        return self._words[index]
+
+    def __repr__(self):
+        return "WordDictionary({0} words)".format(len(self._words))
+
+    def getLetterCounts(self, word):
+        """
+        Returns the cached letter counts of word, as a Hand.
+
+        word: string
+        returns: Hand
+        """
+        counts = self._letterCounts.get(word)
+        if counts is None:
+            counts = self._letterCounts[word] = Hand(word)
+        return counts
+
+    def getWordScore(self, word, n):
+        """
+        Returns the cached value of getWordScore(word, n).
+
+        word: string (lowercase letters)
+        n: integer (HAND_SIZE; i.e., hand size required for additional points)
+        returns: int >= 0
+        """
+        key = (word, n)
+        score = self._scores.get(key)
+        if score is None:
+            score = self._scores[key] = getWordScore(word, n)
+        return score
+
+    def getDawg(self):
+        """
+        Returns the Dawg of the words, building it on first use.
+        """
+        if self._dawg is None:
+            self._dawg = Dawg(self._words)
+        return self._dawg
+
+    def getWordIndex(self):
+        """
+        Returns buildWordIndex(self), building it on first use.
+        """
+        if self._wordIndex is None:
+            self._wordIndex = buildWordIndex(self._words)
+        return self._wordIndex
+
+def toWordDictionary(wordList):
+    """
+    Returns wordList as a WordDictionary, wrapping it if it is a plain list.
+
+    A plain list gets a new wrapper, and so a new DAWG and signature index,
+    on every call; build a WordDictionary once (see loadWords) and pass it
+    around to reuse them.
+
+    wordList: list of lowercase strings or WordDictionary
+    returns: WordDictionary
+    """
+    if isinstance(wordList, WordDictionary):
+        return wordList
+    return WordDictionary(wordList)
+
+
+def parseWords(filename=WORDLIST_FILENAME):
+    """
+    Returns the list of words in filename, one word per line, lowercased.
+    """
+    # inFile: file
+    with open(filename, 'r') as inFile:
+        # wordList: list of strings
+        wordList = [line.strip().lower() for line in inFile]
+    return wordList
+
+def compileWords(filename=WORDLIST_FILENAME):
+    """
+    Parses the word list in filename and caches it next to the file
+    (see word_cache.compileWords). Returns the list of words.
+    """
+    return word_cache.compileWords(filename, parseWords)
+
+def loadCompiledWords(filename=WORDLIST_FILENAME):
+    """
+    Returns the list of words in filename, read from its compiled cache
+    (see word_cache.loadCompiledWords).
+    """
+    return word_cache.loadCompiledWords(filename, parseWords)
 
 def loadWords():
     """
-    Returns a list of valid words. Words are strings of lowercase letters.
+    Returns a WordDictionary of valid words. Words are strings of
+    lowercase letters.
     
-    Depending on the size of the word list, this function may
-    take a while to finish.
+    The words are read from the compiled cache of WORDLIST_FILENAME,
+    which is rebuilt only when the file changes (see loadCompiledWords).
     """
     print("Loading word list from file...")
-    # inFile: file
-    inFile = open(WORDLIST_FILENAME, 'r')
-    # wordList: list of strings
-    wordList = []
-    for line in inFile:
-        wordList.append(line.strip().lower())
+    wordList = loadCompiledWords(WORDLIST_FILENAME)
     print("  ", len(wordList), "words loaded.")
-    return wordList
+    return WordDictionary(wordList)
 
 def getFrequencyDict(sequence):
     """
@@ -48,6 +197,149 @@ def getFrequencyDict(sequence):
     for x in sequence:
         freq[x] = freq.get(x,0) + 1
     return freq
+
+HAND_FIELD_BITS = 9
+HAND_COUNT_MASK = 0xff
+HAND_LETTER_SHIFTS = {letter: HAND_FIELD_BITS * i for i, letter in enumerate(string.ascii_lowercase)}
+HAND_GUARD_BITS = sum(1 << (shift + 8) for shift in HAND_LETTER_SHIFTS.values())
+
+class Hand(Mapping):
+    """
+    An immutable hand of lowercase letters packed into a single integer.
+
+    Every letter owns a 9-bit field of the integer: 8 bits of count (up
+    to 255 copies of a letter) and a guard bit that is always clear. The
+    guard bits let a sub-hand test and a subtraction work on all 26
+    letters at once, and the number of letters is kept alongside, so
+    none of these depend on the size of the hand.
+
+    A Hand reads like a dictionary (letter -> count) that has no zero
+    counts, and compares equal to a dictionary with the same non-zero
+    counts, so it can be used wherever a hand dictionary is read.
+
+    letters: dictionary (string -> int), Hand or string of letters
+    """
+    __slots__ = ('_packed', '_length')
+
+    def __init__(self, letters=()):
+        if isinstance(letters, Hand):
+            self._packed = letters._packed
+            self._length = letters._length
+            return
+        if isinstance(letters, str):
+            letters = getFrequencyDict(letters)
+        elif not isinstance(letters, Mapping):
+            letters = dict(letters)
+
+        packed = 0
+        length = 0
+        for letter in letters:
+            count = letters[letter]
+            if count == 0:
+                continue
+            if letter not in HAND_LETTER_SHIFTS:
+                raise ValueError("Hands hold lowercase letters only, not {0!r}".format(letter))
+            if count < 0 or count > HAND_COUNT_MASK:
+                raise ValueError("A hand holds 0 to 255 copies of a letter, not {0}".format(count))
+            packed += count << HAND_LETTER_SHIFTS[letter]
+            length += count
+        self._packed = packed
+        self._length = length
+
+    @classmethod
+    def _fromPacked(cls, packed, length):
+        hand = cls.__new__(cls)
+        hand._packed = packed
+        hand._length = length
+        return hand
+
+    def __getitem__(self, letter):
+        count = self.get(letter, 0)
+        if not count:
+            raise KeyError(letter)
+        return count
+
+    def get(self, letter, default=None):
+        shift = HAND_LETTER_SHIFTS.get(letter)
+        if shift is None:
+            return default
+        count = (self._packed >> shift) & HAND_COUNT_MASK
+        return count if count else default
+
+    def __contains__(self, letter):
+        return bool(self.get(letter, 0))
+
+    def __iter__(self):
+        packed = self._packed
+        for letter in string.ascii_lowercase:
+            if packed & HAND_COUNT_MASK:
+                yield letter
+            packed >>= HAND_FIELD_BITS
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def items(self):
+        items = []
+        packed = self._packed
+        for letter in string.ascii_lowercase:
+            count = packed & HAND_COUNT_MASK
+            if count:
+                items.append((letter, count))
+            packed >>= HAND_FIELD_BITS
+        return items
+
+    def total(self):
+        """
+        Returns the number of letters in the hand.
+        """
+        return self._length
+
+    def copy(self):
+        """
+        Returns a dictionary (letter -> count) with the same counts, which,
+        like the copy of a hand dictionary, can be changed freely.
+        """
+        return dict(self.items())
+
+    def __hash__(self):
+        return hash(self._packed)
+
+    def __eq__(self, other):
+        if isinstance(other, Hand):
+            return self._packed == other._packed
+        if isinstance(other, Mapping):
+            return dict(self.items()) == {k: v for k, v in other.items() if v != 0}
+        return NotImplemented
+
+    def __le__(self, other):
+        """
+        Returns True if every letter of this hand is also in other, at
+        least as many times.
+        """
+        if not isinstance(other, Hand):
+            other = Hand(other)
+        # Setting every guard bit of other before subtracting means a
+        # field only loses its guard bit when its count would go negative.
+        return ((other._packed | HAND_GUARD_BITS) - self._packed) & HAND_GUARD_BITS == HAND_GUARD_BITS
+
+    def __sub__(self, other):
+        if not isinstance(other, Hand):
+            other = Hand(other)
+        if not other <= self:
+            raise ValueError("{0!r} does not contain {1!r}".format(self, other))
+        return Hand._fromPacked(self._packed - other._packed, self._length - other._length)
+
+    def __add__(self, other):
+        if not isinstance(other, Hand):
+            other = Hand(other)
+        packed = self._packed + other._packed
+        if packed & HAND_GUARD_BITS:
+            raise ValueError("A hand holds at most 255 copies of a letter")
+        return Hand._fromPacked(packed, self._length + other._length)
+
+    def __repr__(self):
+        return "Hand({0!r})".format(dict(self.items()))
 	
 
 # (end of helper code)
@@ -102,33 +394,43 @@ def displayHand(hand):
              print(letter,end=" ")       # print all on the same line
     print()                             # print an empty line
 
+def formatHand(hand):
+    """
+    Returns the letters of hand as displayHand prints them.
+
+    hand: dictionary (string -> int)
+    returns: string
+    """
+    return ' '.join(letter for letter in hand for _ in range(hand[letter]))
+
 #
 # Problem #2: Make sure you understand how this function works and what it does!
 #
-def dealHand(n):
+def dealHand(n, rng=random):
     """
     Returns a random hand containing n lowercase letters.
     At least n/3 the letters in the hand should be VOWELS.
 
-    Hands are represented as dictionaries. The keys are
-    letters and the values are the number of times the
-    particular letter is repeated in that hand.
+    Hands are represented as Hand objects, which read like
+    dictionaries. The keys are letters and the values are the number
+    of times the particular letter is repeated in that hand.
 
     n: int >= 0
-    returns: dictionary (string -> int)
+    rng: random.Random (or the random module) to draw letters from
+    returns: Hand
     """
     hand={}
     numVowels = n // 3
     
     for i in range(numVowels):
-        x = VOWELS[random.randrange(0,len(VOWELS))]
+        x = VOWELS[rng.randrange(0,len(VOWELS))]
         hand[x] = hand.get(x, 0) + 1
         
     for i in range(numVowels, n):    
-        x = CONSONANTS[random.randrange(0,len(CONSONANTS))]
+        x = CONSONANTS[rng.randrange(0,len(CONSONANTS))]
         hand[x] = hand.get(x, 0) + 1
         
-    return hand
+    return Hand(hand)
 
 #
 # Problem #2: Update a hand by removing letters
@@ -143,18 +445,14 @@ def updateHand(hand, word):
     Updates the hand: uses up the letters in the given word
     and returns the new hand, without those letters in it.
 
-    Has no side effects: does not modify hand.
+    Has no side effects: does not modify hand. Raises ValueError if
+    hand is missing some of the letters in word.
 
     word: string
-    hand: dictionary (string -> int)    
-    returns: dictionary (string -> int)
+    hand: dictionary (string -> int) or Hand
+    returns: Hand
     """
-    # TO DO ... <-- Remove this comment when you code this function
-    updated_hand = dict(hand)
-    
-    for letter in word:
-        updated_hand[letter] = updated_hand.get(letter,0) - 1
-    return updated_hand
+    return Hand(hand) - Hand(word)
 
 
 
@@ -189,54 +487,105 @@ def isValidWord(word, hand, wordList):
     Returns True if word is in the wordList and is entirely
     composed of letters in the hand. Otherwise, returns False.
 
-    Does not mutate hand or wordList.
+    Does not mutate hand or wordList. Membership is O(1) when wordList
+    is a WordDictionary (see loadWords).
    
     word: string
-    hand: dictionary (string -> int)
-    wordList: list of lowercase strings
+    hand: dictionary (string -> int) or Hand
+    wordList: WordDictionary or list of lowercase strings
     """
-    # TO DO ... <-- Remove this comment when you code this function
-    
-    local_hand = hand.copy()
-    zero_match = True
-
-    if word is None:
+    if not word or word not in wordList:
         return False
-    elif len(word) < 1:
-        return False
-    elif word not in wordList:
-        return False
-    elif set(list(word)) > set(local_hand.keys()):
-        return False   
-    
-    for letter in word:
-        if letter in local_hand.keys():
-            local_hand[letter] -= 1
-            zero_match = False
-        
-    if not zero_match and all(v >= 0 for v in local_hand.values()):
-        return True
+
+    if isinstance(wordList, WordDictionary):
+        letter_counts = wordList.getLetterCounts(word)
     else:
-        return False
+        letter_counts = Hand(word)
+
+    if isinstance(hand, Hand):
+        return letter_counts <= hand
+
+    for letter in letter_counts:
+        if hand.get(letter, 0) < letter_counts[letter]:
+            return False
+
+    return True
+
 #
 # Problem #4: Playing a hand
 #
 
+def getBestWord(hand, wordList, n):
+    """
+    Returns the highest-scoring word that can be made from hand, or None
+    if there is none. Candidates are generated from the DAWG of wordList,
+    so only prefixes that can still be spelled with the hand are
+    explored. Ties go to the alphabetically first word.
+
+    hand: dictionary (string -> int)
+    wordList: WordDictionary or list of lowercase strings
+    n: integer (HAND_SIZE; i.e., hand size required for additional points)
+    returns: string or None
+    """
+    wordList = toWordDictionary(wordList)
+    bestScore = 0
+    bestWord = None
+    for word in wordList.getDawg().formableWords(hand):
+        score = wordList.getWordScore(word, n)
+        if score > bestScore:
+            bestScore = score
+            bestWord = word
+    return bestWord
+
 def calculateHandlen(hand):
     """ 
     Returns the length (number of letters) in the current hand.
     
-    hand: dictionary (string-> int)
+    hand: dictionary (string-> int) or Hand
     returns: integer
     """
-    # TO DO... <-- Remove this comment when you code this function
-    num_letters = 0
-    local_hand = hand.copy()
+    if isinstance(hand, Hand):
+        return hand.total()
+    return sum(hand.values())
+
+def playHandTurn(hand, word, wordList, n, total):
+    """
+    Applies one input of the player to the hand being played, without
+    reading or printing anything. playHand and the game sessions both play
+    their hands through this function.
+
+    hand: dictionary (string -> int), the letters left
+    word: string, a word to play, "?" for a hint or "." to finish
+    wordList: WordDictionary or list of lowercase strings
+    n: integer (HAND_SIZE; i.e., hand size required for additional points)
+    total: int, the score so far
+
+    returns: tuple (hand, total, lines, finished): the letters left and
+      the score after the input, the lines to show the player, and whether
+      the hand is over
+    """
+    wordList = toWordDictionary(wordList)
+    if word == '.':
+        return hand, total, ["Goodbye! Total score: {0} points.".format(total)], True
+
+    if word == '?':
+        hint = getBestWord(hand, wordList, n)
+        if hint is None:
+            lines = ["No word can be made from this hand."]
+        else:
+            lines = ["Hint: \"{0}\" is worth {1} points.".format(hint, wordList.getWordScore(hint, n))]
+    elif not isValidWord(word, hand, wordList):
+        lines = ["Invalid word, please try again."]
+    else:
+        score = wordList.getWordScore(word, n)
+        total += score
+        hand = updateHand(hand, word)
+        lines = ["\"{0}\" earned {1} points. Total: {2} points".format(word, score, total)]
+
+    if calculateHandlen(hand) == 0:
+        return hand, total, lines + ["Run out of letters. Total score: {0} points.".format(total)], True
+    return hand, total, lines, False
 
-    for letter in hand:
-        num_letters += local_hand[letter]
-        
-    return num_letters
 
 def playHand(hand, wordList, n):
     """
@@ -245,6 +594,8 @@ def playHand(hand, wordList, n):
     * The hand is displayed.
     * The user may input a word or a single period (the string ".") 
       to indicate they're done playing
+    * The user may input a question mark (the string "?") to be shown
+      the highest-scoring word that can be made from the hand
     * Invalid words are rejected, and a message is displayed asking
       the user to choose another word until they enter a valid word or "."
     * When a valid word is entered, it uses up letters from the hand.
@@ -256,7 +607,7 @@ def playHand(hand, wordList, n):
       inputs a "."
 
       hand: dictionary (string -> int)
-      wordList: list of lowercase strings
+      wordList: WordDictionary or list of lowercase strings
       n: integer (HAND_SIZE; i.e., hand size required for additional points)
       
     """
@@ -290,28 +641,17 @@ def playHand(hand, wordList, n):
     # Game is over (user entered a '.' or ran out of letters), so tell user the total score
     total = 0
     local_hand = hand.copy()
+    finished = calculateHandlen(local_hand) == 0
 
-    while calculateHandlen(hand) > 0:
-        score = 0    
+    while not finished:
         print("Current Hand:", end="\t"); displayHand(local_hand)
         
-        print("Enter word, or a \".\" to indicate that you are finished:",end='\t')
+        print("Enter word, a \"?\" for a hint, or a \".\" to indicate that you are finished:",end='\t')
         word = input()
 
-        if word == '.':
-            break
-        elif not isValidWord(word, local_hand, wordList):
-            print("Invalid word, please try again.")
-        else:
-            score = getWordScore(word, n)
-            total += score
-            local_hand = updateHand(local_hand, word)
-            print("\"{0}\" earned {1} points. Total: {2} points".format(word,score,total))
-            
-    if word == '.':
-        print("Goodbye! Total score: {0} points.".format(total))
-    else:
-        print("Run out of letters. Total score: {0} points.".format(total))
+        local_hand, total, lines, finished = playHandTurn(local_hand, word, wordList, n, total)
+        for line in lines:
+            print(line)
 
 
 def playHand_REFERENCE(hand, wordList, n):
@@ -368,6 +708,7 @@ def playGame(wordList):
     user_input = ''
     last_hand = {}
     n = HAND_SIZE
+    wordList = toWordDictionary(wordList)
 
     while user_input != 'e':
         print("Enter n to deal a new hand, r to replay the last hand, or e to end game: ",end="\t")
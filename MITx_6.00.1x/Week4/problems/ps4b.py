@@ -1,50 +1,167 @@
 from ps4a import *
+import itertools
 import time
 
 
+#
+#
+# Word index used by the computer player
+# (getWordSignature and buildWordIndex are in ps4a, next to WordDictionary)
+#
+#
+def getSubHandSignatures(hand):
+    """
+    Yields the signature of every non-empty sub-multiset of the letters in
+    hand. A hand of 7 distinct letters has 2**7 - 1 = 127 of them.
+
+    hand: dictionary (string -> int)
+    returns: generator (string)
+    """
+    signatures = ['']
+    for letter, letter_count in sorted(hand.items()):
+        signatures = [signature + letter * count
+                      for signature in signatures
+                      for count in range(letter_count + 1)]
+    for signature in signatures:
+        if signature:
+            yield signature
+
+
 #
 #
 # Computer chooses a word
 #
 #
-def compChooseWord(hand, wordList, n):
+def compChooseWord(hand, wordList, n, wordIndex=None):
     """
     Given a hand and a wordList, find the word that gives 
     the maximum value score, and return it.
 
-    This word should be calculated by considering all the words
-    in the wordList.
+    Rather than testing every word in the wordList, candidates are
+    generated from the DAWG of the wordList (see getBestWord). When a
+    signature index from buildWordIndex is given, every sub-multiset of
+    the hand is looked up in it instead, and any other wordIndex (such as
+    word_matrix.WordMatrix) is asked for its bestWord. Either way ties go
+    to the word that comes first in the (alphabetically sorted) wordList.
 
     If no words in the wordList can be made from the hand, return None.
 
     hand: dictionary (string -> int)
-    wordList: list (string)
+    wordList: WordDictionary or list (string)
     n: integer (HAND_SIZE; i.e., hand size required for additional points)
+    wordIndex: dictionary built by buildWordIndex(wordList) or an object
+      with a bestWord(hand, n) method, optional
 
     returns: string or None
     """
+    if wordIndex is None:
+        return getBestWord(hand, wordList, n)
+    if not isinstance(wordIndex, dict):
+        return wordIndex.bestWord(hand, n)
+    wordList = toWordDictionary(wordList)
     # Create a new variable to store the maximum score seen so far (initially 0)
     bestScore = 0
+    bestPosition = None
     # Create a new variable to store the best word seen so far (initially None)  
     bestWord = None
-    # For each word in the wordList
-    for word in wordList:
-        # If you can construct the word from your hand
-        if isValidWord(word, hand, wordList):
-            # find out how much making that word is worth
-            score = getWordScore(word, n)
-            # If the score for that word is higher than your best score
-            if (score > bestScore):
-                # update your best score, and best word accordingly
-                bestScore = score
-                bestWord = word
+    # For each word that can be constructed from your hand
+    for signature in getSubHandSignatures(hand):
+        if signature not in wordIndex:
+            continue
+        position, word = wordIndex[signature]
+        # find out how much making that word is worth
+        score = wordList.getWordScore(word, n)
+        # If the score for that word is higher than your best score
+        if score > bestScore or (score == bestScore and position < bestPosition):
+            # update your best score, and best word accordingly
+            bestScore = score
+            bestPosition = position
+            bestWord = word
     # return the best word you found.
     return bestWord
 
+#
+# Computer plans a whole hand
+#
+def getGreedyPlays(hand, wordList, n, wordIndex=None):
+    """
+    Returns the plays compPlayHand makes for hand without printing
+    anything: the highest-scoring word, again and again, until no word
+    can be made from the letters left.
+
+    hand: dictionary (string -> int)
+    wordList: WordDictionary or list (string)
+    n: integer (HAND_SIZE; i.e., hand size required for additional points)
+    wordIndex: any wordIndex accepted by compChooseWord, optional
+
+    returns: tuple (total score, list of words in the order played)
+    """
+    wordList = toWordDictionary(wordList)
+    totalScore = 0
+    plays = []
+    while True:
+        word = compChooseWord(hand, wordList, n, wordIndex)
+        if word is None:
+            break
+        totalScore += wordList.getWordScore(word, n)
+        plays.append(word)
+        hand = updateHand(hand, word)
+    return totalScore, plays
+
+def getOptimalPlays(hand, wordList, n, wordIndex=None, memo=None):
+    """
+    Returns the sequence of plays that maximizes the total score for hand.
+
+    The remaining letters of the hand are kept as a signature (see
+    getWordSignature). For every state, each sub-multiset that spells a
+    word is tried together with the best result for the letters it
+    leaves. Results are memoized per state, so a 7-letter hand costs at
+    most 3**7 index lookups.
+
+    hand: dictionary (string -> int)
+    wordList: WordDictionary or list (string)
+    n: integer (HAND_SIZE; i.e., hand size required for additional points)
+    wordIndex: dictionary built by buildWordIndex(wordList), optional;
+      the index cached on the WordDictionary by default
+    memo: dictionary (string -> (int, tuple)) of solved states; may be
+      shared between hands as long as wordList and n stay the same
+
+    returns: tuple (total score, list of words)
+    """
+    wordList = toWordDictionary(wordList)
+    if wordIndex is None:
+        wordIndex = wordList.getWordIndex()
+    if memo is None:
+        memo = {}
+
+    def solve(signature):
+        if signature in memo:
+            return memo[signature]
+        best = (0, ())
+        counts = getFrequencyDict(signature)
+        letters = list(counts)
+        for split in itertools.product(*[range(counts[letter] + 1) for letter in letters]):
+            word_signature = ''.join(letter * k for letter, k in zip(letters, split))
+            if word_signature not in wordIndex:
+                continue
+            word = wordIndex[word_signature][1]
+            rest_score, rest_plays = solve(''.join(letter * (counts[letter] - k)
+                                                   for letter, k in zip(letters, split)))
+            score = wordList.getWordScore(word, n) + rest_score
+            if score > best[0]:
+                best = (score, (word,) + rest_plays)
+        memo[signature] = best
+        return best
+
+    letters = ''.join(letter * count for letter, count in hand.items() if count > 0)
+    totalScore, plays = solve(getWordSignature(letters))
+    return totalScore, list(plays)
+
+
 #
 # Computer plays a hand
 #
-def compPlayHand(hand, wordList, n):
+def compPlayHand(hand, wordList, n, wordIndex=None, planner=getOptimalPlays):
     """
     Allows the computer to play the given hand, following the same procedure
     as playHand, except instead of the user choosing a word, the computer 
@@ -56,44 +173,49 @@ def compPlayHand(hand, wordList, n):
     displayed, the remaining letters in the hand are displayed, and the 
     computer chooses another word.
     4)  The sum of the word scores is displayed when the hand finishes.
-    5)  The hand finishes when the computer has exhausted its possible
-    choices (i.e. compChooseWord returns None).
+    5)  The hand finishes when the computer has played every word planner
+    picked for the hand.
  
     hand: dictionary (string -> int)
-    wordList: list (string)
+    wordList: WordDictionary or list (string)
     n: integer (HAND_SIZE; i.e., hand size required for additional points)
+    wordIndex: dictionary built by buildWordIndex(wordList), optional
+    planner: getOptimalPlays (the default) or getGreedyPlays
     """
-    # Keep track of the total score
-    totalScore = 0
-    # As long as there are still letters left in the hand:
-    while (calculateHandlen(hand) > 0) :
-        # Display the hand
-        print("Current Hand: ", end=' ')
-        displayHand(hand)
-        # computer's word
-        word = compChooseWord(hand, wordList, n)
-        # If the input is a single period:
-        if word == None:
-            # End the game (break out of the loop)
-            break
-            
-        # Otherwise (the input is not a single period):
-        else :
-            # If the word is not valid:
-            if (not isValidWord(word, hand, wordList)) :
-                print('This is a terrible error! I need to check my own code!')
-                break
-            # Otherwise (the word is valid):
-            else :
-                # Tell the user how many points the word earned, and the updated total score 
-                score = getWordScore(word, n)
-                totalScore += score
-                print('"' + word + '" earned ' + str(score) + ' points. Total: ' + str(totalScore) + ' points')              
-                # Update hand and show the updated hand to the user
-                hand = updateHand(hand, word)
-                print()
-    # Game is over (user entered a '.' or ran out of letters), so tell user the total score
-    print('Total score: ' + str(totalScore) + ' points.')
+    for line in compPlayHandLines(hand, wordList, n, wordIndex, planner):
+        print(line)
+
+def compPlayHandLines(hand, wordList, n, wordIndex=None, planner=getOptimalPlays):
+    """
+    Returns the lines compPlayHand shows while the computer plays hand:
+    the hand before every word, the word with its score and the running
+    total, and the total score. The words are the ones planner picks.
+
+    hand: dictionary (string -> int)
+    wordList: WordDictionary or list (string)
+    n: integer (HAND_SIZE; i.e., hand size required for additional points)
+    wordIndex: dictionary built by buildWordIndex(wordList), optional
+    planner: function (hand, wordList, n, wordIndex) returning a tuple
+      (total score, list of words), such as getOptimalPlays (the
+      default) or getGreedyPlays
+
+    returns: list (string)
+    """
+    wordList = toWordDictionary(wordList)
+    totalScore, plays = planner(hand, wordList, n, wordIndex)
+    lines = []
+    total = 0
+    for word in plays:
+        lines.append("Current Hand: " + formatHand(hand))
+        score = wordList.getWordScore(word, n)
+        total += score
+        lines.append('"' + word + '" earned ' + str(score) + ' points. Total: ' + str(total) + ' points')
+        hand = updateHand(hand, word)
+    # The computer stops once no word can be made; show the letters it kept.
+    if calculateHandlen(hand) > 0:
+        lines.append("Current Hand: " + formatHand(hand))
+    lines.append('Total score: ' + str(totalScore) + ' points.')
+    return lines
 
     
 #
@@ -122,12 +244,14 @@ def playGame2(wordList):
 
     4) After the computer or user has played the hand, repeat from step 1
 
-    wordList: list (string)
+    wordList: WordDictionary or list (string)
     """
     # TO DO... <-- Remove this comment when you code this function
     user_input = ''
     last_hand = {}
     n = HAND_SIZE
+    wordList = toWordDictionary(wordList)
+    wordIndex = wordList.getWordIndex()
 
     while user_input != 'e':
         print("Enter n to deal a new hand, r to replay the last hand, or e to end game: ",end="\t")
@@ -148,7 +272,7 @@ def playGame2(wordList):
             user_input = input()
 
             if user_input == 'c':
-                compPlayHand(last_hand, wordList, n)
+                compPlayHand(last_hand, wordList, n, wordIndex)
             elif user_input == 'u':
                 playHand(last_hand, wordList, n) # play with new hand
             else:
@@ -0,0 +1,168 @@
+# Headless hand simulations for the 6.00 Word Game
+#
+# Deals many hands with a seeded random generator, lets the computer play
+# each one and reports the distribution of the scores. Nothing on the
+# simulation path prints or asks for input, so it can run millions of
+# hands across a pool of worker processes.
+
+import argparse
+import math
+import multiprocessing
+import random
+from collections import Counter
+
+from ps4b import *
+
+STRATEGIES = {
+    'greedy': getGreedyPlays,
+    'optimal': getOptimalPlays,
+}
+
+# Set once per process by initSimulation. With the 'fork' start method the
+# workers inherit these from the parent copy-on-write instead of
+# unpickling their own copy.
+simulationWordList = None
+simulationWordIndex = None
+simulationMemo = {}
+
+# Most solved states the optimal strategy keeps in simulationMemo between
+# hands. The memo is cleared at the start of every chunk and after any hand
+# that leaves it larger than this, so a worker's memory stays bounded
+# however many hands it plays.
+SIMULATION_MEMO_LIMIT = 200000
+
+
+def initSimulation(wordList, wordIndex):
+    """
+    Makes wordList and wordIndex available to simulateChunk in this
+    process.
+    """
+    global simulationWordList, simulationWordIndex, simulationMemo
+    simulationWordList = wordList
+    simulationWordIndex = wordIndex
+    simulationMemo = {}
+
+
+def simulateChunk(task):
+    """
+    Deals and plays one chunk of hands.
+
+    Every hand is dealt by a generator seeded with both the run seed and
+    the hand's number in the run, so a run gives the same scores for any
+    number of processes and any chunk size.
+
+    task: tuple (seed, number of the first hand, number of hands, hand
+      size, strategy)
+    returns: Counter (score -> number of hands)
+    """
+    seed, first, numHands, n, strategy = task
+    play = STRATEGIES[strategy]
+    histogram = Counter()
+    simulationMemo.clear()
+    for handNumber in range(first, first + numHands):
+        hand = dealHand(n, random.Random("{0}-{1}".format(seed, handNumber)))
+        if strategy == 'optimal':
+            score = play(hand, simulationWordList, n, simulationWordIndex, simulationMemo)[0]
+            if len(simulationMemo) > SIMULATION_MEMO_LIMIT:
+                simulationMemo.clear()
+        else:
+            score = play(hand, simulationWordList, n, simulationWordIndex)[0]
+        histogram[score] += 1
+    return histogram
+
+
+def simulateHands(wordList, numHands, n=HAND_SIZE, strategy='greedy', seed=0,
+                  processes=None, chunkSize=10000):
+    """
+    Plays numHands random hands and returns how often each total score
+    came up.
+
+    wordList: WordDictionary or list (string)
+    numHands: int >= 0
+    n: integer (HAND_SIZE; i.e., hand size required for additional points)
+    strategy: 'greedy' (getGreedyPlays) or 'optimal' (getOptimalPlays)
+    seed: seed of the run; the same seed always deals the same hands
+    processes: number of worker processes; None uses every CPU and 1
+      plays all the hands in this process
+    chunkSize: number of hands a worker plays per task
+
+    returns: Counter (score -> number of hands)
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError("Unknown strategy: {0}".format(strategy))
+    wordList = toWordDictionary(wordList)
+    wordIndex = wordList.getWordIndex()
+
+    tasks = []
+    for start in range(0, numHands, chunkSize):
+        tasks.append((seed, start, min(chunkSize, numHands - start), n, strategy))
+
+    histogram = Counter()
+    if processes == 1:
+        initSimulation(wordList, wordIndex)
+        for task in tasks:
+            histogram.update(simulateChunk(task))
+        return histogram
+
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+    else:
+        context = multiprocessing.get_context()
+    with context.Pool(processes, initializer=initSimulation, initargs=(wordList, wordIndex)) as pool:
+        for chunkHistogram in pool.imap_unordered(simulateChunk, tasks):
+            histogram.update(chunkHistogram)
+    return histogram
+
+
+def summarizeScores(histogram, percentiles=(5, 25, 50, 75, 95)):
+    """
+    Returns summary statistics of a score histogram.
+
+    histogram: Counter (score -> number of hands)
+    returns: dictionary with the number of hands, mean, standard deviation,
+      min, max and the requested percentiles (as 'p50' etc.)
+    """
+    total = sum(histogram.values())
+    if total == 0:
+        return {'hands': 0}
+    mean = sum(score * count for score, count in histogram.items()) / total
+    variance = sum(count * (score - mean) ** 2 for score, count in histogram.items()) / total
+    summary = {
+        'hands': total,
+        'mean': mean,
+        'std': math.sqrt(variance),
+        'min': min(histogram),
+        'max': max(histogram),
+    }
+
+    scores = sorted(histogram)
+    seen = 0
+    targets = sorted(percentiles)
+    for score in scores:
+        seen += histogram[score]
+        while targets and seen >= total * targets[0] / 100.0:
+            summary['p{0}'.format(targets.pop(0))] = score
+    return summary
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play many random hands and report the score distribution.")
+    parser.add_argument('--hands', type=int, default=100000)
+    parser.add_argument('--hand-size', type=int, default=HAND_SIZE)
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='greedy')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--histogram', action='store_true', help="also print the count of every score")
+    args = parser.parse_args()
+
+    histogram = simulateHands(loadWords(), args.hands, args.hand_size, args.strategy,
+                              args.seed, args.processes, args.chunk_size)
+    summary = summarizeScores(histogram)
+    print("{0} hands, strategy {1}, seed {2}".format(summary['hands'], args.strategy, args.seed))
+    for key in ['mean', 'std', 'min', 'p5', 'p25', 'p50', 'p75', 'p95', 'max']:
+        if key in summary:
+            print("  {0:>4}: {1:.2f}".format(key, summary[key]))
+    if args.histogram:
+        for score in sorted(histogram):
+            print("  {0:4d} {1}".format(score, histogram[score]))
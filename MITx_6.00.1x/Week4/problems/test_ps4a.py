@@ -186,6 +186,57 @@ def test_isValidWord(wordList):
         print("SUCCESS: test_isValidWord()")
 
 
+def test_handCopy():
+    """
+    Unit test for Hand.copy: the copy can be changed like a dictionary
+    """
+    failure=False
+    hand = Hand('ab')
+    handCopy = hand.copy()
+    try:
+        handCopy['a'] -= 1
+    except TypeError as error:
+        print("FAILURE: test_handCopy()")
+        print("\tCould not change the copy:", error)
+        failure=True
+    if hand != Hand('ab'):
+        print("FAILURE: test_handCopy()")
+        print("\tChanging the copy changed the hand to", hand)
+        failure=True
+    if not isValidWord_REFERENCE('ab', Hand('ab'), ['ab']):
+        print("FAILURE: test_handCopy()")
+        print("\tisValidWord_REFERENCE rejected 'ab' for hand", Hand('ab'))
+        failure=True
+    if not failure:
+        print("SUCCESS: test_handCopy()")
+
+
+def test_toWordDictionary():
+    """
+    Unit test for toWordDictionary: a WordDictionary is passed through with
+    its DAWG and word index, a plain list is wrapped afresh every time
+    """
+    failure=False
+    words = ['bat', 'tab', 'cat']
+    wrapped = toWordDictionary(words)
+    if toWordDictionary(wrapped) is not wrapped or wrapped.getDawg() is not wrapped.getDawg() \
+            or wrapped.getWordIndex() is not toWordDictionary(wrapped).getWordIndex():
+        print("FAILURE: test_toWordDictionary()")
+        print("\tA WordDictionary was wrapped again or rebuilt its DAWG or word index")
+        failure=True
+    if wrapped.getWordIndex() != buildWordIndex(words):
+        print("FAILURE: test_toWordDictionary()")
+        print("\tExpected", buildWordIndex(words), "but got", wrapped.getWordIndex())
+        failure=True
+    words[0] = 'act'
+    if 'act' not in toWordDictionary(words) or 'bat' in toWordDictionary(words):
+        print("FAILURE: test_toWordDictionary()")
+        print("\tA list changed in place was not wrapped again")
+        failure=True
+    if not failure:
+        print("SUCCESS: test_toWordDictionary()")
+
+
 wordList = loadWords()
 print("----------------------------------------------------------------------")
 print("Testing getWordScore...")
@@ -197,4 +248,10 @@ print("----------------------------------------------------------------------")
 print("Testing isValidWord...")
 test_isValidWord(wordList)
 print("----------------------------------------------------------------------")
+print("Testing Hand.copy...")
+test_handCopy()
+print("----------------------------------------------------------------------")
+print("Testing toWordDictionary...")
+test_toWordDictionary()
+print("----------------------------------------------------------------------")
 print("All done!")
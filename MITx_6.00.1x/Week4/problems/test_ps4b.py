@@ -0,0 +1,207 @@
+import random
+
+import numpy as np
+
+from dawg import Dawg
+from ps4b import *
+from word_matrix import WordMatrix
+
+#
+# Test code
+# To run these tests, simply run this file (open up in your IDE, then run the file as normal)
+
+def test_compChooseWord(wordList):
+    """
+    Unit test for compChooseWord
+    """
+    failure=False
+    wordIndex = buildWordIndex(wordList)
+    # dictionary of hands and the word the computer should choose
+    hands = {"waybill":"waybill", "mafichm":"mafic", "bubusgg":"bubus", "qzx":None}
+    for letters in hands.keys():
+        hand = getFrequencyDict(letters)
+        for word in [compChooseWord(hand, wordList, HAND_SIZE, wordIndex), compChooseWord(hand, wordList, HAND_SIZE)]:
+            if word != hands[letters]:
+                print("FAILURE: test_compChooseWord()")
+                print("\tExpected", hands[letters], "but got", word, "for hand:", hand)
+                failure=True
+    if not failure:
+        print("SUCCESS: test_compChooseWord()")
+
+# end of test_compChooseWord
+
+
+def test_getOptimalPlays(wordList):
+    """
+    Unit test for getOptimalPlays
+    """
+    failure=False
+    wordIndex = buildWordIndex(wordList)
+    # dictionary of hands and the best total score for them
+    hands = {"waybill":155, "bubusgg":46, "appselz":75, "qzx":0}
+    for letters in hands.keys():
+        hand = getFrequencyDict(letters)
+        handCopy = hand.copy()
+        score, plays = getOptimalPlays(hand, wordList, HAND_SIZE, wordIndex)
+        greedyScore, greedyPlays = getGreedyPlays(hand, wordList, HAND_SIZE, wordIndex)
+
+        if score != hands[letters]:
+            print("FAILURE: test_getOptimalPlays()")
+            print("\tExpected", hands[letters], "points but got", score, "for hand:", hand)
+            failure=True
+        if score != sum(getWordScore(word, HAND_SIZE) for word in plays):
+            print("FAILURE: test_getOptimalPlays()")
+            print("\tPlays", plays, "do not add up to", score, "points")
+            failure=True
+        used = getFrequencyDict(''.join(plays))
+        if any(used[letter] > hand.get(letter, 0) for letter in used):
+            print("FAILURE: test_getOptimalPlays()")
+            print("\tPlays", plays, "use letters that are not in hand:", hand)
+            failure=True
+        if score < greedyScore:
+            print("FAILURE: test_getOptimalPlays()")
+            print("\tGreedy plays", greedyPlays, "beat", plays, "for hand:", hand)
+            failure=True
+        if hand != handCopy:
+            print("FAILURE: test_getOptimalPlays()")
+            print("\tHand was mutated from", handCopy, "to", hand)
+            failure=True
+    if not failure:
+        print("SUCCESS: test_getOptimalPlays()")
+
+# end of test_getOptimalPlays
+
+
+def test_compPlayHandLines(wordList):
+    """
+    Unit test for compPlayHandLines: the computer plays the optimal words,
+    so it scores at least as much as the greedy player
+    """
+    failure=False
+    wordIndex = buildWordIndex(wordList)
+    rng = random.Random(0)
+    hands = [getFrequencyDict(letters) for letters in ["waybill", "bubusgg", "appselz", "qzx"]]
+    hands += [dealHand(HAND_SIZE, rng) for _ in range(200)]
+    for hand in hands:
+        lines = compPlayHandLines(hand, wordList, HAND_SIZE, wordIndex)
+        greedyLines = compPlayHandLines(hand, wordList, HAND_SIZE, wordIndex, getGreedyPlays)
+        score = int(lines[-1].split()[2])
+        greedyScore = int(greedyLines[-1].split()[2])
+        if score != getOptimalPlays(hand, wordList, HAND_SIZE, wordIndex)[0]:
+            print("FAILURE: test_compPlayHandLines()")
+            print("\tExpected the optimal score but got", score, "for hand:", dict(hand.items()))
+            failure=True
+        if score < greedyScore:
+            print("FAILURE: test_compPlayHandLines()")
+            print("\tComputer scored", score, "but greedy scored", greedyScore, "for hand:", dict(hand.items()))
+            failure=True
+    if not failure:
+        print("SUCCESS: test_compPlayHandLines()")
+
+# end of test_compPlayHandLines
+
+
+def bruteForcePlayable(hand, wordCounts):
+    """
+    Returns the positions of the words (given by their letter counts) that
+    can be spelled with hand, checking every word.
+    """
+    return [position for position, counts in enumerate(wordCounts)
+            if all(hand.get(letter, 0) >= count for letter, count in counts.items())]
+
+def bruteForceBestWord(hand, wordList, playable, n):
+    """
+    Returns the best of the playable words, the first one on ties, or None.
+    """
+    best = None
+    bestScore = 0
+    for position in playable:
+        score = getWordScore(wordList[position], n)
+        if score > bestScore:
+            best, bestScore = wordList[position], score
+    return best
+
+def test_WordMatrix(wordList, wordCounts, hands):
+    """
+    Unit test for WordMatrix against a brute-force scan of the word list
+    """
+    failure=False
+    matrix = WordMatrix(wordList)
+    playable = [bruteForcePlayable(hand, wordCounts) for hand in hands]
+    for n in (HAND_SIZE, 5):
+        expected = [bruteForceBestWord(hand, wordList, positions, n) for hand, positions in zip(hands, playable)]
+        for hand, word in zip(hands, expected):
+            if matrix.bestWord(hand, n) != word:
+                print("FAILURE: test_WordMatrix()")
+                print("\tExpected", word, "but bestWord got", matrix.bestWord(hand, n), "for hand:", hand, "n", n)
+                failure=True
+        if matrix.bestWords(hands, n, chunkSize=7) != expected:
+            print("FAILURE: test_WordMatrix()")
+            print("\tbestWords disagrees with the brute-force best words for n", n)
+            failure=True
+    mask = matrix.playableMask(hands, chunkSize=7)
+    for row, positions in enumerate(playable):
+        if list(np.flatnonzero(mask[row])) != positions \
+                or list(np.flatnonzero(matrix.playable(hands[row]))) != positions:
+            print("FAILURE: test_WordMatrix()")
+            print("\tExpected", len(positions), "playable words but got", int(mask[row].sum()), "for hand:", hands[row])
+            failure=True
+    if not failure:
+        print("SUCCESS: test_WordMatrix()")
+
+# end of test_WordMatrix
+
+
+def test_Dawg(wordList, wordCounts, hands):
+    """
+    Unit test for Dawg against a brute-force scan of the word list
+    """
+    failure=False
+    dawg = Dawg(wordList)
+    if len(dawg) != len(set(wordList)):
+        print("FAILURE: test_Dawg()")
+        print("\tExpected", len(set(wordList)), "words but got", len(dawg))
+        failure=True
+    for hand in hands:
+        expected = sorted(set(wordList[position] for position in bruteForcePlayable(hand, wordCounts)))
+        if dawg.formableWords(hand) != expected:
+            print("FAILURE: test_Dawg()")
+            print("\tExpected", len(expected), "formable words but got", len(dawg.formableWords(hand)), "for hand:", hand)
+            failure=True
+    rng = random.Random(1)
+    prefixes = set(word[:i] for word in wordList for i in range(len(word) + 1))
+    words = set(wordList)
+    randomWords = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randrange(1, 8))) for _ in range(200)]
+    for word in rng.sample(sorted(words), 200) + randomWords:
+        for text in (word, word[:len(word) // 2]):
+            if (text in dawg) != (text in words) or dawg.hasPrefix(text) != (text in prefixes):
+                print("FAILURE: test_Dawg()")
+                print("\tMembership or prefix of", repr(text), "is wrong")
+                failure=True
+    if not failure:
+        print("SUCCESS: test_Dawg()")
+
+# end of test_Dawg
+
+
+wordList = loadWords()
+print("----------------------------------------------------------------------")
+print("Testing compChooseWord...")
+test_compChooseWord(wordList)
+print("----------------------------------------------------------------------")
+print("Testing getOptimalPlays...")
+test_getOptimalPlays(wordList)
+print("----------------------------------------------------------------------")
+print("Testing compPlayHandLines...")
+test_compPlayHandLines(wordList)
+wordCounts = [getFrequencyDict(word) for word in wordList]
+rng = random.Random(0)
+hands = [dealHand(HAND_SIZE, rng) for _ in range(15)] + [getFrequencyDict(letters) for letters in ("waybill", "qzx", "")]
+print("----------------------------------------------------------------------")
+print("Testing WordMatrix...")
+test_WordMatrix(wordList, wordCounts, hands)
+print("----------------------------------------------------------------------")
+print("Testing Dawg...")
+test_Dawg(wordList, wordCounts, hands)
+print("----------------------------------------------------------------------")
+print("All done!")
@@ -0,0 +1,82 @@
+import random
+from collections import Counter
+
+import simulate_hands
+from simulate_hands import *
+
+#
+# Test code
+# To run these tests, simply run this file (open up in your IDE, then run the file as normal)
+
+def test_simulateHands(wordList):
+    """
+    Unit test for simulateHands: a seed gives the same scores for any
+    number of processes and any chunk size
+    """
+    failure=False
+    for strategy in ('greedy', 'optimal'):
+        expected = simulateHands(wordList, 60, strategy=strategy, seed=3, processes=1, chunkSize=60)
+        if sum(expected.values()) != 60:
+            print("FAILURE: test_simulateHands()")
+            print("\tExpected 60 hands but got", sum(expected.values()))
+            failure=True
+        for processes, chunkSize in ((1, 7), (2, 60), (2, 11), (3, 1)):
+            histogram = simulateHands(wordList, 60, strategy=strategy, seed=3, processes=processes, chunkSize=chunkSize)
+            if histogram != expected:
+                print("FAILURE: test_simulateHands()")
+                print("\tStrategy", strategy, "with", processes, "processes and chunks of", chunkSize,
+                      "gave", sorted(histogram.items()), "instead of", sorted(expected.items()))
+                failure=True
+    if simulateHands(wordList, 60, seed=4, processes=1) == simulateHands(wordList, 60, seed=3, processes=1):
+        print("FAILURE: test_simulateHands()")
+        print("\tSeeds 3 and 4 dealt the same scores")
+        failure=True
+    if not failure:
+        print("SUCCESS: test_simulateHands()")
+
+# end of test_simulateHands
+
+
+def test_simulationMemoLimit(wordList):
+    """
+    Unit test for the bound on the optimal strategy's memo
+    """
+    failure=False
+    limit = simulate_hands.SIMULATION_MEMO_LIMIT
+    simulate_hands.SIMULATION_MEMO_LIMIT = 100
+    try:
+        initSimulation(wordList, wordList.getWordIndex())
+        unbounded = Counter()
+        for handNumber in range(40):
+            hand = dealHand(HAND_SIZE, random.Random("5-{0}".format(handNumber)))
+            unbounded[getOptimalPlays(hand, wordList, HAND_SIZE, wordList.getWordIndex())[0]] += 1
+        for start in range(0, 40, 10):
+            histogram = simulateChunk((5, start, 10, HAND_SIZE, 'optimal'))
+            if len(simulate_hands.simulationMemo) > 100:
+                print("FAILURE: test_simulationMemoLimit()")
+                print("\tThe memo holds", len(simulate_hands.simulationMemo), "states")
+                failure=True
+            unbounded.subtract(histogram)
+        # clearing the memo never changes a score
+        if +unbounded or -unbounded:
+            print("FAILURE: test_simulationMemoLimit()")
+            print("\tScores with the bounded memo differ by", dict(unbounded))
+            failure=True
+    finally:
+        simulate_hands.SIMULATION_MEMO_LIMIT = limit
+    if not failure:
+        print("SUCCESS: test_simulationMemoLimit()")
+
+# end of test_simulationMemoLimit
+
+
+if __name__ == '__main__':
+    wordList = loadWords()
+    print("----------------------------------------------------------------------")
+    print("Testing simulateHands...")
+    test_simulateHands(wordList)
+    print("----------------------------------------------------------------------")
+    print("Testing the simulation memo limit...")
+    test_simulationMemoLimit(wordList)
+    print("----------------------------------------------------------------------")
+    print("All done!")
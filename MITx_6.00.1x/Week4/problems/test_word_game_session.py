@@ -0,0 +1,84 @@
+import random
+
+from word_game_session import *
+
+#
+# Test code
+# To run these tests, simply run this file (open up in your IDE, then run the file as normal)
+
+def test_WordGameSession(wordList):
+    """
+    Unit test for WordGameSession, driven one line at a time
+    """
+    failure=False
+    session = WordGameSession(wordList, HAND_SIZE, random.Random(0))
+
+    def expect(line, expected, what):
+        lines = session.handle(line)
+        if lines != expected:
+            print("FAILURE: test_WordGameSession()")
+            print("\tExpected", expected, "but got", lines, "for", what)
+            return True
+        return False
+
+    if session.start() != [session.MENU_PROMPT]:
+        print("FAILURE: test_WordGameSession()")
+        print("\tstart() returned", session.start())
+        failure=True
+    failure |= expect('r', ["You have not played a hand yet. Please play a new hand first!", session.MENU_PROMPT],
+                      "'r' before any hand")
+    failure |= expect('x', ["Invalid command.", session.MENU_PROMPT], "an unknown command")
+    failure |= expect('n', [session.PLAYER_PROMPT], "'n'")
+    hand = session.lastHand
+
+    # the computer plays the hand as compPlayHand would
+    failure |= expect('c', compPlayHandLines(hand, wordList, HAND_SIZE) + [session.MENU_PROMPT], "'c'")
+
+    # the user replays the same hand: a hint, an invalid word, the hinted word, then '.'
+    failure |= expect('r', [session.PLAYER_PROMPT], "'r' after a hand")
+    failure |= expect('u', ["Current Hand: " + formatHand(hand), session.WORD_PROMPT], "'u'")
+    hint = getBestWord(hand, wordList, HAND_SIZE)
+    if hint is None:
+        failure |= expect('?', ["No word can be made from this hand.", "Current Hand: " + formatHand(hand),
+                                session.WORD_PROMPT], "'?'")
+    else:
+        score = getWordScore(hint, HAND_SIZE)
+        failure |= expect('?', ["Hint: \"{0}\" is worth {1} points.".format(hint, score),
+                                "Current Hand: " + formatHand(hand), session.WORD_PROMPT], "'?'")
+    failure |= expect('qqqqqqq', ["Invalid word, please try again.", "Current Hand: " + formatHand(hand),
+                                  session.WORD_PROMPT], "an invalid word")
+    total = 0
+    if hint is not None:
+        total = getWordScore(hint, HAND_SIZE)
+        left = updateHand(hand, hint)
+        played = ["\"{0}\" earned {1} points. Total: {1} points".format(hint, total)]
+        if calculateHandlen(left) == 0:
+            failure |= expect(hint, played + ["Run out of letters. Total score: {0} points.".format(total),
+                                              session.MENU_PROMPT], "the hinted word")
+        else:
+            failure |= expect(hint, played + ["Current Hand: " + formatHand(left), session.WORD_PROMPT],
+                              "the hinted word")
+    if session.step == 'word':
+        failure |= expect('.', ["Goodbye! Total score: {0} points.".format(total), session.MENU_PROMPT], "'.'")
+    if session.lastHand != hand:
+        print("FAILURE: test_WordGameSession()")
+        print("\tPlaying the hand changed the last hand to", session.lastHand)
+        failure=True
+
+    failure |= expect('e', ["Goodbye!"], "'e'")
+    if not session.finished or session.handle('n') != []:
+        print("FAILURE: test_WordGameSession()")
+        print("\tThe session went on after 'e'")
+        failure=True
+    if not failure:
+        print("SUCCESS: test_WordGameSession()")
+
+# end of test_WordGameSession
+
+
+wordList = loadWords()
+print("----------------------------------------------------------------------")
+print("Testing WordGameSession...")
+test_WordGameSession(wordList)
+print("----------------------------------------------------------------------")
+print("All done!")
@@ -0,0 +1,100 @@
+# The 6.00 Word Game as an I/O-free session
+#
+# WordGameSession follows the same steps as playGame2, but instead of
+# calling input() and print() it is fed one line of input at a time and
+# returns the lines to show, so any front end (a terminal, a socket
+# server) can drive it. The hands themselves are played by the same
+# functions as playHand and compPlayHand: playHandTurn and
+# compPlayHandLines.
+
+import random
+
+from ps4b import *
+
+
+class WordGameSession(object):
+    """
+    One player's game of the word game.
+
+    start() returns the first lines to show. After that every line the
+    player sends goes to handle(), which returns the lines to show next.
+    finished becomes True once the player ends the game.
+
+    wordList: WordDictionary, shared by every session
+    n: integer (HAND_SIZE; i.e., hand size required for additional points)
+    rng: random.Random used to deal hands; a fresh one by default
+    wordIndex: dictionary built by buildWordIndex(wordList); the index
+      cached on the WordDictionary (and so shared by its sessions) when None
+    planner: how the computer picks its words, see compPlayHandLines
+    """
+    MENU_PROMPT = "Enter n to deal a new hand, r to replay the last hand, or e to end game:"
+    PLAYER_PROMPT = "Enter u to have yourself play, c to have the computer play:"
+    WORD_PROMPT = "Enter word, a \"?\" for a hint, or a \".\" to indicate that you are finished:"
+
+    def __init__(self, wordList, n=HAND_SIZE, rng=None, wordIndex=None, planner=getOptimalPlays):
+        self.wordList = toWordDictionary(wordList)
+        self.n = n
+        self.rng = rng if rng is not None else random.Random()
+        self.wordIndex = wordIndex if wordIndex is not None else self.wordList.getWordIndex()
+        self.planner = planner
+        self.lastHand = None
+        self.hand = None
+        self.total = 0
+        self.step = 'menu'
+        self.finished = False
+
+    def start(self):
+        return [self.MENU_PROMPT]
+
+    def handle(self, line):
+        """
+        Handles one line of input and returns the lines to show.
+
+        line: string, without the line ending
+        returns: list (string)
+        """
+        line = line.strip()
+        if self.finished:
+            return []
+        if self.step == 'menu':
+            return self.handleMenu(line)
+        if self.step == 'player':
+            return self.handlePlayer(line)
+        return self.handleWord(line)
+
+    def handleMenu(self, line):
+        if line == 'e':
+            self.finished = True
+            return ["Goodbye!"]
+        if line not in ['n', 'r']:
+            return ["Invalid command.", self.MENU_PROMPT]
+        if line == 'r' and self.lastHand is None:
+            return ["You have not played a hand yet. Please play a new hand first!", self.MENU_PROMPT]
+        if line == 'n':
+            self.lastHand = dealHand(self.n, self.rng)
+        self.step = 'player'
+        return [self.PLAYER_PROMPT]
+
+    def handlePlayer(self, line):
+        if line == 'c':
+            self.step = 'menu'
+            return self.playComputerHand(self.lastHand) + [self.MENU_PROMPT]
+        if line == 'u':
+            self.step = 'word'
+            self.hand = self.lastHand
+            self.total = 0
+            return ["Current Hand: " + formatHand(self.hand), self.WORD_PROMPT]
+        return ["Invalid command.", self.PLAYER_PROMPT]
+
+    def handleWord(self, line):
+        self.hand, self.total, lines, finished = playHandTurn(self.hand, line, self.wordList, self.n, self.total)
+        if finished:
+            self.step = 'menu'
+            return lines + [self.MENU_PROMPT]
+        return lines + ["Current Hand: " + formatHand(self.hand), self.WORD_PROMPT]
+
+    def playComputerHand(self, hand):
+        """
+        Returns the lines compPlayHand prints while playing hand.
+        """
+        return compPlayHandLines(hand, self.wordList, self.n, self.wordIndex, self.planner)
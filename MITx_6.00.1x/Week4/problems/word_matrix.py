@@ -0,0 +1,145 @@
+# Vectorized word validity and scoring with NumPy
+#
+# The whole word list is encoded once as an (N x 26) matrix of letter
+# counts. Which words a hand can spell is then one broadcast comparison
+# against the hand's counts, and the best of them is one argmax over a
+# precomputed score vector.
+
+import string
+
+import numpy as np
+
+from ps4a import *
+
+
+class WordMatrix(object):
+    """
+    Letter counts and scores of every word in a word list.
+
+    counts[i, j] is the number of times letter j (0 for 'a') appears in
+    word i, lengths[i] its length and baseScores[i] its score without the
+    bonus for using all n letters. The matrix is also kept transposed
+    (26 x N), so that the rows compared for one letter are contiguous.
+
+    Can be passed as the wordIndex of compChooseWord and getGreedyPlays.
+
+    wordList: WordDictionary or list (string) of lowercase a-z words
+    """
+    def __init__(self, wordList):
+        self.words = list(wordList)
+        numWords = len(self.words)
+        self.lengths = np.fromiter((len(word) for word in self.words), dtype=np.int32, count=numWords)
+
+        codes = np.frombuffer(''.join(self.words).encode('ascii'), dtype=np.uint8).astype(np.int64) - ord('a')
+        if codes.size and (codes.min() < 0 or codes.max() >= 26):
+            raise ValueError("WordMatrix only encodes lowercase a-z words")
+        rows = np.repeat(np.arange(numWords), self.lengths)
+        flat = np.bincount(rows * 26 + codes, minlength=numWords * 26)
+        self.counts = flat.reshape(numWords, 26).astype(np.uint8)
+        self.countsByLetter = np.ascontiguousarray(self.counts.T)
+
+        letterValues = np.array([SCRABBLE_LETTER_VALUES[letter] for letter in string.ascii_lowercase], dtype=np.int32)
+        self.baseScores = (self.counts.astype(np.int32) @ letterValues) * self.lengths
+
+    def __len__(self):
+        return len(self.words)
+
+    def __repr__(self):
+        return "WordMatrix({0} words)".format(len(self.words))
+
+    def getScores(self, n):
+        """
+        Returns the getWordScore of every word for hand size n.
+
+        n: integer (HAND_SIZE; i.e., hand size required for additional points)
+        returns: numpy array (N,) of int32
+        """
+        return self.baseScores + 50 * (self.lengths == n)
+
+    def encodeHands(self, hands):
+        """
+        Returns the letter counts of hands as an (H x 26) uint8 array.
+
+        hands: list of dictionaries (string -> int) or Hands
+        """
+        encoded = np.zeros((len(hands), 26), dtype=np.uint8)
+        for row, hand in enumerate(hands):
+            for letter, count in hand.items():
+                if count > 0:
+                    encoded[row, ord(letter) - ord('a')] = count
+        return encoded
+
+    def playable(self, hand):
+        """
+        Returns a boolean array telling which words can be spelled with
+        the letters in hand.
+
+        hand: dictionary (string -> int) or Hand
+        returns: numpy array (N,) of bool
+        """
+        handCounts = self.encodeHands([hand])[0]
+        return (self.countsByLetter <= handCounts[:, None]).all(axis=0)
+
+    def bestWord(self, hand, n):
+        """
+        Returns the highest-scoring word that can be made from hand, or
+        None. Ties go to the word that comes first in the word list, as in
+        compChooseWord.
+
+        hand: dictionary (string -> int) or Hand
+        n: integer (HAND_SIZE; i.e., hand size required for additional points)
+        returns: string or None
+        """
+        scores = np.where(self.playable(hand), self.getScores(n), 0)
+        best = int(np.argmax(scores))
+        if scores[best] <= 0:
+            return None
+        return self.words[best]
+
+    def iterPlayableMasks(self, hands, chunkSize=256):
+        """
+        Yields (start, mask) for consecutive chunks of hands, where mask is
+        the (chunk x N) boolean array of the words each hand can spell.
+        Comparing one letter at a time keeps the temporary arrays at the
+        size of the mask.
+
+        hands: list of dictionaries (string -> int) or Hands
+        chunkSize: number of hands per chunk
+        """
+        for start in range(0, len(hands), chunkSize):
+            handCounts = self.encodeHands(hands[start:start + chunkSize])
+            mask = np.ones((len(handCounts), len(self.words)), dtype=bool)
+            for letter in range(26):
+                mask &= self.countsByLetter[letter][None, :] <= handCounts[:, letter][:, None]
+            yield start, mask
+
+    def playableMask(self, hands, chunkSize=256):
+        """
+        Returns the (hands x words) boolean array of the words each hand
+        can spell. It takes len(hands) * N bytes; use iterPlayableMasks
+        for batches too large to hold at once.
+
+        hands: list of dictionaries (string -> int) or Hands
+        returns: numpy array (H, N) of bool
+        """
+        mask = np.empty((len(hands), len(self.words)), dtype=bool)
+        for start, chunk in self.iterPlayableMasks(hands, chunkSize):
+            mask[start:start + len(chunk)] = chunk
+        return mask
+
+    def bestWords(self, hands, n, chunkSize=256):
+        """
+        Returns the bestWord of every hand in hands.
+
+        hands: list of dictionaries (string -> int) or Hands
+        n: integer (HAND_SIZE; i.e., hand size required for additional points)
+        returns: list (string or None)
+        """
+        scores = self.getScores(n)
+        words = []
+        for start, mask in self.iterPlayableMasks(hands, chunkSize):
+            masked = np.where(mask, scores[None, :], 0)
+            best = np.argmax(masked, axis=1)
+            for row, column in enumerate(best):
+                words.append(self.words[column] if masked[row, column] > 0 else None)
+        return words
@@ -0,0 +1,129 @@
+# Multi-session server for the word game and Hangman
+#
+# Hosts many concurrent games in one process with asyncio. Every
+# connection talks a plain line protocol: the server sends lines of text
+# and reads one line of input per prompt. The word lists are loaded once
+# and shared by all sessions; the games themselves are the I/O-free
+# sessions in Week4/problems/word_game_session.py and
+# Week3/problems/hangman_session.py.
+#
+#   python game_server.py --port 6001         (then: nc localhost 6001)
+#   python game_server.py --unix /tmp/games.sock
+
+import argparse
+import asyncio
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, 'Week4', 'problems'))
+sys.path.insert(0, os.path.join(HERE, 'Week3', 'problems'))
+
+import ps3_hangman
+import ps4a
+from hangman_session import HangmanSession
+from word_game_session import WordGameSession
+
+GAME_PROMPT = "Enter w to play the word game, h to play hangman, or e to exit:"
+
+
+class GameServer(object):
+    """
+    Accepts connections and runs one session per connection.
+
+    Session input is handled on an executor thread, so a CPU-bound move
+    (the computer's words, hints) does not hold up the other clients.
+
+    wordList: WordDictionary for the word game; its word index is built
+      once and shared by every word game session
+    hangmanWords: list of words for Hangman
+    executor: concurrent.futures executor for session.handle; None uses
+      the event loop's default thread pool
+    """
+    def __init__(self, wordList, hangmanWords, executor=None):
+        self.wordList = wordList
+        self.wordIndex = wordList.getWordIndex()
+        self.hangmanWords = hangmanWords
+        self.executor = executor
+        self.sessions = 0
+
+    def newSession(self, choice):
+        """
+        Returns the session for the game picked with choice, or None.
+        """
+        if choice == 'w':
+            return WordGameSession(self.wordList, wordIndex=self.wordIndex)
+        if choice == 'h':
+            return HangmanSession(self.hangmanWords)
+        return None
+
+    async def handleClient(self, reader, writer):
+        self.sessions += 1
+        loop = asyncio.get_running_loop()
+        try:
+            await self.send(writer, [GAME_PROMPT])
+            session = None
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.decode('utf-8', 'replace').strip()
+
+                if session is None:
+                    if line == 'e':
+                        await self.send(writer, ["Goodbye!"])
+                        break
+                    session = self.newSession(line)
+                    if session is None:
+                        await self.send(writer, ["Invalid command.", GAME_PROMPT])
+                    else:
+                        await self.send(writer, session.start())
+                    continue
+
+                await self.send(writer, await loop.run_in_executor(self.executor, session.handle, line))
+                if session.finished:
+                    session = None
+                    await self.send(writer, [GAME_PROMPT])
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def send(self, writer, lines):
+        if lines:
+            writer.write(('\n'.join(lines) + '\n').encode('utf-8'))
+            await writer.drain()
+
+    async def serve(self, host='127.0.0.1', port=6001, unixPath=None):
+        """
+        Serves until cancelled, on a Unix socket when unixPath is given
+        and on host:port otherwise.
+        """
+        if unixPath is not None:
+            server = await asyncio.start_unix_server(self.handleClient, path=unixPath)
+        else:
+            server = await asyncio.start_server(self.handleClient, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve the word game and Hangman over a line protocol.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=6001)
+    parser.add_argument('--unix', default=None, help="listen on this Unix socket instead of TCP")
+    args = parser.parse_args()
+
+    wordList = ps4a.loadWords()
+    # Build the DAWG before serving, so no session has to wait for it.
+    wordList.getDawg()
+    server = GameServer(wordList, ps3_hangman.loadWords())
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,96 @@
+import asyncio
+
+from game_server import *
+
+#
+# Test code
+# To run these tests, simply run this file (open up in your IDE, then run the file as normal)
+
+async def readUntil(reader, prompt):
+    """
+    Returns the lines the server sends up to and including prompt.
+    """
+    lines = []
+    while not lines or lines[-1] != prompt:
+        line = await asyncio.wait_for(reader.readline(), 10)
+        if not line:
+            break
+        lines.append(line.decode('utf-8').rstrip('\n'))
+    return lines
+
+async def playHangman(port):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    await readUntil(reader, GAME_PROMPT)
+    writer.write(b"h\n")
+    lines = await readUntil(reader, HangmanSession.GUESS_PROMPT)
+    for letter in "aple":
+        writer.write(letter.encode('utf-8') + b"\n")
+        lines = await readUntil(reader, GAME_PROMPT if letter == 'e' else HangmanSession.GUESS_PROMPT)
+    writer.write(b"e\n")
+    lines += await readUntil(reader, "Goodbye!")
+    writer.close()
+    await writer.wait_closed()
+    return lines
+
+async def playWordGame(port):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    await readUntil(reader, GAME_PROMPT)
+    lines = []
+    for (line, prompt) in (("x", GAME_PROMPT), ("w", WordGameSession.MENU_PROMPT),
+                           ("r", WordGameSession.MENU_PROMPT), ("n", WordGameSession.PLAYER_PROMPT),
+                           ("c", WordGameSession.MENU_PROMPT), ("e", GAME_PROMPT), ("e", "Goodbye!")):
+        writer.write(line.encode('utf-8') + b"\n")
+        lines += await readUntil(reader, prompt)
+    # the server hangs up after the last goodbye
+    lines.append(await asyncio.wait_for(reader.read(), 10))
+    writer.close()
+    await writer.wait_closed()
+    return lines
+
+async def runClients(clients):
+    gameServer = GameServer(ps4a.WordDictionary(['a', 'at', 'bat', 'tab', 'cat', 'act', 'oe', 'toe', 'note']),
+                            ['apple'])
+    server = await asyncio.start_server(gameServer.handleClient, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        results = await asyncio.gather(*[client(port) for client in clients])
+    return gameServer, results
+
+def test_GameServer():
+    """
+    Round trip against a GameServer on a free port, with several clients
+    playing both games at once
+    """
+    failure=False
+    clients = [playHangman, playWordGame] * 3
+    gameServer, results = asyncio.run(runClients(clients))
+    for client, lines in zip(clients, results):
+        if client is playHangman:
+            expected = ["Good guess: apple", "-----------", "Congratulations, you won!", GAME_PROMPT, "Goodbye!"]
+            if lines != expected:
+                print("FAILURE: test_GameServer()")
+                print("\tExpected", expected, "but got", lines, "from a Hangman client")
+                failure=True
+        else:
+            if lines[:2] != ["Invalid command.", GAME_PROMPT] or lines[2] != WordGameSession.MENU_PROMPT \
+                    or lines[3] != "You have not played a hand yet. Please play a new hand first!" \
+                    or not any(line.startswith("Total score: ") for line in lines) \
+                    or lines[-4:] != ["Goodbye!", GAME_PROMPT, "Goodbye!", b""]:
+                print("FAILURE: test_GameServer()")
+                print("\tUnexpected lines from a word game client:", lines)
+                failure=True
+    if gameServer.sessions != 0:
+        print("FAILURE: test_GameServer()")
+        print("\t", gameServer.sessions, "sessions still open after every client left")
+        failure=True
+    if not failure:
+        print("SUCCESS: test_GameServer()")
+
+# end of test_GameServer
+
+
+print("----------------------------------------------------------------------")
+print("Testing GameServer...")
+test_GameServer()
+print("----------------------------------------------------------------------")
+print("All done!")
@@ -0,0 +1,84 @@
+# On-disk cache of parsed word lists
+#
+# Shared by the Hangman (Week3/problems/ps3_hangman.py) and word game
+# (Week4/problems/ps4a.py) loaders. Each word list is parsed once and
+# pickled next to its file (filename + '.cache'); later loads read the
+# pickle instead of parsing the text again.
+
+import hashlib
+import os
+import pickle
+
+WORDLIST_CACHE_VERSION = 1
+
+def getFileDigest(filename):
+    """
+    Returns the SHA-1 hex digest of the contents of filename.
+    """
+    with open(filename, 'rb') as inFile:
+        return hashlib.sha1(inFile.read()).hexdigest()
+
+def compileWords(filename, parseWords):
+    """
+    Parses the word list in filename with parseWords (a function of the
+    filename returning a list of words) and stores it, together with the
+    source file's mtime, size and digest, in a pickle next to it
+    (filename + '.cache'). Returns the list of words.
+
+    Failing to write the cache (e.g. a read-only directory) is not an
+    error; the words are returned either way.
+    """
+    wordList = parseWords(filename)
+    stat = os.stat(filename)
+    compiled = {
+        'version': WORDLIST_CACHE_VERSION,
+        'mtime': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'digest': getFileDigest(filename),
+        'words': wordList,
+    }
+    writeCompiledWords(filename, compiled)
+    return wordList
+
+def writeCompiledWords(filename, compiled):
+    """
+    Atomically replaces the cache of filename (filename + '.cache') with
+    the pickled dictionary compiled. Failing to write it is not an error.
+    """
+    cacheFilename = filename + '.cache'
+    tmpFilename = "{0}.{1}.tmp".format(cacheFilename, os.getpid())
+    try:
+        with open(tmpFilename, 'wb') as outFile:
+            pickle.dump(compiled, outFile, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmpFilename, cacheFilename)
+    except OSError:
+        if os.path.exists(tmpFilename):
+            os.remove(tmpFilename)
+
+def loadCompiledWords(filename, parseWords):
+    """
+    Returns the list of words in filename, read from its compiled cache.
+
+    The cache is used as is while the source file's mtime and size are
+    unchanged. When they differ, the cache is still used if the source
+    digest matches, and is rewritten with the new mtime and size so later
+    loads skip the digest; otherwise the word list is recompiled with
+    parseWords.
+    """
+    stat = os.stat(filename)
+    try:
+        with open(filename + '.cache', 'rb') as inFile:
+            compiled = pickle.load(inFile)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return compileWords(filename, parseWords)
+
+    if not isinstance(compiled, dict) or compiled.get('version') != WORDLIST_CACHE_VERSION:
+        return compileWords(filename, parseWords)
+    if compiled['mtime'] == stat.st_mtime_ns and compiled['size'] == stat.st_size:
+        return compiled['words']
+    if compiled['digest'] == getFileDigest(filename):
+        compiled['mtime'] = stat.st_mtime_ns
+        compiled['size'] = stat.st_size
+        writeCompiledWords(filename, compiled)
+        return compiled['words']
+    return compileWords(filename, parseWords)
@@ -0,0 +1,174 @@
+"""
+Common sense baselines and validation metrics for the temperature forecasting notebook
+
+eval_naive_method() in 03_Temperature_forecasting.ipynb pulls val_steps batches
+through the generator to compare samples[:, -1, 1] with the targets. That
+builds every window just to read one value of it, and since val_steps is the
+number of rows rather than of batches the generator wraps around many times,
+so the average it prints weights the rows unevenly.
+
+Here every row of the validation range [min_index + lookback, max_index) is
+used exactly once, and the predictions and targets of a baseline are plain
+slices of the temperature column:
+
+    target of row       = data[row + delay, 1]
+    naive prediction    = data[row - lookback + last_offset, 1]   (samples[:, -1, 1])
+    persistence         = data[row + delay - period, 1]           (same time of day, in the window)
+
+The rows are processed chunk_size at a time, so the data can be a memory
+mapped array of any length, and model predictions can be evaluated the same way.
+"""
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from jena_windows import check_window_range
+
+DAY = 144  # readings are recorded every 10 minutes
+
+
+class ErrorAccumulator:
+    """Running MAE / RMSE over chunks of predictions and targets, summed in float64."""
+
+    def __init__(self):
+        self.count = 0
+        self.abs_sum = 0.0
+        self.squared_sum = 0.0
+
+    def update(self, predictions, targets):
+        errors = np.subtract(predictions, targets, dtype=np.float64)
+        self.count += errors.size
+        self.abs_sum += np.abs(errors).sum()
+        self.squared_sum += np.dot(errors.ravel(), errors.ravel())
+
+    def result(self, scale=1.0):
+        """MAE and RMSE, multiplied by scale (e.g. the temperature std to get degrees Celsius)."""
+        if not self.count:
+            raise ValueError("no predictions to average: update() was never given any rows")
+        return {'mae': scale * self.abs_sum / self.count,
+                'rmse': scale * np.sqrt(self.squared_sum / self.count),
+                'count': self.count}
+
+
+def row_range(data, lookback, delay, min_index, max_index):
+    """
+    The rows the notebook's generator draws from: [min_index + lookback, max_index).
+    Raises ValueError (see jena_windows.check_window_range) when the range is
+    empty or a target falls past the end of data.
+    """
+    return min_index + lookback, check_window_range(data, lookback, delay, min_index, max_index)
+
+
+def _evaluate_offsets(data, prediction_offset, delay, start, stop, target_column, chunk_size, scale):
+    """Compares data[row + prediction_offset] with data[row + delay] for every row in [start, stop)."""
+    series = data[:, target_column]
+    errors = ErrorAccumulator()
+    for chunk_start in range(start, stop, chunk_size):
+        chunk_stop = min(chunk_start + chunk_size, stop)
+        errors.update(series[chunk_start + prediction_offset:chunk_stop + prediction_offset],
+                      series[chunk_start + delay:chunk_stop + delay])
+    return errors.result(scale)
+
+
+def naive_baseline(data, lookback, delay, min_index, max_index, step=6, target_column=1,
+                   chunk_size=1 << 20, scale=1.0):
+    """
+    MAE / RMSE of predicting the target with the last reading of the window,
+    samples[:, -1, target_column] in the notebook.
+    """
+    start, stop = row_range(data, lookback, delay, min_index, max_index)
+    last_offset = len(range(0, lookback, step)) * step - step
+    return _evaluate_offsets(data, last_offset - lookback, delay, start, stop, target_column, chunk_size, scale)
+
+
+def persistence_baseline(data, lookback, delay, min_index, max_index, period=None, target_column=1,
+                         chunk_size=1 << 20, scale=1.0):
+    """
+    MAE / RMSE of predicting the target with the reading period steps before it.
+    The reading must be one of the window [row - lookback, row), so
+    delay < period <= delay + lookback. By default period is the smallest
+    whole number of days above delay: the same time of day as the target, on
+    the last day the window covers (two days before the target for the
+    notebook's delay of one day).
+    """
+    if period is None:
+        period = DAY * (delay // DAY + 1)
+    if not delay < period <= delay + lookback:
+        raise ValueError("period ({}) must be greater than delay ({}) and at most delay + lookback ({}), "
+                         "so the reading is inside the window".format(period, delay, delay + lookback))
+    start, stop = row_range(data, lookback, delay, min_index, max_index)
+    return _evaluate_offsets(data, delay - period, delay, start, stop, target_column, chunk_size, scale)
+
+
+def evaluate_predictions(data, predictions, lookback, delay, min_index, max_index, target_column=1,
+                         chunk_size=1 << 20, scale=1.0):
+    """
+    MAE / RMSE of a model's predictions, one per row of the validation range in
+    order (e.g. model.predict over the windows of those rows, or a memory mapped
+    array of them).
+    """
+    start, stop = row_range(data, lookback, delay, min_index, max_index)
+    if len(predictions) != stop - start:
+        raise ValueError("expected {} predictions, got {}".format(stop - start, len(predictions)))
+    series = data[:, target_column]
+    errors = ErrorAccumulator()
+    for chunk_start in range(0, stop - start, chunk_size):
+        chunk_stop = min(chunk_start + chunk_size, stop - start)
+        errors.update(np.ravel(predictions[chunk_start:chunk_stop]),
+                      series[start + chunk_start + delay:start + chunk_stop + delay])
+    return errors.result(scale)
+
+
+if __name__ == '__main__':
+    from jena_windows import generator, load_jena_array, notebook_generator
+
+    lookback = 1440
+    step = 6
+    delay = 144
+    batch_size = 128
+
+    # A daily temperature cycle plus noise, shaped like the jena climate data.
+    rng = np.random.default_rng(0)
+    readings = 420551
+    data = rng.standard_normal((readings, 14)).astype(np.float32)
+    data[:, 1] = np.sin(2 * np.pi * np.arange(readings) / DAY) + 0.3 * rng.standard_normal(readings)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'jena.npy')
+        np.save(path, data)
+        data = load_jena_array(path)
+
+        # eval_naive_method(), timed over a slice of its val_steps batches.
+        val_steps = 300000 - 200001 - lookback
+        val_gen = notebook_generator(data, lookback, delay, 200001, 300000, batch_size=batch_size, step=step)
+        timed_steps = 200
+        start = time.perf_counter()
+        batch_maes = []
+        for _ in range(timed_steps):
+            samples, targets = next(val_gen)
+            batch_maes.append(np.mean(np.abs(samples[:, -1, 1] - targets)))
+        per_step = (time.perf_counter() - start) / timed_steps
+        print("eval_naive_method       : {0:.0f} s for its {1} batches (estimated)".format(per_step * val_steps, val_steps))
+
+        start = time.perf_counter()
+        naive = naive_baseline(data, lookback, delay, 200001, 300000, step=step)
+        persistence = persistence_baseline(data, lookback, delay, 200001, 300000)
+        print("vectorized, every row   : {0:.3f} s".format(time.perf_counter() - start))
+        print("naive       mae {mae:.4f} rmse {rmse:.4f} over {count} rows".format(**naive))
+        print("persistence mae {mae:.4f} rmse {rmse:.4f} over {count} rows".format(**persistence))
+
+        # The same naive MAE from the windows themselves, every row once.
+        windows = generator(data, lookback, delay, 200001, 300000, batch_size=4096, step=step)
+        errors = ErrorAccumulator()
+        first, last = row_range(data, lookback, delay, 200001, 300000)
+        for chunk in range(first, last, 4096):
+            samples, targets = windows.batch(np.arange(chunk, min(chunk + 4096, last)))
+            errors.update(samples[:, -1, 1], targets)
+        assert np.isclose(errors.result()['mae'], naive['mae'])
+
+        predictions = data[first + delay:last + delay, 1] + 0.1
+        print("offset predictions mae {mae:.4f} rmse {rmse:.4f}".format(
+            **evaluate_predictions(data, predictions, lookback, delay, 200001, 300000, chunk_size=10000)))
+        del data, windows, val_gen
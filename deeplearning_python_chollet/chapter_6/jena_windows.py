@@ -0,0 +1,212 @@
+"""
+Batches of lookback windows for the temperature forecasting notebook
+
+Drop-in replacement for generator() in 03_Temperature_forecasting.ipynb:
+
+    from jena_windows import generator, load_jena_array
+    jena_weather_array = load_jena_array('data/jena_climate_2009_2016.npy')
+    train_gen = generator(jena_weather_array, lookback=lookback, delay=delay, min_index=0,
+                          max_index=200000, shuffle=True, step=step, batch_size=batch_size)
+
+Same lookback / delay / step / shuffle semantics, but
+
+- a batch is gathered with a single np.take into a preallocated samples array
+  (and one more for the targets) instead of a Python loop over the rows: the
+  timesteps of the window ending at row are row - lookback + offsets, with
+  offsets = arange(0, lookback, step) computed once
+- np.take, unlike a fancy index into a sliding_window_view of the data, writes
+  straight into the output buffer and never copies the whole view
+- the data can be a memory mapped .npy file (see save_jena_array), so only
+  the rows a batch touches are read from disk
+- every batch is a new pair of arrays, as in the notebook, unless buffers
+  are asked for (see WindowGenerator)
+"""
+import os
+import tempfile
+import time
+
+import numpy as np
+
+
+def save_jena_array(csv_path, npy_path, train_rows=200000, dtype=np.float32):
+    """
+    Converts the jena climate csv to a .npy file of its numeric columns (the
+    date column is dropped), normalized with the mean and std of the first
+    train_rows rows as in the notebook. Returns the mean and std.
+    """
+    with open(csv_path) as f:
+        columns = len(f.readline().split(','))
+    data = np.loadtxt(csv_path, delimiter=',', skiprows=1, usecols=range(1, columns), dtype=np.float64)
+    mean = data[:train_rows].mean(axis=0)
+    std = data[:train_rows].std(axis=0)
+    data -= mean
+    data /= std
+    np.save(npy_path, data.astype(dtype))
+    return mean, std
+
+
+def load_jena_array(npy_path):
+    """The array written by save_jena_array, memory mapped read-only."""
+    return np.load(npy_path, mmap_mode='r')
+
+
+def check_window_range(data, lookback, delay, min_index, max_index):
+    """
+    Returns max_index (len(data) - delay - 1 when None, as in the notebook)
+    after checking that every window and target of the rows
+    [min_index + lookback, max_index) lies inside data.
+    """
+    if max_index is None:
+        max_index = len(data) - delay - 1
+    if min_index < 0:
+        raise ValueError("min_index must be >= 0, got {}".format(min_index))
+    if max_index <= min_index + lookback:
+        raise ValueError("no rows in [min_index + lookback, max_index) = [{}, {})".format(
+            min_index + lookback, max_index))
+    if max_index - 1 + delay >= len(data):
+        raise ValueError("the target of row {} (max_index - 1 + delay = {}) is past the end of the {} rows of data"
+                         .format(max_index - 1, max_index - 1 + delay, len(data)))
+    return max_index
+
+
+class WindowGenerator:
+    """
+    Endless iterator of (samples, targets) batches, like the notebook's generator:
+
+    samples[j] = data[row - lookback:row:step]    (timesteps, features)
+    targets[j] = data[row + delay][target_column]
+
+    for rows drawn at random from [min_index + lookback, max_index) when
+    shuffle is set, or walked in order (and wrapped around) otherwise.
+
+    buffers: None (the default) to return new arrays for every batch, or the
+        number of (samples, targets) array pairs to reuse in rotation instead.
+        Reused arrays are overwritten when their turn comes again, so a
+        consumer may hold on to at most buffers - 1 earlier batches: with a
+        queue of batches (fit_generator workers, prefetch.Prefetcher) that
+        means more than queue_size + 1 buffers, or copying every batch.
+    seed: seed for the shuffled rows
+    dtype: dtype of the batches, the data's dtype by default
+    """
+
+    def __init__(self, data, lookback, delay, min_index, max_index, shuffle=False, batch_size=128, step=6,
+                 target_column=1, buffers=None, seed=None, dtype=None):
+        max_index = check_window_range(data, lookback, delay, min_index, max_index)
+        self.data = data
+        self.lookback, self.delay, self.step = lookback, delay, step
+        self.min_index, self.max_index = min_index, max_index
+        self.shuffle = shuffle
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+        self.i = min_index + lookback
+
+        self.offsets = np.arange(0, lookback, step)
+        self.target_series = data[:, target_column]
+        self.dtype = data.dtype if dtype is None else np.dtype(dtype)
+        self._indices = np.empty((batch_size, len(self.offsets)), dtype=np.intp)
+        self._buffers = [self._new_buffers(batch_size) for _ in range(buffers or 0)]
+        self._next_buffer = 0
+
+    def _new_buffers(self, rows):
+        return (np.empty((rows, len(self.offsets), self.data.shape[-1]), dtype=self.dtype),
+                np.empty(rows, dtype=self.dtype))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.shuffle:
+            rows = self.rng.integers(self.min_index + self.lookback, self.max_index, size=self.batch_size)
+        else:
+            if self.i + self.batch_size >= self.max_index:
+                self.i = self.min_index + self.lookback
+            rows = np.arange(self.i, min(self.i + self.batch_size, self.max_index))
+            self.i += len(rows)
+        return self.batch(rows)
+
+    def batch(self, rows):
+        """
+        The (samples, targets) batch of the given rows (at most batch_size of
+        them, within [min_index + lookback, max_index)), in new arrays or the
+        next buffers.
+        """
+        if self._buffers:
+            samples, targets = self._buffers[self._next_buffer]
+            self._next_buffer = (self._next_buffer + 1) % len(self._buffers)
+            samples, targets = samples[:len(rows)], targets[:len(rows)]
+        else:
+            samples, targets = self._new_buffers(len(rows))
+        indices = np.add((rows - self.lookback)[:, None], self.offsets, out=self._indices[:len(rows)])
+        # check_window_range has made sure these rows are in range, so
+        # mode='clip' never clips; it spares np.take the bounds check that
+        # makes it buffer the output.
+        if self.dtype == self.data.dtype:
+            np.take(self.data, indices, axis=0, out=samples, mode='clip')
+            np.take(self.target_series, rows + self.delay, out=targets, mode='clip')
+        else:
+            # np.take casts into out only under the 'safe' rule, so a batch
+            # of another dtype is gathered in the data's and assigned.
+            samples[...] = np.take(self.data, indices, axis=0, mode='clip')
+            targets[...] = np.take(self.target_series, rows + self.delay, mode='clip')
+        return samples, targets
+
+
+def generator(data, lookback, delay, min_index, max_index, shuffle=False, batch_size=128, step=6, **kwargs):
+    """The notebook's generator() signature, returning a WindowGenerator."""
+    return WindowGenerator(data, lookback, delay, min_index, max_index, shuffle, batch_size, step, **kwargs)
+
+
+def notebook_generator(data, lookback, delay, min_index, max_index, shuffle=False, batch_size=128, step=6):
+    """generator() as written in 03_Temperature_forecasting.ipynb, for comparison."""
+    if max_index is None:
+        max_index = len(data) - delay - 1
+    i = min_index + lookback
+    while 1:
+        if shuffle:
+            rows = np.random.randint(min_index + lookback, max_index, size=batch_size)
+        else:
+            if i + batch_size >= max_index:
+                i = min_index + lookback
+            rows = np.arange(i, min(i + batch_size, max_index))
+            i += len(rows)
+
+        samples = np.zeros((len(rows), lookback // step, data.shape[-1]))
+        targets = np.zeros((len(rows),))
+        for j, row in enumerate(rows):
+            indices = range(rows[j] - lookback, rows[j], step)
+            samples[j] = data[indices]
+            targets[j] = data[rows[j] + delay][1]
+
+        yield samples, targets
+
+
+if __name__ == '__main__':
+    lookback = 1440
+    step = 6
+    delay = 144
+    batch_size = 128
+    batches = 200
+
+    # Same shape as the jena climate data: 420551 readings of 14 features.
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'jena.npy')
+        np.save(path, rng.standard_normal((420551, 14)).astype(np.float32))
+        data = load_jena_array(path)
+
+        sequential = generator(data, lookback, delay, 200001, 300000, batch_size=batch_size, step=step)
+        expected = notebook_generator(data, lookback, delay, 200001, 300000, batch_size=batch_size, step=step)
+        for _ in range(3):
+            (samples, targets), (old_samples, old_targets) = next(sequential), next(expected)
+            assert np.array_equal(samples, old_samples) and np.array_equal(targets, old_targets)
+
+        for shuffle in (False, True):
+            for name, make in (('notebook generator', notebook_generator), ('WindowGenerator   ', generator)):
+                batch_gen = make(data, lookback, delay, 0, 200000, shuffle=shuffle, batch_size=batch_size, step=step)
+                next(batch_gen)
+                start = time.perf_counter()
+                for _ in range(batches):
+                    next(batch_gen)
+                rate = batches / (time.perf_counter() - start)
+                print("{0} shuffle={1!s:5s}: {2:8.1f} batches/s".format(name, shuffle, rate))
+        del data, sequential, expected, batch_gen
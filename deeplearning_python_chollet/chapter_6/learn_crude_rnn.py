@@ -4,7 +4,6 @@ INPUT_FEATURES = 32
 OUTPUT_FEATURES = 64
 TIMESTEPS = 100
 
-inputs = np.random.random((TIMESTEPS, INPUT_FEATURES))
 
 def learn_crude_rnn(inputs, input_features=INPUT_FEATURES, output_features=OUTPUT_FEATURES):
 
@@ -22,10 +21,12 @@ def learn_crude_rnn(inputs, input_features=INPUT_FEATURES, output_features=OUTPU
 		successive_outputs.append(output_t)
 		
 		state_t = output_t
-		print(state_t)
 	
-	output_sequence = np.concatenate(successive_outputs, axis=0)
+	# (timesteps, output_features); see rnn_forward.py for batches of sequences
+	output_sequence = np.stack(successive_outputs, axis=0)
 	return output_sequence
 	
 
-print(learn_crude_rnn(inputs))
+if __name__ == '__main__':
+	inputs = np.random.random((TIMESTEPS, INPUT_FEATURES))
+	print(learn_crude_rnn(inputs).shape)
@@ -0,0 +1,374 @@
+"""
+Prefetching batches in the background for the temperature forecasting notebook
+
+The notebook's train_gen / val_gen / test_gen build every batch only when the
+model asks for it, so training waits for the data and the data for training.
+
+- Prefetcher wraps any generator (the notebook's, jena_windows.generator, ...)
+  and runs it in a background thread that keeps a bounded queue of batches
+  ready. NumPy releases the GIL while it copies, so batches are gathered while
+  the model trains.
+- ParallelBatches builds batch number i with batch_fn(i, rng) on a pool of
+  threads or processes. Processes write their batches into shared memory
+  slots, so no batch is pickled through a pipe. rng is seeded from (seed, i),
+  so the batches are the same whatever the number of workers or their timing.
+- WindowBatches is such a batch_fn for the shuffled jena windows.
+
+Both are iterators that can be passed to fit_generator, whose queue holds
+on to several batches at once, so every batch they return must own its
+arrays. ParallelBatches copies batches out of the shared memory slots
+unless told otherwise (copy=False), and Prefetcher hands its source's
+batches over as they are, so a source reusing its arrays needs copy=True.
+Both stop their workers on close() (or at the end of a with block):
+
+    with Prefetcher(train_gen, queue_size=8) as batches:
+        model.fit_generator(batches, steps_per_epoch=500, epochs=20)
+"""
+import concurrent.futures
+import os
+import queue
+import tempfile
+import threading
+import time
+from collections import deque
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from jena_windows import check_window_range
+
+_END = object()
+
+
+class _Raised:
+    """An exception raised by the producer, handed over to the consumer."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def _copy_batch(batch):
+    if isinstance(batch, tuple):
+        return tuple(np.array(part, copy=True) for part in batch)
+    return np.array(batch, copy=True)
+
+
+class Prefetcher:
+    """
+    Iterates over batches (any iterable) in a background thread, keeping up to
+    queue_size batches ready ahead of the consumer.
+
+    copy: copy every batch before queueing it. Needed when the source reuses
+        its arrays for the next batch, e.g. a jena_windows.WindowGenerator
+        with buffers (unless it has more than queue_size + 1 of them); with
+        copy=False the queued batches would be overwritten while they wait.
+    """
+
+    def __init__(self, batches, queue_size=4, copy=False):
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._copy = copy
+        self._thread = threading.Thread(target=self._produce, args=(iter(batches),), daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        """Blocks while the queue is full; returns False if closed meanwhile."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _produce(self, batches):
+        try:
+            for batch in batches:
+                if not self._put(_copy_batch(batch) if self._copy else batch):
+                    return
+        except BaseException as error:
+            # Anything the source raises, KeyboardInterrupt included, must
+            # reach the consumer, or its queue.get() would wait forever.
+            self._put(_Raised(error))
+        else:
+            self._put(_END)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._stop.is_set():
+            raise StopIteration
+        item = self._queue.get()
+        if item is _END:
+            self._stop.set()
+            raise StopIteration
+        if isinstance(item, _Raised):
+            self.close()
+            raise item.error
+        return item
+
+    def close(self):
+        """Stops the producer thread and drops the queued batches."""
+        self._stop.set()
+        while self._thread.is_alive():
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                self._thread.join(timeout=0.1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# State of a ParallelBatches worker process, set by _init_worker.
+_worker = {}
+
+
+def _init_worker(batch_fn, seed, layout):
+    _worker['batch_fn'] = batch_fn
+    _worker['seed'] = seed
+    _worker['layout'] = layout
+    _worker['slots'] = {}
+
+
+def _fill_slot(index, slot_name):
+    """Builds batch index in a worker process and writes it into a shared memory slot."""
+    slots = _worker['slots']
+    if slot_name not in slots:
+        # The workers share the parent's resource tracker, which already
+        # knows the slots; the parent unlinks them in close().
+        slots[slot_name] = shared_memory.SharedMemory(name=slot_name)
+    batch = _worker['batch_fn'](index, np.random.default_rng([_worker['seed'], index]))
+    for part, view in zip(_as_parts(batch), _slot_views(slots[slot_name], _worker['layout'])):
+        view[...] = part
+    return index
+
+
+def _as_parts(batch):
+    return batch if isinstance(batch, tuple) else (batch,)
+
+
+def _slot_views(slot, layout):
+    """The arrays of one batch, laid out one after the other in slot."""
+    views = []
+    offset = 0
+    for shape, dtype in layout:
+        view = np.ndarray(shape, dtype=dtype, buffer=slot.buf, offset=offset)
+        views.append(view)
+        offset += view.nbytes
+    return views
+
+
+class ParallelBatches:
+    """
+    Iterates over batch_fn(0, rng_0), batch_fn(1, rng_1), ... built ahead of the
+    consumer by a pool of workers, in order.
+
+    batch_fn: function of (index, rng) returning an array or a tuple of arrays,
+        e.g. WindowBatches. rng is np.random.default_rng([seed, index]), and
+        batch_fn must not depend on any other random state, so the batches are
+        reproducible. With processes it must be picklable, and with threads
+        it must be safe to call from several threads at once.
+    steps: number of batches, None for an endless iterator like the notebook's
+    workers: size of the pool
+    processes: use a process pool instead of a thread pool. Each batch is then
+        written into one of queue_size + 1 shared memory slots.
+    context: multiprocessing context of the process pool, e.g.
+        multiprocessing.get_context('spawn'); None uses the default one
+    queue_size: number of batches being built ahead of the consumer
+    copy: with processes, copy every batch out of its slot (the default).
+        copy=False returns arrays viewing the slot instead, which stay valid
+        only until the next batch is requested; use it only when each batch
+        is consumed before asking for the next one.
+    """
+
+    def __init__(self, batch_fn, steps=None, workers=4, processes=False, seed=0, queue_size=8, copy=None,
+                 context=None):
+        self.batch_fn = batch_fn
+        self.steps = steps
+        self.seed = seed
+        self.queue_size = queue_size
+        self.copy = processes if copy is None else copy
+        self._next_index = 0
+        self._next_submit = 0
+        self._pending = deque()
+        self._slots = []
+        if processes:
+            # Batch 0, built here once, gives the layout of the shared memory slots.
+            sample = batch_fn(0, np.random.default_rng([seed, 0]))
+            self._tuple = isinstance(sample, tuple)
+            sample = _as_parts(sample)
+            self._layout = [(part.shape, part.dtype) for part in sample]
+            size = sum(part.nbytes for part in sample)
+            self._slots = [shared_memory.SharedMemory(create=True, size=max(size, 1))
+                           for _ in range(queue_size + 1)]
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                workers, mp_context=context, initializer=_init_worker, initargs=(batch_fn, seed, self._layout))
+            # Batch 0 is handed out as built here, so the workers start at 1.
+            if steps is None or steps > 0:
+                first = concurrent.futures.Future()
+                first.set_result(tuple(sample) if self._tuple else sample[0])
+                self._pending.append(first)
+                self._next_submit = 1
+        else:
+            self._executor = concurrent.futures.ThreadPoolExecutor(workers)
+        for _ in range(queue_size - len(self._pending)):
+            self._submit()
+
+    def _submit(self):
+        index = self._next_submit
+        if self.steps is not None and index >= self.steps:
+            return
+        if self._slots:
+            slot = self._slots[index % len(self._slots)]
+            future = self._executor.submit(_fill_slot, index, slot.name)
+        else:
+            future = self._executor.submit(self.batch_fn, index, np.random.default_rng([self.seed, index]))
+        self._pending.append(future)
+        self._next_submit += 1
+
+    def __iter__(self):
+        return self
+
+    def __len__(self):
+        if self.steps is None:
+            raise TypeError("endless ParallelBatches have no length")
+        return self.steps
+
+    def __next__(self):
+        if not self._pending:
+            raise StopIteration
+        future = self._pending.popleft()
+        try:
+            batch = future.result()
+        except BaseException:
+            self.close()
+            raise
+        index = self._next_index
+        self._next_index += 1
+        # Batch index + queue_size reuses the slot of batch index - 1, which
+        # the consumer has given up by asking for this one.
+        self._submit()
+        if self._slots and index:
+            views = _slot_views(self._slots[index % len(self._slots)], self._layout)
+            batch = tuple(views) if self._tuple else views[0]
+            return _copy_batch(batch) if self.copy else batch
+        return batch
+
+    def close(self):
+        """Cancels the pending batches, stops the workers and frees the shared memory."""
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._executor.shutdown(wait=True)
+        for slot in self._slots:
+            slot.close()
+            slot.unlink()
+        self._slots = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class WindowBatches:
+    """
+    batch_fn for ParallelBatches giving the batches of
+    jena_windows.generator(..., shuffle=True): batch_size rows drawn from
+    [min_index + lookback, max_index) with rng.
+
+    A memory mapped data array (or a C-contiguous slice of one, such as the
+    training rows) is reopened from its file in every worker process rather
+    than pickled.
+    """
+
+    def __init__(self, data, lookback, delay, min_index, max_index, batch_size=128, step=6, target_column=1):
+        max_index = check_window_range(data, lookback, delay, min_index, max_index)
+        self.data = data
+        self.lookback, self.delay = lookback, delay
+        self.min_index, self.max_index = min_index, max_index
+        self.batch_size = batch_size
+        self.offsets = np.arange(0, lookback, step)
+        self.target_column = target_column
+
+    def __call__(self, index, rng):
+        rows = rng.integers(self.min_index + self.lookback, self.max_index, size=self.batch_size)
+        indices = (rows - self.lookback)[:, None] + self.offsets
+        # The rows are in range (check_window_range), so nothing is clipped.
+        samples = np.take(self.data, indices, axis=0, mode='clip')
+        targets = np.take(self.data[:, self.target_column], rows + self.delay, mode='clip')
+        return samples, targets
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        data = self.data
+        if isinstance(data, np.memmap) and data.filename is not None:
+            state['data'] = (data.filename, data.dtype, data.shape, _file_offset(data))
+        return state
+
+    def __setstate__(self, state):
+        if isinstance(state['data'], tuple):
+            filename, dtype, shape, offset = state['data']
+            state['data'] = np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=shape)
+        self.__dict__.update(state)
+
+
+def _file_offset(data):
+    """
+    Byte offset in its file of the memory mapped array data, which may be a
+    view of the memmap that opened the file (data.offset is that memmap's
+    offset, whatever the view).
+    """
+    if not data.flags.c_contiguous:
+        raise ValueError("only C-contiguous memory mapped arrays can be reopened in a worker")
+    mapped = data
+    while isinstance(mapped.base, np.memmap):
+        mapped = mapped.base
+    start = data.__array_interface__['data'][0] - mapped.__array_interface__['data'][0]
+    return mapped.offset + start
+
+
+if __name__ == '__main__':
+    from jena_windows import generator, load_jena_array
+
+    lookback = 1440
+    step = 6
+    delay = 144
+    batch_size = 128
+    batches = 300
+    train_step = 0.002  # seconds of "training" per batch, spent outside the GIL like a real model
+
+    def consume(batch_iter):
+        start = time.perf_counter()
+        for _ in range(batches):
+            samples, targets = next(batch_iter)
+            time.sleep(train_step)
+        return batches / (time.perf_counter() - start)
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'jena.npy')
+        np.save(path, rng.standard_normal((420551, 14)).astype(np.float32))
+        data = load_jena_array(path)
+
+        def train_gen():
+            return generator(data, lookback, delay, 0, 200000, shuffle=True, batch_size=batch_size, step=step, seed=1)
+
+        print("synchronous generator        : {0:7.1f} batches/s".format(consume(train_gen())))
+        with Prefetcher(train_gen(), queue_size=8) as batch_iter:
+            print("Prefetcher (thread)          : {0:7.1f} batches/s".format(consume(batch_iter)))
+
+        batch_fn = WindowBatches(data, lookback, delay, 0, 200000, batch_size=batch_size, step=step)
+        for processes in (False, True):
+            for workers in (1, 2, 4):
+                with ParallelBatches(batch_fn, workers=workers, processes=processes, queue_size=8) as batch_iter:
+                    rate = consume(batch_iter)
+                print("ParallelBatches {0:9s} x {1}: {2:7.1f} batches/s".format(
+                    'processes' if processes else 'threads', workers, rate))
+        del data
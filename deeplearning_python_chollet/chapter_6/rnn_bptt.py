@@ -0,0 +1,426 @@
+"""
+Training the crude RNN: backpropagation through time in NumPy
+
+learn_crude_rnn.py and rnn_forward.py only run the forward pass with random
+weights. This module adds the backward pass so a recurrent layer plus a Dense(1)
+head can be trained like the Keras models in 03_Temperature_forecasting.ipynb
+(loss='mae', optimizer='adam'), on the CPU and without Keras:
+
+- SimpleRNNCell: output_t = tanh(input_t . W + U . state_t + b), the cell of
+  learn_crude_rnn (its forward pass is rnn_forward)
+- GRUCell: the gated recurrent unit used by layers.GRU
+- the forward pass caches the activations it computes (states, gates) and the
+  backward pass reads them back instead of recomputing anything
+- as in the forward pass, the input side is one GEMM over all timesteps: the
+  input projections before the time loop, and dW = inputs^T . d(projections)
+  after the backward time loop
+- truncated BPTT: with truncate=k only the last k timesteps of a sequence are
+  cached and backpropagated (one target per sequence), or the sequence is
+  trained in windows of k timesteps with the state carried over (one target
+  per timestep)
+- gradients are clipped by their global norm before the Adam update
+"""
+import time
+import tracemalloc
+
+import numpy as np
+
+from rnn_forward import rnn_forward
+
+
+def sigmoid(x, out=None):
+    """Logistic function written with tanh, so it never overflows."""
+    out = np.multiply(x, 0.5, out=out)
+    np.tanh(out, out=out)
+    out += 1
+    out *= 0.5
+    return out
+
+
+def glorot_uniform(rng, shape, dtype):
+    limit = np.sqrt(6.0 / (shape[0] + shape[1]))
+    return rng.uniform(-limit, limit, shape).astype(dtype)
+
+
+class _Cell:
+    """Shared parts of the recurrent cells: parameters and reusable buffers."""
+
+    def __init__(self, dtype):
+        self.dtype = np.dtype(dtype)
+        self.params = {}
+        self._buffers = {}
+
+    @property
+    def units(self):
+        return self.params['b'].shape[0] // self.gates
+
+    def _buffer(self, name, shape):
+        """An array that is reused as long as the requested shape does not change."""
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != shape:
+            buffer = self._buffers[name] = np.empty(shape, dtype=self.dtype)
+        return buffer
+
+    def _project(self, inputs, out):
+        """inputs . W + b for every timestep, as one GEMM."""
+        batch, timesteps, input_features = inputs.shape
+        np.dot(inputs.reshape(-1, input_features), self.params['W'], out=out.reshape(batch * timesteps, -1))
+        out += self.params['b']
+        return out
+
+    def run(self, inputs, state, block=64):
+        """
+        Runs the cell over inputs without caching anything and returns the last
+        state. The input projections are computed block timesteps at a time,
+        so memory does not grow with the sequence length.
+        """
+        state = state.copy()
+        for start in range(0, inputs.shape[1], block):
+            chunk = inputs[:, start:start + block]
+            projections = self._project(chunk, self._buffer('run', chunk.shape[:2] + (self.params['b'].shape[0],)))
+            for t in range(chunk.shape[1]):
+                state = self._step(projections[:, t], state)
+            # The state may be a view of the buffer the next block overwrites.
+            state = state.copy()
+        return state
+
+    def _weight_gradients(self, inputs, state, outputs, d_projections, grads, recurrent, columns=slice(None)):
+        """
+        dW, db and the recurrent weight gradient of the states, each as one GEMM
+        over all timesteps of the cached window.
+        """
+        features = inputs.shape[-1]
+        units = state.shape[1]
+        d_flat = d_projections.reshape(-1, d_projections.shape[-1])
+        grads['W'] = inputs.reshape(-1, features).T.dot(d_flat)
+        grads['b'] = d_flat.sum(axis=0)
+        # The state feeding timestep t is outputs[:, t - 1] (state for t = 0).
+        d_recurrent = d_projections[:, :, columns]
+        grad = state.T.dot(d_recurrent[:, 0])
+        if outputs.shape[1] > 1:
+            grad += outputs[:, :-1].reshape(-1, units).T.dot(d_recurrent[:, 1:].reshape(-1, d_recurrent.shape[-1]))
+        grads[recurrent] = grad
+
+
+class SimpleRNNCell(_Cell):
+    """
+    output_t = tanh(input_t . W + U . state_t + b), as in learn_crude_rnn, with
+    Glorot initial weights instead of uniform [0, 1) ones, which saturate tanh.
+    """
+    gates = 1
+
+    def __init__(self, input_features, units, dtype=np.float32, seed=None):
+        super().__init__(dtype)
+        rng = np.random.default_rng(seed)
+        self.params['W'] = glorot_uniform(rng, (input_features, units), self.dtype)
+        self.params['U'] = glorot_uniform(rng, (units, units), self.dtype)
+        self.params['b'] = np.zeros(units, dtype=self.dtype)
+
+    def _step(self, projection, state):
+        # U . state for a batch of states is state . U^T
+        projection += state.dot(self.params['U'].T)
+        return np.tanh(projection, out=projection)
+
+    def forward(self, inputs, state):
+        """Returns the outputs of every timestep (batch, timesteps, units) and the cache for backward."""
+        p = self.params
+        outputs = self._buffer('outputs', inputs.shape[:2] + (self.units,))
+        rnn_forward(inputs, p['W'], p['U'], p['b'], state, out=outputs)
+        return outputs, (inputs, state, outputs)
+
+    def backward(self, cache, d_last=None, d_outputs=None):
+        """
+        Backpropagates through the cached window. d_last is the gradient of the
+        loss with respect to the last output, d_outputs with respect to every
+        output. Returns the parameter gradients and the gradient of the initial state.
+        """
+        inputs, state, outputs = cache
+        U = self.params['U']
+        timesteps = outputs.shape[1]
+        d_projections = self._buffer('d_projections', outputs.shape)
+        d_state = np.zeros_like(state) if d_last is None else d_last.copy()
+
+        for t in range(timesteps - 1, -1, -1):
+            if d_outputs is not None:
+                d_state += d_outputs[:, t]
+            d_pre = d_projections[:, t]
+            output_t = outputs[:, t]
+            np.multiply(output_t, output_t, out=d_pre)
+            np.subtract(1, d_pre, out=d_pre)
+            d_pre *= d_state
+            d_state = d_pre.dot(U)
+
+        grads = {}
+        self._weight_gradients(inputs, state, outputs, d_projections, grads, 'U')
+        # d_pre = d_projections and pre = state . U^T, so dU = d_pre^T . state
+        grads['U'] = grads['U'].T
+        return grads, d_state
+
+
+class GRUCell(_Cell):
+    """
+    Gated recurrent unit (the formulation of keras.layers.GRU, reset gate
+    applied before the recurrent product):
+
+        z_t = sigmoid(input_t . W_z + state_t . U_z + b_z)      update gate
+        r_t = sigmoid(input_t . W_r + state_t . U_r + b_r)      reset gate
+        h_t = tanh(input_t . W_h + (r_t * state_t) . U_h + b_h)  candidate
+        output_t = z_t * state_t + (1 - z_t) * h_t
+
+    W = [W_z | W_r | W_h], b = [b_z | b_r | b_h], U = [U_z | U_r] and U_h.
+    """
+    gates = 3
+
+    def __init__(self, input_features, units, dtype=np.float32, seed=None):
+        super().__init__(dtype)
+        rng = np.random.default_rng(seed)
+        self.params['W'] = glorot_uniform(rng, (input_features, 3 * units), self.dtype)
+        self.params['U'] = glorot_uniform(rng, (units, 2 * units), self.dtype)
+        self.params['U_h'] = glorot_uniform(rng, (units, units), self.dtype)
+        self.params['b'] = np.zeros(3 * units, dtype=self.dtype)
+
+    def _gates(self, projection, state, gates_out, candidate_out):
+        units = state.shape[1]
+        gates = np.add(projection[:, :2 * units], state.dot(self.params['U']), out=gates_out)
+        sigmoid(gates, out=gates)
+        reset_state = gates[:, units:] * state
+        candidate = np.add(projection[:, 2 * units:], reset_state.dot(self.params['U_h']), out=candidate_out)
+        np.tanh(candidate, out=candidate)
+        # output = z * state + (1 - z) * candidate = candidate + z * (state - candidate)
+        output = state - candidate
+        output *= gates[:, :units]
+        output += candidate
+        return output
+
+    def _step(self, projection, state):
+        units = state.shape[1]
+        return self._gates(projection, state, projection[:, :2 * units], projection[:, 2 * units:])
+
+    def forward(self, inputs, state):
+        """Returns the outputs of every timestep (batch, timesteps, units) and the cache for backward."""
+        units = self.units
+        batch, timesteps, _ = inputs.shape
+        projections = self._project(inputs, self._buffer('projections', (batch, timesteps, 3 * units)))
+        gates = self._buffer('gates', (batch, timesteps, 2 * units))
+        candidates = self._buffer('candidates', (batch, timesteps, units))
+        outputs = self._buffer('outputs', (batch, timesteps, units))
+        output = state
+        for t in range(timesteps):
+            output = outputs[:, t] = self._gates(projections[:, t], output, gates[:, t], candidates[:, t])
+        return outputs, (inputs, state, outputs, gates, candidates)
+
+    def backward(self, cache, d_last=None, d_outputs=None):
+        """
+        Backpropagates through the cached window. d_last is the gradient of the
+        loss with respect to the last output, d_outputs with respect to every
+        output. Returns the parameter gradients and the gradient of the initial state.
+        """
+        inputs, state, outputs, gates, candidates = cache
+        U, U_h = self.params['U'], self.params['U_h']
+        units = state.shape[1]
+        timesteps = outputs.shape[1]
+        d_projections = self._buffer('d_projections', outputs.shape[:2] + (3 * units,))
+        d_U_h = np.zeros_like(U_h)
+        d_state = np.zeros_like(state) if d_last is None else d_last.copy()
+
+        for t in range(timesteps - 1, -1, -1):
+            if d_outputs is not None:
+                d_state += d_outputs[:, t]
+            previous = outputs[:, t - 1] if t else state
+            z, r = gates[:, t, :units], gates[:, t, units:]
+            candidate = candidates[:, t]
+            d_z, d_r, d_h = (d_projections[:, t, :units], d_projections[:, t, units:2 * units],
+                             d_projections[:, t, 2 * units:])
+
+            # candidate: d(pre) = d_state * (1 - z) * (1 - candidate^2)
+            np.multiply(candidate, candidate, out=d_h)
+            np.subtract(1, d_h, out=d_h)
+            d_h *= 1 - z
+            d_h *= d_state
+            d_U_h += (r * previous).T.dot(d_h)
+            d_reset_state = d_h.dot(U_h.T)
+
+            # update gate: d(pre) = d_state * (state - candidate) * z * (1 - z)
+            np.subtract(previous, candidate, out=d_z)
+            d_z *= d_state
+            d_z *= z * (1 - z)
+
+            # reset gate: d(pre) = d_reset_state * state * r * (1 - r)
+            np.multiply(d_reset_state, previous, out=d_r)
+            d_r *= r * (1 - r)
+
+            d_state = d_state * z + d_reset_state * r + d_projections[:, t, :2 * units].dot(U.T)
+
+        grads = {'U_h': d_U_h}
+        self._weight_gradients(inputs, state, outputs, d_projections, grads, 'U', slice(0, 2 * units))
+        return grads, d_state
+
+
+class Adam:
+    """Adam with the moment estimates kept in arrays allocated once."""
+
+    def __init__(self, params, lr=1e-3, beta_1=0.9, beta_2=0.999, epsilon=1e-7):
+        self.params = params
+        self.lr, self.beta_1, self.beta_2, self.epsilon = lr, beta_1, beta_2, epsilon
+        self.m = {name: np.zeros_like(value) for name, value in params.items()}
+        self.v = {name: np.zeros_like(value) for name, value in params.items()}
+        self.iterations = 0
+
+    def update(self, grads):
+        self.iterations += 1
+        lr = self.lr * np.sqrt(1 - self.beta_2 ** self.iterations) / (1 - self.beta_1 ** self.iterations)
+        for name, grad in grads.items():
+            m, v = self.m[name], self.v[name]
+            m *= self.beta_1
+            m += (1 - self.beta_1) * grad
+            v *= self.beta_2
+            v += (1 - self.beta_2) * grad * grad
+            self.params[name] -= lr * m / (np.sqrt(v) + self.epsilon)
+
+
+def clip_by_global_norm(grads, clipnorm):
+    """Scales all gradients down together if their global L2 norm exceeds clipnorm."""
+    norm = np.sqrt(sum(float(np.vdot(grad, grad)) for grad in grads.values()))
+    if clipnorm is not None and norm > clipnorm:
+        for grad in grads.values():
+            grad *= clipnorm / norm
+    return norm
+
+
+class RecurrentRegressor:
+    """
+    A recurrent cell followed by Dense(1), like
+
+        model.add(layers.GRU(32, input_shape=(None, features)))
+        model.add(layers.Dense(1))
+        model.compile(optimizer='adam', loss='mae')
+
+    cell: SimpleRNNCell or GRUCell
+    loss: 'mae' or 'mse'
+    clipnorm: maximum global gradient norm (None disables clipping)
+    """
+
+    def __init__(self, cell, loss='mae', lr=1e-3, clipnorm=1.0, seed=None):
+        rng = np.random.default_rng(seed)
+        self.cell = cell
+        self.loss = loss
+        self.clipnorm = clipnorm
+        # The cell's arrays are shared, so in-place updates reach the cell.
+        self.params = dict(cell.params)
+        self.params['V'] = glorot_uniform(rng, (cell.units, 1), cell.dtype)
+        self.params['c'] = np.zeros(1, dtype=cell.dtype)
+        self.optimizer = Adam(self.params, lr)
+
+    def _loss(self, predictions, targets):
+        """Returns the loss and its gradient with respect to the predictions."""
+        error = predictions - targets
+        if self.loss == 'mae':
+            return float(np.abs(error).mean()), np.sign(error) / error.size
+        return float((error * error).mean()), 2 * error / error.size
+
+    def _apply(self, grads):
+        self.grad_norm_ = clip_by_global_norm(grads, self.clipnorm)
+        self.optimizer.update(grads)
+
+    def predict(self, inputs):
+        inputs = np.asarray(inputs, dtype=self.cell.dtype)
+        state = np.zeros((inputs.shape[0], self.cell.units), dtype=self.cell.dtype)
+        return (self.cell.run(inputs, state).dot(self.params['V']) + self.params['c'])[:, 0]
+
+    def gradients(self, inputs, targets, truncate=None):
+        """
+        Loss and gradients for one target per sequence (targets of shape (batch,)).
+        Only the last truncate timesteps are cached and backpropagated through;
+        the state entering them comes from an uncached run over the rest.
+        """
+        cell, V = self.cell, self.params['V']
+        timesteps = inputs.shape[1]
+        state = np.zeros((inputs.shape[0], cell.units), dtype=cell.dtype)
+        start = 0 if truncate is None else max(timesteps - truncate, 0)
+        if start:
+            state = cell.run(inputs[:, :start], state)
+        outputs, cache = cell.forward(inputs[:, start:], state)
+        last = outputs[:, -1]
+
+        loss, d_predictions = self._loss(last.dot(V)[:, 0] + self.params['c'], targets)
+        d_predictions = d_predictions[:, None].astype(cell.dtype)
+        grads, _ = cell.backward(cache, d_last=d_predictions.dot(V.T))
+        grads['V'] = last.T.dot(d_predictions)
+        grads['c'] = d_predictions.sum(axis=0)
+        return loss, grads
+
+    def train_step(self, inputs, targets, truncate=None):
+        """
+        One update on a batch (batch, timesteps, features) and returns its loss.
+
+        targets of shape (batch,): one target per sequence, see gradients().
+        targets of shape (batch, timesteps): one target per timestep; the
+        sequence is processed in windows of truncate timesteps, each followed
+        by an update, with the last state of a window starting the next one.
+        """
+        inputs = np.asarray(inputs, dtype=self.cell.dtype)
+        targets = np.asarray(targets, dtype=self.cell.dtype)
+        if targets.ndim == 1:
+            loss, grads = self.gradients(inputs, targets, truncate)
+            self._apply(grads)
+            return loss
+
+        cell, V = self.cell, self.params['V']
+        timesteps = inputs.shape[1]
+        window = truncate or timesteps
+        state = np.zeros((inputs.shape[0], cell.units), dtype=cell.dtype)
+        losses = []
+        for start in range(0, timesteps, window):
+            outputs, cache = cell.forward(inputs[:, start:start + window], state)
+            loss, d_predictions = self._loss(outputs.dot(V)[..., 0] + self.params['c'],
+                                             targets[:, start:start + window])
+            d_predictions = d_predictions.astype(cell.dtype)
+            grads, _ = cell.backward(cache, d_outputs=d_predictions[..., None] * V[:, 0])
+            grads['V'] = outputs.reshape(-1, cell.units).T.dot(d_predictions.reshape(-1, 1))
+            grads['c'] = np.atleast_1d(d_predictions.sum())
+            # Copy: the outputs buffer is reused by the next window.
+            state = outputs[:, -1].copy()
+            self._apply(grads)
+            losses.append(loss)
+        return float(np.mean(losses))
+
+
+def make_weather_like_batch(rng, batch, timesteps, features, delay, dtype=np.float32):
+    """
+    Sequences shaped like the jena climate samples of the notebook (lookback //
+    step timesteps of `features` readings) with a daily cycle in feature 1,
+    the temperature, and as target the temperature `delay` steps after the end.
+    """
+    phase = rng.uniform(0, 2 * np.pi, (batch, 1))
+    t = np.arange(timesteps + delay)[None, :]
+    temperature = np.sin(2 * np.pi * t / 24 + phase) + 0.1 * rng.standard_normal((batch, timesteps + delay))
+    inputs = 0.1 * rng.standard_normal((batch, timesteps, features))
+    inputs[:, :, 1] = temperature[:, :timesteps]
+    return inputs.astype(dtype), temperature[:, -1].astype(dtype)
+
+
+if __name__ == '__main__':
+    BATCH = 128
+    TIMESTEPS = 240  # lookback // step in the notebook
+    FEATURES = 14
+    UNITS = 32
+
+    rng = np.random.default_rng(0)
+    for cell_class in (SimpleRNNCell, GRUCell):
+        for truncate in (None, 120, 48, 12):
+            model = RecurrentRegressor(cell_class(FEATURES, UNITS, seed=0), lr=1e-2, seed=0)
+            inputs, targets = make_weather_like_batch(rng, BATCH, TIMESTEPS, FEATURES, delay=6)
+
+            # The first step allocates the cached activations and buffers.
+            tracemalloc.start()
+            model.train_step(inputs, targets, truncate)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            start = time.perf_counter()
+            for _ in range(50):
+                inputs, targets = make_weather_like_batch(rng, BATCH, TIMESTEPS, FEATURES, delay=6)
+                loss = model.train_step(inputs, targets, truncate)
+            step = (time.perf_counter() - start) / 50
+            print("{0:13s} truncate={1!s:4s}: {2:6.1f} ms/step, peak memory {3:6.2f} MiB, mae {4:.3f}".format(
+                cell_class.__name__, truncate, 1000 * step, peak / 2 ** 20, loss))
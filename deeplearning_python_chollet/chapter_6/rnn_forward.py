@@ -0,0 +1,140 @@
+"""
+Batched forward pass of the simple RNN from learn_crude_rnn.py
+
+    output_t = tanh(input_t . W + U . state_t + b),    state_t+1 = output_t
+
+run for a whole batch of sequences at once:
+
+- inputs are (batch, timesteps, input_features), outputs (batch, timesteps, output_features)
+- the input projection inputs . W + b does not depend on the state, so it is
+  computed for every timestep in one matrix product, straight into the output
+  buffer; the time loop only adds the recurrent term and applies tanh in place
+- the output buffer can be preallocated and reused, and float32 is supported
+"""
+import time
+
+import numpy as np
+
+
+class SimpleRNN:
+    """
+    input_features, output_features: sizes of input_t and output_t
+    dtype: np.float32 or np.float64 for the weights and outputs
+    seed: seed for the (uniform [0, 1), like learn_crude_rnn) initial weights
+    """
+
+    def __init__(self, input_features, output_features, dtype=np.float32, seed=None):
+        rng = np.random.default_rng(seed)
+        self.dtype = np.dtype(dtype)
+        self.W = rng.random((input_features, output_features)).astype(self.dtype)
+        self.U = rng.random((output_features, output_features)).astype(self.dtype)
+        self.b = rng.random((output_features,)).astype(self.dtype)
+
+    @property
+    def output_features(self):
+        return self.U.shape[0]
+
+    def __call__(self, inputs, initial_state=None, out=None):
+        return rnn_forward(inputs, self.W, self.U, self.b, initial_state, out)
+
+
+def rnn_forward(inputs, W, U, b, initial_state=None, out=None):
+    """
+    Runs the RNN over a batch of sequences.
+
+    inputs: (batch, timesteps, input_features) array, or (timesteps, input_features)
+        for a single sequence
+    W, U, b: weights, as in learn_crude_rnn
+    initial_state: (batch, output_features) states before the first timestep, zeros by default
+    out: optional C-contiguous (batch, timesteps, output_features) floating point
+        array to write the outputs into; its dtype sets the dtype of the computation.
+        Any other out raises ValueError rather than leaving its contents stale.
+
+    returns: the outputs of every timestep, (batch, timesteps, output_features)
+        (or (timesteps, output_features) for a single sequence)
+    """
+    inputs = np.asarray(inputs)
+    single = inputs.ndim == 2
+    if single:
+        inputs = inputs[None]
+    batch, timesteps, input_features = inputs.shape
+    output_features = U.shape[0]
+    if timesteps == 0:
+        raise ValueError("inputs have no timesteps")
+
+    if out is None:
+        out = np.empty((batch, timesteps, output_features), dtype=W.dtype)
+    else:
+        if single and out.ndim == 2:
+            out = out[None]
+        if out.shape != (batch, timesteps, output_features):
+            raise ValueError("out has shape {}, expected {}".format(out.shape, (batch, timesteps, output_features)))
+        # A reshape of a non-contiguous out would be a copy, and the
+        # projections written into it would be lost.
+        if not out.flags.c_contiguous:
+            raise ValueError("out must be C-contiguous")
+        if not np.issubdtype(out.dtype, np.floating):
+            raise ValueError("out must have a floating point dtype, not {}".format(out.dtype))
+    dtype = out.dtype
+    W, U, b = W.astype(dtype, copy=False), U.astype(dtype, copy=False), b.astype(dtype, copy=False)
+
+    # Input projection of all timesteps as a single GEMM.
+    np.dot(inputs.reshape(-1, input_features).astype(dtype, copy=False), W,
+           out=out.reshape(-1, output_features))
+    out += b
+
+    # U . state_t for every sequence in the batch is states . U^T.
+    U_T = np.ascontiguousarray(U.T)
+    recurrent = np.empty((batch, output_features), dtype=dtype)
+    if initial_state is None:
+        np.tanh(out[:, 0], out=out[:, 0])
+    else:
+        np.dot(np.asarray(initial_state, dtype=dtype), U_T, out=recurrent)
+        out[:, 0] += recurrent
+        np.tanh(out[:, 0], out=out[:, 0])
+    for t in range(1, timesteps):
+        np.dot(out[:, t - 1], U_T, out=recurrent)
+        output_t = out[:, t]
+        output_t += recurrent
+        np.tanh(output_t, out=output_t)
+
+    return out[0] if single else out
+
+
+def crude_rnn_forward(inputs, W, U, b):
+    """The per-sequence loop of learn_crude_rnn (without the printing), for comparison."""
+    state_t = np.zeros(U.shape[0], dtype=W.dtype)
+    successive_outputs = []
+    for input_t in inputs:
+        output_t = np.tanh(np.dot(input_t, W) + np.dot(U, state_t) + b)
+        successive_outputs.append(output_t)
+        state_t = output_t
+    return np.stack(successive_outputs)
+
+
+if __name__ == '__main__':
+    INPUT_FEATURES = 32
+    OUTPUT_FEATURES = 64
+    BATCH = 64
+
+    rng = np.random.default_rng(0)
+    for dtype in (np.float64, np.float32):
+        # Small weights, so tanh does not saturate and the comparison means something.
+        rnn = SimpleRNN(INPUT_FEATURES, OUTPUT_FEATURES, dtype=dtype, seed=0)
+        rnn.W *= 0.1
+        rnn.U *= 0.02
+        for timesteps in (100, 1000, 10000):
+            inputs = rng.random((BATCH, timesteps, INPUT_FEATURES)).astype(dtype)
+            out = np.empty((BATCH, timesteps, OUTPUT_FEATURES), dtype=dtype)
+
+            start = time.perf_counter()
+            rnn(inputs, out=out)
+            batched = BATCH / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            expected = crude_rnn_forward(inputs[0], rnn.W, rnn.U, rnn.b)
+            crude = 1 / (time.perf_counter() - start)
+
+            assert np.allclose(out[0], expected, atol=1e-4 if dtype is np.float32 else 1e-10)
+            print("{0:7s} T={1:5d}: batched {2:10.1f} sequences/s, one at a time {3:8.1f} sequences/s".format(
+                np.dtype(dtype).name, timesteps, batched, crude))
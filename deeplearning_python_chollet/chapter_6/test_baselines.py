@@ -0,0 +1,79 @@
+"""
+Tests for baselines.py; run this file.
+"""
+import numpy as np
+
+from baselines import DAY, ErrorAccumulator, naive_baseline, persistence_baseline, row_range
+from jena_windows import generator
+
+
+def test_persistence_baseline():
+    """
+    The persistence reading is taken from inside the window: period == delay
+    (the target's own row) is rejected, and the default period for the
+    notebook's delay gives the same errors as the matching timestep of the
+    windows.
+    """
+    failure = False
+    lookback, delay, step = 1440, 144, 6
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((20000, 14)).astype(np.float32)
+
+    for period in (delay, delay - 1, delay + lookback + 1):
+        try:
+            persistence_baseline(data, lookback, delay, 0, 10000, period=period)
+            print("FAILURE: test_persistence_baseline()")
+            print("\tperiod={} with delay={} was accepted".format(period, delay))
+            failure = True
+        except ValueError:
+            pass
+
+    default = persistence_baseline(data, lookback, delay, 0, 10000)
+    explicit = persistence_baseline(data, lookback, delay, 0, 10000, period=2 * DAY)
+    if default != explicit:
+        print("FAILURE: test_persistence_baseline()")
+        print("\tdefault period is not 2 * DAY for delay={}: {} != {}".format(delay, default, explicit))
+        failure = True
+
+    windows = generator(data, lookback, delay, 0, 10000, batch_size=1024, step=step)
+    timestep = (lookback - (2 * DAY - delay)) // step
+    errors = ErrorAccumulator()
+    first, last = row_range(data, lookback, delay, 0, 10000)
+    for chunk in range(first, last, 1024):
+        samples, targets = windows.batch(np.arange(chunk, min(chunk + 1024, last)))
+        errors.update(samples[:, timestep, 1], targets)
+    if not np.isclose(errors.result()['mae'], default['mae']):
+        print("FAILURE: test_persistence_baseline()")
+        print("\tmae {} differs from the windows' {}".format(default['mae'], errors.result()['mae']))
+        failure = True
+    if not failure:
+        print("SUCCESS: test_persistence_baseline()")
+
+
+def test_empty_range():
+    """
+    A validation range with no rows is rejected with a ValueError naming its
+    bounds, instead of dividing by a count of zero.
+    """
+    failure = False
+    lookback, delay = 1440, 144
+    data = np.zeros((20000, 14), dtype=np.float32)
+    for max_index in (lookback, lookback - 1, 1000 + lookback):
+        for baseline in (naive_baseline, persistence_baseline):
+            try:
+                result = baseline(data, lookback, delay, 1000, max_index)
+                print("FAILURE: test_empty_range()")
+                print("\t{} with max_index={} returned {}".format(baseline.__name__, max_index, result))
+                failure = True
+            except ValueError as error:
+                if str(1000 + lookback) not in str(error):
+                    print("FAILURE: test_empty_range()")
+                    print("\tthe error does not name the bounds: {}".format(error))
+                    failure = True
+    if not failure:
+        print("SUCCESS: test_empty_range()")
+
+
+if __name__ == '__main__':
+    test_persistence_baseline()
+    test_empty_range()
@@ -0,0 +1,47 @@
+"""
+Tests for jena_windows.py; run this file.
+"""
+import numpy as np
+
+from jena_windows import generator, notebook_generator
+
+
+def test_generator_dtype():
+    """
+    Batches of float32 data come out in the dtype asked for, up or down,
+    with the same values as the notebook's generator.
+    """
+    failure = False
+    lookback, delay, step = 1440, 144, 6
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((5000, 14)).astype(np.float32)
+
+    for dtype in (np.float64, np.float32, np.float16):
+        for buffers in (None, 2):
+            windows = generator(data, lookback, delay, 0, None, batch_size=8, step=step, dtype=dtype,
+                                buffers=buffers)
+            expected = notebook_generator(data, lookback, delay, 0, None, batch_size=8, step=step)
+            for _ in range(3):
+                (samples, targets), (old_samples, old_targets) = next(windows), next(expected)
+                if samples.dtype != dtype or targets.dtype != dtype:
+                    print("FAILURE: test_generator_dtype()")
+                    print("\tasked for {}, got {} and {}".format(np.dtype(dtype), samples.dtype, targets.dtype))
+                    failure = True
+                if not (np.array_equal(samples, old_samples.astype(dtype))
+                        and np.array_equal(targets, old_targets.astype(dtype))):
+                    print("FAILURE: test_generator_dtype()")
+                    print("\tdtype={} buffers={} differs from the notebook's batches".format(
+                        np.dtype(dtype), buffers))
+                    failure = True
+
+        samples, targets = next(generator(data, lookback, delay, 0, None, shuffle=True, batch_size=8, dtype=dtype))
+        if samples.shape != (8, lookback // step, 14) or samples.dtype != dtype:
+            print("FAILURE: test_generator_dtype()")
+            print("\tshuffled batch of dtype={} came out {} {}".format(np.dtype(dtype), samples.shape, samples.dtype))
+            failure = True
+    if not failure:
+        print("SUCCESS: test_generator_dtype()")
+
+
+if __name__ == '__main__':
+    test_generator_dtype()
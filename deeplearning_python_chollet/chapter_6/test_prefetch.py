@@ -0,0 +1,214 @@
+"""
+Tests for prefetch.py; run this file.
+"""
+import itertools
+import multiprocessing
+import os
+import pickle
+import tempfile
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from jena_windows import WindowGenerator
+from prefetch import ParallelBatches, Prefetcher, WindowBatches
+
+
+def numbered_batch(index, rng):
+    """A batch carrying its index, built after a delay that varies with it so the workers finish out of order."""
+    time.sleep(0.002 * (index * 7 % 3))
+    return np.full(3, index), rng.random(4)
+
+
+def expected_batches(batch_fn, steps, seed=0):
+    return [batch_fn(index, np.random.default_rng([seed, index])) for index in range(steps)]
+
+
+def same_batches(batches, expected):
+    return len(batches) == len(expected) and all(
+        all(np.array_equal(part, expected_part) for part, expected_part in zip(batch, expected_batch))
+        for batch, expected_batch in zip(batches, expected))
+
+
+def test_batches_in_order(path):
+    """
+    ParallelBatches hands out batch_fn(0, rng_0), batch_fn(1, rng_1), ... in
+    order and with the same contents for any number of workers, with
+    threads or processes, also when the workers finish out of order.
+    """
+    failure = False
+    data = np.load(path, mmap_mode='r')
+    window_fn = WindowBatches(data, 120, 12, 0, 6000, batch_size=16, step=6)
+    for batch_fn in (numbered_batch, window_fn):
+        expected = expected_batches(batch_fn, 12, seed=3)
+        for processes in (False, True):
+            for workers in (1, 3):
+                with ParallelBatches(batch_fn, steps=12, workers=workers, processes=processes, seed=3,
+                                     queue_size=4) as batches:
+                    result = list(batches)
+                if not same_batches(result, expected):
+                    print("FAILURE: test_batches_in_order()")
+                    print("	{} with {} {} differs from building the batches one by one".format(
+                        getattr(batch_fn, '__name__', 'WindowBatches'), workers,
+                        'processes' if processes else 'threads'))
+                    failure = True
+    del data, window_fn
+    if not failure:
+        print("SUCCESS: test_batches_in_order()")
+
+
+def test_steps():
+    """
+    With steps, exactly that many batches are handed out and next() then
+    raises StopIteration; steps=0 gives no batches at all.
+    """
+    failure = False
+    for processes in (False, True):
+        for steps in (0, 1, 5):
+            with ParallelBatches(numbered_batch, steps=steps, workers=2, processes=processes, queue_size=3) as batches:
+                result = [batch[0][0] for batch in batches]
+                try:
+                    next(batches)
+                    stopped = False
+                except StopIteration:
+                    stopped = True
+            if result != list(range(steps)) or len(batches) != steps or not stopped:
+                print("FAILURE: test_steps()")
+                print("	steps={} with {}: got batches {}, stopped {}".format(
+                    steps, 'processes' if processes else 'threads', result, stopped))
+                failure = True
+    if not failure:
+        print("SUCCESS: test_steps()")
+
+
+def test_close_frees_slots():
+    """
+    close() in the middle of an endless iteration stops the workers and
+    unlinks every shared memory slot; the iterator is then exhausted.
+    """
+    failure = False
+    batches = ParallelBatches(numbered_batch, workers=2, processes=True, queue_size=3)
+    for _ in range(5):
+        next(batches)
+    names = [slot.name for slot in batches._slots]
+    batches.close()
+    for name in names:
+        try:
+            slot = shared_memory.SharedMemory(name=name)
+            slot.close()
+            print("FAILURE: test_close_frees_slots()")
+            print("	shared memory slot {} still exists after close()".format(name))
+            failure = True
+        except FileNotFoundError:
+            pass
+    if len(names) != 4:
+        print("FAILURE: test_close_frees_slots()")
+        print("	expected queue_size + 1 = 4 slots, found {}".format(len(names)))
+        failure = True
+    try:
+        next(batches)
+        print("FAILURE: test_close_frees_slots()")
+        print("	next() returned a batch after close()")
+        failure = True
+    except StopIteration:
+        pass
+    if not failure:
+        print("SUCCESS: test_close_frees_slots()")
+
+
+def test_prefetcher_copies_reused_buffers(path):
+    """
+    Prefetcher(copy=True) over a WindowGenerator that reuses two buffers
+    keeps every queued batch intact: after the queue has filled up, the
+    batches equal those of a generator returning new arrays.
+    """
+    failure = False
+    data = np.load(path, mmap_mode='r')
+    expected = list(itertools.islice(
+        WindowGenerator(data, 120, 12, 0, 6000, shuffle=True, batch_size=16, seed=1), 10))
+    source = WindowGenerator(data, 120, 12, 0, 6000, shuffle=True, batch_size=16, seed=1, buffers=2)
+    with Prefetcher(itertools.islice(source, 10), queue_size=4, copy=True) as prefetcher:
+        # Let the producer run ahead until the queue is full.
+        time.sleep(0.2)
+        result = list(prefetcher)
+    if not same_batches(result, expected):
+        print("FAILURE: test_prefetcher_copies_reused_buffers()")
+        print("	queued batches were overwritten by the source's later batches")
+        failure = True
+    del data, source
+    if not failure:
+        print("SUCCESS: test_prefetcher_copies_reused_buffers()")
+
+
+def test_sliced_memmap_in_spawned_workers(path):
+    """
+    WindowBatches over slices of a memory mapped array give the same
+    batches in spawned worker processes, which reopen the file, as in
+    threads, which share the array.
+    """
+    failure = False
+    data = np.load(path, mmap_mode='r')
+    spawn = multiprocessing.get_context('spawn')
+    for name, view in (('data[1000:]', data[1000:]), ('data[2000:6000]', data[2000:6000]),
+                       ('data[1000:][500:]', data[1000:][500:])):
+        batch_fn = WindowBatches(view, 120, 12, 0, None, batch_size=16, step=6)
+        with ParallelBatches(batch_fn, steps=6, workers=2) as threads, \
+                ParallelBatches(batch_fn, steps=6, workers=2, processes=True, context=spawn) as processes:
+            for i, ((samples, targets), (spawned_samples, spawned_targets)) in enumerate(zip(threads, processes)):
+                if not (np.array_equal(samples, spawned_samples) and np.array_equal(targets, spawned_targets)):
+                    print("FAILURE: test_sliced_memmap_in_spawned_workers()")
+                    print("\tbatch {} of {} differs between threads and spawned processes".format(i, name))
+                    failure = True
+
+    try:
+        pickle.dumps(WindowBatches(data[:, :4], 120, 12, 0, None))
+        print("FAILURE: test_sliced_memmap_in_spawned_workers()")
+        print("\ta non-contiguous memmap view was pickled")
+        failure = True
+    except ValueError:
+        pass
+    del data
+    if not failure:
+        print("SUCCESS: test_sliced_memmap_in_spawned_workers()")
+
+
+def test_prefetcher_hands_over_base_exceptions():
+    """
+    Whatever the source raises, BaseExceptions such as KeyboardInterrupt
+    included, is raised by next() after the batches before it, rather than
+    leaving the consumer waiting on the queue.
+    """
+    failure = False
+    for error in (ValueError("bad batch"), KeyboardInterrupt(), GeneratorExit(), SystemExit(1)):
+        def batches():
+            yield 1
+            yield 2
+            raise error
+
+        seen = []
+        raised = None
+        with Prefetcher(batches(), queue_size=1) as prefetcher:
+            try:
+                for batch in prefetcher:
+                    seen.append(batch)
+            except BaseException as caught:
+                raised = caught
+        if seen != [1, 2] or raised is not error:
+            print("FAILURE: test_prefetcher_hands_over_base_exceptions()")
+            print("\t{!r}: got batches {} and {!r}".format(error, seen, raised))
+            failure = True
+    if not failure:
+        print("SUCCESS: test_prefetcher_hands_over_base_exceptions()")
+
+
+if __name__ == '__main__':
+    test_steps()
+    test_close_frees_slots()
+    test_prefetcher_hands_over_base_exceptions()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'jena.npy')
+        np.save(path, np.random.default_rng(0).standard_normal((8000, 14)).astype(np.float32))
+        test_batches_in_order(path)
+        test_prefetcher_copies_reused_buffers(path)
+        test_sliced_memmap_in_spawned_workers(path)
@@ -0,0 +1,99 @@
+"""
+Tests for rnn_bptt.py; run this file.
+"""
+import numpy as np
+
+from rnn_bptt import GRUCell, RecurrentRegressor, SimpleRNNCell
+
+
+def relative_error(analytic, numeric):
+    return np.abs(analytic - numeric).max() / max(np.abs(analytic).max(), np.abs(numeric).max(), 1e-12)
+
+
+def numeric_gradient(loss, param, eps=1e-6):
+    """Central differences of loss() for every entry of param, changed in place."""
+    grad = np.zeros_like(param)
+    flat, flat_grad = param.reshape(-1), grad.reshape(-1)
+    for i in range(flat.size):
+        saved = flat[i]
+        flat[i] = saved + eps
+        plus = loss()
+        flat[i] = saved - eps
+        minus = loss()
+        flat[i] = saved
+        flat_grad[i] = (plus - minus) / (2 * eps)
+    return grad
+
+
+def test_regressor_gradients():
+    """
+    The BPTT gradients of RecurrentRegressor (one target per sequence, mse)
+    match finite differences of its loss for every parameter, for both
+    cells; truncating to at least the sequence length changes nothing.
+    """
+    failure = False
+    rng = np.random.default_rng(0)
+    for cell_class in (SimpleRNNCell, GRUCell):
+        model = RecurrentRegressor(cell_class(3, 4, dtype=np.float64, seed=0), loss='mse', seed=0)
+        model.params['b'] += rng.uniform(-0.5, 0.5, model.params['b'].shape)
+        model.params['c'] += 0.3
+        inputs = rng.standard_normal((5, 8, 3))
+        targets = rng.standard_normal(5)
+
+        loss, grads = model.gradients(inputs, targets)
+        for name, param in model.params.items():
+            numeric = numeric_gradient(lambda: model.gradients(inputs, targets)[0], param)
+            error = relative_error(grads[name], numeric)
+            if error > 1e-7:
+                print("FAILURE: test_regressor_gradients()")
+                print("\t{} d{}: relative error {}".format(cell_class.__name__, name, error))
+                failure = True
+        _, truncated = model.gradients(inputs, targets, truncate=8)
+        if any(not np.allclose(truncated[name], grads[name], rtol=0, atol=1e-15) for name in grads):
+            print("FAILURE: test_regressor_gradients()")
+            print("\t{} truncate=timesteps differs from full BPTT".format(cell_class.__name__))
+            failure = True
+    if not failure:
+        print("SUCCESS: test_regressor_gradients()")
+
+
+def test_cell_gradients():
+    """
+    cell.backward with a gradient for every output (as in the per-timestep
+    windows of train_step) and a nonzero initial state: the parameter and
+    initial state gradients match finite differences of sum(outputs * R).
+    """
+    failure = False
+    rng = np.random.default_rng(1)
+    for cell_class in (SimpleRNNCell, GRUCell):
+        cell = cell_class(3, 4, dtype=np.float64, seed=1)
+        cell.params['b'] += rng.uniform(-0.5, 0.5, cell.params['b'].shape)
+        inputs = rng.standard_normal((2, 6, 3))
+        state = rng.uniform(-0.9, 0.9, (2, 4))
+        R = rng.standard_normal((2, 6, 4))
+
+        def loss():
+            return float((cell.forward(inputs, state)[0] * R).sum())
+
+        _, cache = cell.forward(inputs, state)
+        grads, d_state = cell.backward(cache, d_outputs=R)
+        grads = {name: grad.copy() for name, grad in grads.items()}
+        d_state = d_state.copy()
+        for name, param in cell.params.items():
+            error = relative_error(grads[name], numeric_gradient(loss, param))
+            if error > 1e-7:
+                print("FAILURE: test_cell_gradients()")
+                print("\t{} d{}: relative error {}".format(cell_class.__name__, name, error))
+                failure = True
+        error = relative_error(d_state, numeric_gradient(loss, state))
+        if error > 1e-7:
+            print("FAILURE: test_cell_gradients()")
+            print("\t{} initial state: relative error {}".format(cell_class.__name__, error))
+            failure = True
+    if not failure:
+        print("SUCCESS: test_cell_gradients()")
+
+
+if __name__ == '__main__':
+    test_regressor_gradients()
+    test_cell_gradients()
@@ -0,0 +1,121 @@
+"""
+Tests for rnn_forward.py; run this file.
+"""
+import contextlib
+import io
+
+import numpy as np
+
+from learn_crude_rnn import learn_crude_rnn
+from rnn_forward import SimpleRNN, crude_rnn_forward, rnn_forward
+
+
+def loop_forward(inputs, W, U, b, state_t):
+    """The time loop of learn_crude_rnn for one sequence, from any initial state."""
+    successive_outputs = []
+    for input_t in inputs:
+        output_t = np.tanh(np.dot(input_t, W) + np.dot(U, state_t) + b)
+        successive_outputs.append(output_t)
+        state_t = output_t
+    return np.stack(successive_outputs)
+
+
+def test_matches_learn_crude_rnn():
+    """
+    With the weights learn_crude_rnn draws from np.random, rnn_forward gives
+    its outputs for random sequences, one at a time and as a batch.
+    """
+    failure = False
+    rng = np.random.default_rng(0)
+    for timesteps, input_features, output_features in ((1, 3, 4), (7, 5, 2), (50, 32, 64)):
+        # Small inputs, so tanh does not saturate and the comparison means something.
+        inputs = 0.01 * rng.random((4, timesteps, input_features))
+        expected = []
+        for sequence in inputs:
+            np.random.seed(timesteps)
+            with contextlib.redirect_stdout(io.StringIO()):
+                expected.append(learn_crude_rnn(sequence, input_features, output_features))
+        expected = np.stack(expected)
+        np.random.seed(timesteps)
+        W = np.random.random((input_features, output_features))
+        U = np.random.random((output_features, output_features))
+        b = np.random.random((output_features,))
+
+        batched = rnn_forward(inputs, W, U, b)
+        single = rnn_forward(inputs[1], W, U, b)
+        if batched.shape != expected.shape or not np.allclose(batched, expected, rtol=0, atol=1e-12):
+            print("FAILURE: test_matches_learn_crude_rnn()")
+            print("\tbatch of {} timesteps differs by {}".format(timesteps, np.abs(batched - expected).max()))
+            failure = True
+        if single.shape != expected[1].shape or not np.allclose(single, expected[1], rtol=0, atol=1e-12):
+            print("FAILURE: test_matches_learn_crude_rnn()")
+            print("\tsingle sequence of {} timesteps differs from learn_crude_rnn".format(timesteps))
+            failure = True
+    if not failure:
+        print("SUCCESS: test_matches_learn_crude_rnn()")
+
+
+def test_matches_loop():
+    """
+    Random weights, initial states and float32 or float64: the batched
+    forward pass agrees with the per-sequence loop, also when it writes
+    into a reused out buffer.
+    """
+    failure = False
+    rng = np.random.default_rng(1)
+    for dtype, atol in ((np.float64, 1e-12), (np.float32, 1e-5)):
+        rnn = SimpleRNN(6, 8, dtype=dtype, seed=0)
+        rnn.W -= 0.5
+        rnn.U -= 0.5
+        out = np.full((5, 30, 8), np.nan, dtype=dtype)
+        for _ in range(3):
+            inputs = rng.standard_normal((5, 30, 6)).astype(dtype)
+            initial_state = rng.uniform(-1, 1, (5, 8)).astype(dtype)
+            result = rnn(inputs, initial_state, out=out)
+            if result is not out:
+                print("FAILURE: test_matches_loop()")
+                print("\tthe outputs were not written into out")
+                failure = True
+            for i in range(len(inputs)):
+                expected = loop_forward(inputs[i], rnn.W, rnn.U, rnn.b, initial_state[i])
+                if not np.allclose(out[i], expected, rtol=0, atol=atol):
+                    print("FAILURE: test_matches_loop()")
+                    print("\t{} sequence {} differs by {}".format(np.dtype(dtype).name, i,
+                                                                 np.abs(out[i] - expected).max()))
+                    failure = True
+            zero_state = rnn(inputs)
+            if zero_state.dtype != dtype or not np.allclose(zero_state[0], crude_rnn_forward(inputs[0], rnn.W, rnn.U, rnn.b),
+                                                            rtol=0, atol=atol):
+                print("FAILURE: test_matches_loop()")
+                print("\t{} without an initial state differs from crude_rnn_forward".format(np.dtype(dtype).name))
+                failure = True
+    if not failure:
+        print("SUCCESS: test_matches_loop()")
+
+
+def test_rejects_bad_arguments():
+    """
+    An out of the wrong shape, layout or dtype, and inputs without
+    timesteps, raise ValueError.
+    """
+    failure = False
+    rnn = SimpleRNN(3, 4, dtype=np.float64, seed=0)
+    inputs = np.zeros((2, 5, 3))
+    cases = [(inputs, np.empty((2, 5, 5))), (inputs, np.empty((2, 5, 8))[:, :, ::2]),
+             (inputs, np.empty((2, 5, 4), dtype=np.int64)), (np.zeros((2, 0, 3)), None)]
+    for case_inputs, out in cases:
+        try:
+            rnn(case_inputs, out=out)
+            print("FAILURE: test_rejects_bad_arguments()")
+            print("\tinputs {} with out {} were accepted".format(case_inputs.shape, None if out is None else out.dtype))
+            failure = True
+        except ValueError:
+            pass
+    if not failure:
+        print("SUCCESS: test_rejects_bad_arguments()")
+
+
+if __name__ == '__main__':
+    test_matches_learn_crude_rnn()
+    test_matches_loop()
+    test_rejects_bad_arguments()
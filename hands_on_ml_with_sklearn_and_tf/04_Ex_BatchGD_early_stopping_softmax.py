@@ -8,10 +8,14 @@ Implement Batch Gradient Descent with early stopping for Softmax Regression
 - use early stopping and find theta
 - calculate the accuracy from test set
 
+The training loop lives in softmax_regressor.py (stable log-softmax, mini-batch
+or full-batch updates, early stopping on the validation loss using `tol`).
 """
 from sklearn.datasets import load_iris
 import numpy as np
 
+from softmax_regressor import SoftmaxRegressor
+
 np.random.seed(102)
 
 num_iter = 5001
@@ -23,58 +27,19 @@ X, y = load_iris(return_X_y=True)
 
 m = len(X) 
 train_size = int(ratio * m)
-# random_indices = np.random.permutation(m)
-
-def to_one_hot(y):
-    n = y.max() + 1
-    m = len(y)
-    
-    y_one_hot = np.zeros((m,n))
-    y_one_hot[np.arange(m), y] = 1
-
-    return y_one_hot
-
-def softmax(logits):
-    exps = np.exp(logits)
-    exps_sum = np.sum(exps, axis=1, keepdims=True)
-    
-    return exps / exps_sum
+random_indices = np.random.permutation(m)
+X, y = X[random_indices], y[random_indices]
 
-def update_learning_rate(lr):
-    return lr/(1 + lr)
-
-X_b = np.c_[np.ones([X.shape[0],1]), X]
-
-X_train = X_b[:train_size]
+X_train = X[:train_size]
 y_train = y[:train_size]
-X_test = X_b[train_size:]
+X_test = X[train_size:]
 y_test = y[train_size:]
 
-y_train_onehot = to_one_hot(y_train)
-y_test_onehot = to_one_hot(y_test)
-
-theta = np.random.randn(X_b.shape[1], len(np.unique(y_train)))
-
-for i in range(num_iter):
-    
-    logits = X_train.dot(theta)
-    y_proba = softmax(logits)
-
-    cross_entropy_loss = np.mean(np.sum(y_train_onehot * np.log(y_proba), axis=1))
-    error = y_proba - y_train_onehot
-    
-    if(i % 500 == 0):
-        print("Iteration #: {}\t Loss: {}".format(i, cross_entropy_loss))
-
-    gradients = (1/m) * X_train.T.dot(error)
-    theta = theta - lr * gradients
-    lr = update_learning_rate(lr)
-
-
-test_logits = X_test.dot(theta)
-y_proba_test = softmax(test_logits)
-
-y_pred = np.argmax(y_proba_test, axis=1)
+softmax_regressor = SoftmaxRegressor(lr=lr, batch_size=None, max_epochs=num_iter, tol=tol,
+                                     n_iter_no_change=20, random_state=102, verbose=500)
+softmax_regressor.fit(X_train, y_train)
+print("Stopped after {} epochs, best validation loss: {}".format(softmax_regressor.n_epochs_,
+                                                                 softmax_regressor.best_loss_))
 
-acc = np.mean(y_pred == y_test)
-print("Accuracy: ".format(acc))
\ No newline at end of file
+acc = softmax_regressor.score(X_test, y_test)
+print("Accuracy: {}".format(acc))
@@ -0,0 +1,205 @@
+"""
+Softmax Regression trained with (mini-)batch gradient descent and early stopping
+(without using Scikit-Learn).
+
+- labels stay integer class ids, no one hot matrix is built
+- log-softmax subtracts the row max before exponentiating
+- logits, probabilities, their exponentials and gradients live in buffers
+  allocated once per fit (only per-row maxima and sums are temporaries)
+- the data is visited in chunks / mini-batches, so X can be a memory mapped
+  array with millions of rows
+- early stopping watches the validation loss and stops once it has not improved
+  by more than `tol` for `n_iter_no_change` epochs, keeping the best parameters
+
+"""
+import numpy as np
+
+
+def log_softmax(logits, out=None, tmp=None):
+    """
+    Row-wise log of the softmax, computed as logits - max - log(sum(exp(logits - max))).
+
+    out may be logits itself. tmp, if given, is a buffer of the same shape for
+    the exponentials; otherwise they are a new temporary array.
+    """
+    out = np.subtract(logits, logits.max(axis=1, keepdims=True), out=out)
+    out -= np.log(np.exp(out, out=tmp).sum(axis=1, keepdims=True))
+    return out
+
+
+def softmax(logits, out=None):
+    """Row-wise softmax, stable for large logits."""
+    out = log_softmax(logits, out)
+    return np.exp(out, out=out)
+
+
+class SoftmaxRegressor:
+    """
+    Multinomial logistic regression.
+
+    lr: learning rate
+    batch_size: rows per update; None means full batch (one update per epoch,
+        with the gradient accumulated over chunks of `chunk_size` rows)
+    max_epochs: maximum number of passes over the training set
+    tol: minimum decrease of the validation loss that counts as an improvement
+    n_iter_no_change: epochs without improvement before training stops
+    validation_fraction: share of the rows held out for early stopping, used
+        when fit() is not given X_val / y_val. It must leave at least one
+        validation row and one training row.
+    decay: learning rate schedule lr / (1 + decay * epoch)
+    chunk_size: rows per chunk when evaluating the loss, predictions and
+        full batch gradients
+    dtype: np.float64 or np.float32 for the parameters and buffers
+    """
+
+    def __init__(self, lr=0.1, batch_size=None, max_epochs=5000, tol=1e-5, n_iter_no_change=5,
+                 validation_fraction=0.2, decay=0.0, chunk_size=65536, dtype=np.float64,
+                 random_state=None, verbose=0):
+        self.lr = lr
+        self.batch_size = batch_size
+        self.max_epochs = max_epochs
+        self.tol = tol
+        self.n_iter_no_change = n_iter_no_change
+        self.validation_fraction = validation_fraction
+        self.decay = decay
+        self.chunk_size = chunk_size
+        self.dtype = dtype
+        self.random_state = random_state
+        self.verbose = verbose
+
+    def _allocate(self, rows, n_features, n_classes):
+        self._logits = np.empty((rows, n_classes), dtype=self.dtype)
+        self._exp = np.empty((rows, n_classes), dtype=self.dtype)
+        self._X_batch = np.empty((rows, n_features), dtype=self.dtype)
+        self._grad_coef = np.empty((n_features, n_classes), dtype=self.dtype)
+        self._grad_intercept = np.empty(n_classes, dtype=self.dtype)
+
+    def _forward(self, X, out):
+        """Writes the log-probabilities of the rows of X into out."""
+        np.dot(X, self.coef_, out=out)
+        out += self.intercept_
+        return log_softmax(out, out, self._exp[:len(out)])
+
+    def _accumulate_gradient(self, X, y):
+        """Adds the cross entropy gradient summed over the rows of (X, y) to the gradient buffers."""
+        error = np.exp(self._forward(X, self._logits[:len(y)]), out=self._logits[:len(y)])
+        error[np.arange(len(y)), y] -= 1
+        self._grad_coef += X.T.dot(error)
+        self._grad_intercept += error.sum(axis=0)
+
+    def _gather(self, X, indices):
+        """Copies the given rows of X into the batch buffer (in index order)."""
+        out = self._X_batch[:len(indices)]
+        if X.dtype == out.dtype:
+            np.take(X, indices, axis=0, out=out)
+        else:
+            out[...] = X[indices]
+        return out
+
+    def _step(self, X, y, batches, lr):
+        """One gradient step over the union of the given index batches."""
+        self._grad_coef.fill(0)
+        self._grad_intercept.fill(0)
+        size = 0
+        for indices in batches:
+            self._accumulate_gradient(self._gather(X, indices), y[indices])
+            size += len(indices)
+        self.coef_ -= (lr / size) * self._grad_coef
+        self.intercept_ -= (lr / size) * self._grad_intercept
+
+    def loss(self, X, y):
+        """Mean cross entropy of the current model on (X, y)."""
+        total = 0.0
+        for start in range(0, len(y), self.chunk_size):
+            stop = min(start + self.chunk_size, len(y))
+            log_proba = self._forward(np.asarray(X[start:stop], dtype=self.dtype), self._logits[:stop - start])
+            total -= log_proba[np.arange(stop - start), y[start:stop]].sum()
+        return total / len(y)
+
+    def fit(self, X, y, X_val=None, y_val=None):
+        y = np.asarray(y)
+        rng = np.random.default_rng(self.random_state)
+        n_features = X.shape[1]
+        self.n_classes_ = int(y.max()) + 1 if y_val is None else int(max(y.max(), np.max(y_val))) + 1
+
+        # Hold out validation rows by index, so X itself is never copied.
+        if X_val is None:
+            indices = rng.permutation(len(y))
+            n_val = int(len(y) * self.validation_fraction)
+            train_idx, val_idx = np.sort(indices[n_val:]), np.sort(indices[:n_val])
+            if n_val == 0:
+                raise ValueError("validation_fraction={} of {} rows leaves no validation rows; "
+                                 "use a larger fraction or pass X_val and y_val".format(self.validation_fraction, len(y)))
+        else:
+            train_idx, val_idx = np.arange(len(y)), None
+        if len(train_idx) == 0:
+            raise ValueError("no training rows left after the validation split")
+
+        batch = self.batch_size or self.chunk_size
+        self._allocate(max(batch, self.chunk_size), n_features, self.n_classes_)
+        self.coef_ = (0.01 * rng.standard_normal((n_features, self.n_classes_))).astype(self.dtype)
+        self.intercept_ = np.zeros(self.n_classes_, dtype=self.dtype)
+        best_coef = self.coef_.copy()
+        best_intercept = self.intercept_.copy()
+
+        def validation_loss():
+            if val_idx is not None:
+                return self._validation_loss(X, y, val_idx)
+            return self.loss(X_val, np.asarray(y_val))
+
+        best_loss = np.inf
+        epochs_no_change = 0
+        self.loss_curve_ = []
+        for epoch in range(self.max_epochs):
+            lr = self.lr / (1 + self.decay * epoch)
+            if self.batch_size is None:
+                chunks = [train_idx[start:start + batch] for start in range(0, len(train_idx), batch)]
+                self._step(X, y, chunks, lr)
+            else:
+                order = train_idx[rng.permutation(len(train_idx))]
+                for start in range(0, len(order), batch):
+                    # Sorted indices read a memory mapped X front to back;
+                    # the summed gradient does not depend on the order.
+                    self._step(X, y, [np.sort(order[start:start + batch])], lr)
+
+            current = validation_loss()
+            self.loss_curve_.append(current)
+            if self.verbose and epoch % self.verbose == 0:
+                print("Epoch #: {}\t Validation loss: {}".format(epoch, current))
+
+            if current < best_loss - self.tol:
+                best_loss = current
+                best_coef[...] = self.coef_
+                best_intercept[...] = self.intercept_
+                epochs_no_change = 0
+            else:
+                epochs_no_change += 1
+                if epochs_no_change >= self.n_iter_no_change:
+                    break
+
+        self.n_epochs_ = epoch + 1
+        self.best_loss_ = best_loss
+        self.coef_[...] = best_coef
+        self.intercept_[...] = best_intercept
+        return self
+
+    def _validation_loss(self, X, y, indices):
+        total = 0.0
+        for start in range(0, len(indices), self.chunk_size):
+            chunk = indices[start:start + self.chunk_size]
+            log_proba = self._forward(self._gather(X, chunk), self._logits[:len(chunk)])
+            total -= log_proba[np.arange(len(chunk)), y[chunk]].sum()
+        return total / len(indices)
+
+    def predict_proba(self, X):
+        proba = np.empty((X.shape[0], self.n_classes_), dtype=self.dtype)
+        for start in range(0, X.shape[0], self.chunk_size):
+            stop = min(start + self.chunk_size, X.shape[0])
+            np.exp(self._forward(np.asarray(X[start:stop], dtype=self.dtype), proba[start:stop]), out=proba[start:stop])
+        return proba
+
+    def predict(self, X):
+        return self.predict_proba(X).argmax(axis=1)
+
+    def score(self, X, y):
+        return np.mean(self.predict(X) == np.asarray(y))
@@ -0,0 +1,93 @@
+"""
+Tests for softmax_regressor.py; run this file.
+"""
+import numpy as np
+
+from softmax_regressor import SoftmaxRegressor, log_softmax, softmax
+
+
+def test_gradient():
+    """
+    The summed cross entropy gradient of the buffers matches finite
+    differences of the mean loss, for every parameter.
+    """
+    failure = False
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((60, 4))
+    y = rng.integers(0, 3, 60)
+    model = SoftmaxRegressor(max_epochs=1, chunk_size=16, random_state=0).fit(X, y, X, y)
+    model.coef_ = rng.standard_normal(model.coef_.shape)
+    model.intercept_ = rng.standard_normal(model.intercept_.shape)
+
+    model._grad_coef.fill(0)
+    model._grad_intercept.fill(0)
+    for start in range(0, len(y), 16):
+        model._accumulate_gradient(X[start:start + 16], y[start:start + 16])
+    analytic = np.concatenate([model._grad_coef.ravel(), model._grad_intercept]) / len(y)
+
+    numeric = []
+    eps = 1e-6
+    for params in (model.coef_, model.intercept_):
+        flat = params.reshape(-1)
+        for i in range(flat.size):
+            saved = flat[i]
+            flat[i] = saved + eps
+            plus = model.loss(X, y)
+            flat[i] = saved - eps
+            minus = model.loss(X, y)
+            flat[i] = saved
+            numeric.append((plus - minus) / (2 * eps))
+    numeric = np.array(numeric)
+    error = np.abs(analytic - numeric).max() / max(np.abs(numeric).max(), 1e-12)
+    if error > 1e-6:
+        print("FAILURE: test_gradient()")
+        print("\trelative error {} between the analytic and numeric gradients".format(error))
+        failure = True
+    if not failure:
+        print("SUCCESS: test_gradient()")
+
+
+def test_predict_proba():
+    """
+    predict_proba rows are probabilities summing to one, for float64 and
+    float32 models, in agreement with softmax and log_softmax.
+    """
+    failure = False
+    rng = np.random.default_rng(1)
+    centers = np.array([[0, 0], [4, 4], [-4, 4]])
+    y = rng.integers(0, 3, 600)
+    X = centers[y] + rng.standard_normal((600, 2))
+    for dtype in (np.float64, np.float32):
+        model = SoftmaxRegressor(lr=0.5, batch_size=32, max_epochs=50, chunk_size=100, dtype=dtype,
+                                 random_state=0).fit(X, y)
+        proba = model.predict_proba(X)
+        if proba.dtype != dtype or proba.min() < 0 or not np.allclose(proba.sum(axis=1), 1, atol=1e-5):
+            print("FAILURE: test_predict_proba()")
+            print("\t{} rows sum to between {} and {}".format(np.dtype(dtype), proba.sum(axis=1).min(),
+                                                               proba.sum(axis=1).max()))
+            failure = True
+        logits = X.astype(dtype) @ model.coef_ + model.intercept_
+        if not np.allclose(proba, softmax(logits), atol=1e-5):
+            print("FAILURE: test_predict_proba()")
+            print("\tpredict_proba differs from softmax of the logits")
+            failure = True
+        if model.score(X, y) < 0.9:
+            print("FAILURE: test_predict_proba()")
+            print("\taccuracy {} on well separated classes".format(model.score(X, y)))
+            failure = True
+
+    logits = np.array([[1000.0, 0.0, -1000.0], [1.0, 2.0, 3.0]])
+    tmp = np.empty_like(logits)
+    expected = logits - logits.max(axis=1, keepdims=True)
+    expected -= np.log(np.exp(expected).sum(axis=1, keepdims=True))
+    if not np.allclose(log_softmax(logits.copy(), tmp=tmp), expected) or not np.isfinite(log_softmax(logits)).all():
+        print("FAILURE: test_predict_proba()")
+        print("\tlog_softmax is wrong or overflows for large logits")
+        failure = True
+    if not failure:
+        print("SUCCESS: test_predict_proba()")
+
+
+if __name__ == '__main__':
+    test_gradient()
+    test_predict_proba()